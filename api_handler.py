@@ -1,7 +1,12 @@
 import aiohttp
+import asyncio
 import os
 import json
 
+from circuit_breaker import api_circuit_breaker, parse_retry_after
+from http_session import http_session_manager
+from rate_limiter import api_rate_limiter
+
 # 환경변수를 안전하게 가져오기
 BASE_URL = os.getenv("MC_API_BASE")
 if not BASE_URL:
@@ -10,46 +15,144 @@ if not BASE_URL:
 else:
     print(f"✅ MC_API_BASE: {BASE_URL}")
 
+# 진행 중인 요청 (같은 요청은 하나만 보내고 결과를 공유)
+_inflight = {}
+_fetch_stats = {
+    "requests": 0,
+    "coalesced": 0
+}
+
+async def fetch_api(path: str, params: dict = None, timeout: float = 10):
+    """MC_API_BASE 공통 GET 요청 - (HTTP 상태, JSON 데이터) 반환
+
+    모든 PlanetEarth API 요청은 이 함수를 거치므로 요청 제한과 세션 재사용이 한 곳에서 적용됩니다.
+    같은 경로와 파라미터의 요청이 이미 진행 중이면 새로 보내지 않고 그 결과를 함께 받습니다.
+    먼저 보낸 요청이 취소되면 기다리던 호출자 중 하나가 다시 요청합니다.
+    (공유된 데이터는 읽기 전용으로 사용해야 합니다)
+    JSON이 아닌 응답이면 데이터는 None입니다. 타임아웃/연결 오류는 호출자에게 그대로 전달됩니다.
+    """
+    key = (path, tuple(sorted((params or {}).items())))
+
+    future = _inflight.get(key)
+    while future is not None:
+        _fetch_stats["coalesced"] += 1
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            # 이 호출자가 취소된 경우만 전달하고, 먼저 보낸 요청이 취소된 경우에는 다시 요청
+            if not future.cancelled():
+                raise
+        future = _inflight.get(key)
+
+    future = asyncio.get_running_loop().create_future()
+    # 기다리는 호출자가 없어도 예외 미확인 경고가 나지 않도록 처리
+    future.add_done_callback(lambda f: f.cancelled() or f.exception())
+    _inflight[key] = future
+    _fetch_stats["requests"] += 1
+
+    try:
+        result = await _request(path, params, timeout)
+    except asyncio.CancelledError:
+        future.cancel()
+        raise
+    except Exception as e:
+        future.set_exception(e)
+        raise
+    else:
+        future.set_result(result)
+        return result
+    finally:
+        _inflight.pop(key, None)
+
+def get_fetch_stats() -> dict:
+    """API 요청 통계 반환 (진행 중 / 실제 요청 / 합쳐진 요청)"""
+    return {
+        "in_flight": len(_inflight),
+        "requests": _fetch_stats["requests"],
+        "coalesced": _fetch_stats["coalesced"]
+    }
+
+async def _request(path: str, params: dict, timeout: float):
+    """실제 HTTP 요청 (서킷 브레이커, 요청 제한 적용)
+
+    서킷이 열려 있으면 CircuitOpenError가 발생합니다.
+    요청 제한기에서 기다리는 동안 서킷이 열릴 수 있으므로, 기다린 뒤 보내기 직전에 다시 확인합니다.
+    타임아웃, 연결 오류, 429, 5xx 응답과 그 밖의 예외는 서킷 브레이커에 실패로 기록됩니다.
+    """
+    url = f"{BASE_URL}{path}"
+
+    # 이미 열려 있으면 요청 제한기에서 기다리지 않고 바로 실패
+    if not api_circuit_breaker.allows_requests():
+        api_circuit_breaker.before_request()
+    await api_rate_limiter.acquire()
+
+    api_circuit_breaker.before_request()
+    try:
+        async with http_session_manager.session() as session:
+            async with session.get(url, params=params, timeout=aiohttp.ClientTimeout(total=timeout)) as res:
+                try:
+                    data = await res.json(content_type=None)
+                except (aiohttp.ContentTypeError, json.JSONDecodeError):
+                    data = None
+
+                if res.status == 429 or res.status >= 500:
+                    api_circuit_breaker.record_failure(
+                        f"HTTP {res.status}", parse_retry_after(res.headers.get("Retry-After"))
+                    )
+                else:
+                    api_circuit_breaker.record_success()
+                return res.status, data
+    except asyncio.TimeoutError:
+        api_circuit_breaker.record_failure("타임아웃")
+        raise
+    except Exception as e:
+        # 연결 오류뿐 아니라 응답 해석 오류 등도 실패로 기록 (복구 확인 요청이 남아 있지 않도록)
+        api_circuit_breaker.record_failure(type(e).__name__)
+        raise
+    except asyncio.CancelledError:
+        api_circuit_breaker.release_probe()
+        raise
+
+async def _fetch_first_available(endpoints, label: str, key):
+    """여러 엔드포인트를 순서대로 시도하여 처음 성공한 응답 반환"""
+    for path, params in endpoints:
+        print(f"🔍 시도 중: {BASE_URL}{path} {params}")
+
+        try:
+            status, data = await fetch_api(path, params)
+            print(f"   📊 응답 상태: HTTP {status}")
+
+            if status == 200:
+                print(f"✅ {label} 조회 성공: {key}")
+                print(f"   🎯 올바른 엔드포인트: {path}")
+                return data
+            elif status == 404:
+                print(f"   ❌ 404 Not Found - 다음 엔드포인트 시도")
+                continue
+            else:
+                print(f"   ⚠️ HTTP {status} - 응답 내용 확인")
+                print(f"   📄 오류 내용: {data}")
+
+        except asyncio.TimeoutError:
+            print(f"   ⏰ 타임아웃")
+            continue
+        except Exception as e:
+            print(f"   ❌ 오류: {e}")
+            continue
+
+    return None
+
 async def get_discord_info(discord_id):
     """Discord ID로 마인크래프트 정보 조회 (개선된 버전)"""
     # 다양한 엔드포인트 시도
     possible_endpoints = [
-        f"/discord?discord={discord_id}"
+        ("/discord", {"discord": str(discord_id)})
     ]
-    
-    async with aiohttp.ClientSession() as session:
-        for endpoint in possible_endpoints:
-            url = f"{BASE_URL}{endpoint}"
-            print(f"🔍 시도 중: {url}")
-            
-            try:
-                async with session.get(url, timeout=aiohttp.ClientTimeout(total=10)) as res:
-                    print(f"   📊 응답 상태: HTTP {res.status}")
-                    
-                    if res.status == 200:
-                        data = await res.json()
-                        print(f"✅ Discord 정보 조회 성공: {discord_id}")
-                        print(f"   🎯 올바른 엔드포인트: {endpoint}")
-                        return data
-                    elif res.status == 404:
-                        print(f"   ❌ 404 Not Found - 다음 엔드포인트 시도")
-                        continue
-                    else:
-                        print(f"   ⚠️ HTTP {res.status} - 응답 내용 확인")
-                        try:
-                            error_data = await res.json()
-                            print(f"   📄 오류 내용: {error_data}")
-                        except:
-                            error_text = await res.text()
-                            print(f"   📄 오류 내용: {error_text}")
-                        
-            except aiohttp.ClientTimeout:
-                print(f"   ⏰ 타임아웃")
-                continue
-            except Exception as e:
-                print(f"   ❌ 오류: {e}")
-                continue
-    
+
+    data = await _fetch_first_available(possible_endpoints, "Discord 정보", discord_id)
+    if data is not None:
+        return data
+
     print(f"❌ 모든 엔드포인트에서 Discord 정보 조회 실패: {discord_id}")
     return {"status": "FAILED", "message": "All endpoints failed", "discord_id": discord_id}
 
@@ -57,42 +160,13 @@ async def get_resident_info(uuid):
     """UUID로 거주민 정보 조회 (개선된 버전)"""
     # 다양한 엔드포인트 시도
     possible_endpoints = [
-        f"/resident?uuid={uuid}"
+        ("/resident", {"uuid": str(uuid)})
     ]
-    
-    async with aiohttp.ClientSession() as session:
-        for endpoint in possible_endpoints:
-            url = f"{BASE_URL}{endpoint}"
-            print(f"🔍 시도 중: {url}")
-            
-            try:
-                async with session.get(url, timeout=aiohttp.ClientTimeout(total=10)) as res:
-                    print(f"   📊 응답 상태: HTTP {res.status}")
-                    
-                    if res.status == 200:
-                        data = await res.json()
-                        print(f"✅ 거주민 정보 조회 성공: {uuid}")
-                        print(f"   🎯 올바른 엔드포인트: {endpoint}")
-                        return data
-                    elif res.status == 404:
-                        print(f"   ❌ 404 Not Found - 다음 엔드포인트 시도")
-                        continue
-                    else:
-                        print(f"   ⚠️ HTTP {res.status} - 응답 내용 확인")
-                        try:
-                            error_data = await res.json()
-                            print(f"   📄 오류 내용: {error_data}")
-                        except:
-                            error_text = await res.text()
-                            print(f"   📄 오류 내용: {error_text}")
-                        
-            except aiohttp.ClientTimeout:
-                print(f"   ⏰ 타임아웃")
-                continue
-            except Exception as e:
-                print(f"   ❌ 오류: {e}")
-                continue
-    
+
+    data = await _fetch_first_available(possible_endpoints, "거주민 정보", uuid)
+    if data is not None:
+        return data
+
     print(f"❌ 모든 엔드포인트에서 거주민 정보 조회 실패: {uuid}")
     return {"status": "FAILED", "message": "All endpoints failed", "uuid": uuid}
 
@@ -107,44 +181,39 @@ async def test_api_endpoints():
         "/player",
         "/user"
     ]
-    
-    async with aiohttp.ClientSession() as session:
-        for endpoint in test_endpoints:
-            url = f"{BASE_URL}{endpoint}"
-            try:
-                async with session.get(url, timeout=aiohttp.ClientTimeout(total=5)) as res:
-                    print(f"🔍 {url} -> HTTP {res.status}")
-                    if res.status == 200:
-                        try:
-                            data = await res.json()
-                            print(f"   ✅ 응답: {json.dumps(data, indent=2, ensure_ascii=False)[:200]}...")
-                        except:
-                            text = await res.text()
-                            print(f"   ✅ 응답: {text[:200]}...")
-                    elif res.status == 404:
-                        print(f"   ❌ 404 Not Found")
-                    else:
-                        print(f"   ⚠️ 상태코드: {res.status}")
-            except Exception as e:
-                print(f"   ❌ 오류: {e}")
+
+    for endpoint in test_endpoints:
+        url = f"{BASE_URL}{endpoint}"
+        try:
+            status, data = await fetch_api(endpoint, timeout=5)
+            print(f"🔍 {url} -> HTTP {status}")
+            if status == 200:
+                print(f"   ✅ 응답: {json.dumps(data, indent=2, ensure_ascii=False)[:200]}...")
+            elif status == 404:
+                print(f"   ❌ 404 Not Found")
+            else:
+                print(f"   ⚠️ 상태코드: {status}")
+        except Exception as e:
+            print(f"   ❌ 오류: {e}")
 
 # 테스트 함수
 async def main():
     print("=== API 엔드포인트 테스트 ===")
     await test_api_endpoints()
-    
+
     print("\n=== Discord 정보 조회 테스트 ===")
     # 테스트용 Discord ID (실제 값으로 변경)
     test_discord_id = "753079165779050647"
     discord_result = await get_discord_info(test_discord_id)
     print(f"Discord 조회 결과: {json.dumps(discord_result, indent=2, ensure_ascii=False)}")
-    
+
     print("\n=== 거주민 정보 조회 테스트 ===")
     # 테스트용 UUID (실제 값으로 변경)
     test_uuid = "550e8400-e29b-41d4-a716-446655440000"
     resident_result = await get_resident_info(test_uuid)
     print(f"거주민 조회 결과: {json.dumps(resident_result, indent=2, ensure_ascii=False)}")
 
+    await http_session_manager.close()
+
 if __name__ == "__main__":
-    import asyncio
     asyncio.run(main())
\ No newline at end of file
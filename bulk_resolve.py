@@ -0,0 +1,91 @@
+# bulk_resolve.py
+"""
+여러 멤버 동시 국적 조회
+/국민확인 즉시 확인에서 멤버를 한 명씩 기다리지 않고 정해진 개수만큼 동시에 조회합니다.
+요청 속도는 api_handler의 요청 제한기가 그대로 지키고, 같은 연동/마을 조회는 캐시에서 함께 사용합니다.
+"""
+
+import asyncio
+import time
+from typing import Awaitable, Callable, Dict, Iterable, Optional, Union
+
+from planetearth_client import resolve_member, Resolution
+
+# 조회 결과 (성공하면 Resolution, 실패하면 발생한 예외)
+ResolveResult = Union[Resolution, Exception]
+
+
+class ResolveProgress:
+    """동시 조회 진행 상황"""
+
+    def __init__(self, total: int):
+        self.total = total
+        self.done = 0
+        self.failed = 0
+        self.started_at = time.monotonic()
+
+    def is_finished(self) -> bool:
+        return self.done >= self.total
+
+    def eta_seconds(self) -> Optional[float]:
+        """지금까지의 평균 속도로 계산한 남은 시간 (아직 끝난 조회가 없으면 None)"""
+        if not self.done:
+            return None
+        elapsed = time.monotonic() - self.started_at
+        return elapsed / self.done * (self.total - self.done)
+
+    def format(self) -> str:
+        """진행 상황 한 줄 요약"""
+        text = f"🔄 확인 중... **{self.done}/{self.total}명**"
+        if self.failed:
+            text += f" (실패 {self.failed}명)"
+        eta = self.eta_seconds()
+        if eta is not None:
+            eta = int(eta) + 1
+            text += f" · 남은 시간 약 {eta // 60}분 {eta % 60}초" if eta >= 60 else f" · 남은 시간 약 {eta}초"
+        return text
+
+
+async def resolve_members(discord_ids: Iterable[int], concurrency: int,
+                          progress: Optional[ResolveProgress] = None) -> Dict[int, ResolveResult]:
+    """디스코드 ID 목록을 최대 concurrency개씩 동시에 조회 - ID → 결과"""
+    discord_ids = list(dict.fromkeys(discord_ids))
+    progress = progress or ResolveProgress(len(discord_ids))
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    results: Dict[int, ResolveResult] = {}
+
+    async def resolve_one(discord_id: int):
+        async with semaphore:
+            try:
+                results[discord_id] = await resolve_member(discord_id)
+            except Exception as e:
+                results[discord_id] = e
+                progress.failed += 1
+            progress.done += 1
+
+    await asyncio.gather(*(resolve_one(discord_id) for discord_id in discord_ids))
+    return results
+
+
+async def resolve_members_with_progress(discord_ids: Iterable[int], concurrency: int,
+                                        on_progress: Callable[[ResolveProgress], Awaitable],
+                                        interval_seconds: float = 3.0) -> Dict[int, ResolveResult]:
+    """동시 조회하면서 interval_seconds마다 on_progress(진행 상황) 호출 (진행 표시 실패는 무시)"""
+    discord_ids = list(dict.fromkeys(discord_ids))
+    progress = ResolveProgress(len(discord_ids))
+
+    async def report():
+        while True:
+            await asyncio.sleep(interval_seconds)
+            if progress.is_finished():
+                return
+            try:
+                await on_progress(progress)
+            except Exception as e:
+                print(f"⚠️ 진행 상황 표시 실패: {e}")
+
+    reporter = asyncio.create_task(report())
+    try:
+        return await resolve_members(discord_ids, concurrency, progress)
+    finally:
+        reporter.cancel()
@@ -0,0 +1,142 @@
+# census.py
+"""
+서버 인구조사
+API를 호출하지 않고 저장소에 남은 마지막 확인 결과(확인 기록 + 마크 ID/마을/국가)로
+서버 멤버의 국가/마을 분포를 집계합니다.
+멤버마다 사전을 만들지 않고 국가/마을 이름을 번호로 바꾼 열(array)에 담아 번호별로 셉니다.
+"""
+
+import time
+from array import array
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from planetearth_client import VERIFIED_OK
+from resolution_store import resolution_store
+
+# 분류 번호 (분류 열에 저장되는 값)
+CATEGORY_BASE = 0         # BASE_NATION 국민
+CATEGORY_OTHER = 1        # 다른 국가
+CATEGORY_NOT_LINKED = 2   # 계정 미연동
+CATEGORY_NO_TOWN = 3      # 마을 없음
+CATEGORY_NO_NATION = 4    # 국가 없는 마을
+CATEGORY_UNVERIFIED = 5   # 확인 기록 없음
+
+CATEGORY_LABELS = ["🏴 국민", "🌍 다른 국가", "🔗 계정 미연동", "🏚️ 마을 없음", "🏳️ 국가 없음", "❔ 확인 기록 없음"]
+
+_RESULT_CATEGORIES = {
+    "not_linked": CATEGORY_NOT_LINKED,
+    "no_town": CATEGORY_NO_TOWN,
+    "no_nation": CATEGORY_NO_NATION,
+}
+
+# 이름 번호 0은 "없음"으로 사용
+_NONE_CODE = 0
+
+
+class _CodeTable:
+    """이름 ↔ 번호 변환표"""
+
+    def __init__(self):
+        self.names: List[Optional[str]] = [None]
+        self._codes: Dict[str, int] = {}
+
+    def code(self, name: Optional[str]) -> int:
+        if not name:
+            return _NONE_CODE
+        code = self._codes.get(name)
+        if code is None:
+            code = self._codes[name] = len(self.names)
+            self.names.append(name)
+        return code
+
+
+@dataclass
+class CensusResult:
+    """인구조사 결과"""
+    total: int
+    categories: List[int]                    # 분류 번호별 인원
+    nations: List[Tuple[str, int]]           # (국가, 인원) 많은 순
+    base_towns: List[Tuple[str, int]]        # BASE_NATION 국민의 (마을, 인원) 많은 순
+    stale_ids: List[int] = field(default_factory=list)    # 오래된 기록
+    missing_ids: List[int] = field(default_factory=list)  # 확인 기록 없음
+    elapsed_ms: float = 0.0
+
+    def category_count(self, category: int) -> int:
+        return self.categories[category]
+
+
+def _ranked(counts: array, names: List[Optional[str]]) -> List[Tuple[str, int]]:
+    return sorted(
+        ((names[code], count) for code, count in enumerate(counts) if count and code != _NONE_CODE),
+        key=lambda item: (-item[1], item[0])
+    )
+
+
+def take_census(member_ids: Iterable[int], base_nation: str, max_age: float,
+                rows: Optional[List[tuple]] = None) -> CensusResult:
+    """멤버 ID 목록의 분포 집계 (rows를 주지 않으면 저장소에서 확인 기록을 읽음)
+
+    max_age초보다 오래된 기록과 확인 기록이 없는 멤버는 다시 확인할 대상으로 함께 반환합니다.
+    """
+    started_at = time.perf_counter()
+    if rows is None:
+        rows = resolution_store.get_census_rows()
+
+    # 디스코드 ID → 저장소 행 위치
+    row_index = {row[0]: position for position, row in enumerate(rows)}
+    nation_table = _CodeTable()
+    town_table = _CodeTable()
+    stale_before = time.time() - max_age
+
+    # 멤버별 열 (분류 / 국가 번호 / 마을 번호)
+    category_column = array("B")
+    nation_column = array("I")
+    town_column = array("I")
+    stale_ids: List[int] = []
+    missing_ids: List[int] = []
+
+    for member_id in member_ids:
+        position = row_index.get(member_id)
+        if position is None:
+            category_column.append(CATEGORY_UNVERIFIED)
+            nation_column.append(_NONE_CODE)
+            town_column.append(_NONE_CODE)
+            missing_ids.append(member_id)
+            continue
+
+        _, verified_at, result, town, nation = rows[position]
+        if result == VERIFIED_OK and nation:
+            category = CATEGORY_BASE if nation == base_nation else CATEGORY_OTHER
+        else:
+            category = _RESULT_CATEGORIES.get(result, CATEGORY_UNVERIFIED)
+            nation = None
+        category_column.append(category)
+        nation_column.append(nation_table.code(nation))
+        town_column.append(town_table.code(town) if category == CATEGORY_BASE else _NONE_CODE)
+
+        if category == CATEGORY_UNVERIFIED:
+            missing_ids.append(member_id)
+        elif (verified_at or 0) < stale_before:
+            stale_ids.append(member_id)
+
+    # 열마다 번호별로 세기
+    categories = [0] * len(CATEGORY_LABELS)
+    for category in category_column:
+        categories[category] += 1
+    nation_counts = array("I", [0]) * len(nation_table.names)
+    for code in nation_column:
+        nation_counts[code] += 1
+    town_counts = array("I", [0]) * len(town_table.names)
+    for code in town_column:
+        town_counts[code] += 1
+
+    return CensusResult(
+        total=len(category_column),
+        categories=categories,
+        nations=_ranked(nation_counts, nation_table.names),
+        base_towns=_ranked(town_counts, town_table.names),
+        stale_ids=stale_ids,
+        missing_ids=missing_ids,
+        elapsed_ms=(time.perf_counter() - started_at) * 1000
+    )
@@ -0,0 +1,165 @@
+# circuit_breaker.py
+"""
+MC_API_BASE 서킷 브레이커
+API 장애나 429 응답이 이어지면 요청을 잠시 멈추고(open), 대기 후 한 건으로 복구 여부를 확인(half-open)합니다.
+Retry-After 헤더를 따르며, 연속으로 열릴수록 대기 시간이 지수적으로 늘어납니다(지터 포함).
+"""
+
+import random
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+STATE_NAMES = {
+    CLOSED: "🟢 정상",
+    OPEN: "🔴 차단됨",
+    HALF_OPEN: "🟡 복구 확인 중"
+}
+
+
+class CircuitOpenError(Exception):
+    """서킷이 열려 있어 요청을 보내지 않음"""
+
+    def __init__(self, retry_after: float):
+        super().__init__(f"API 요청이 일시 중단되었습니다 ({retry_after:.0f}초 후 재시도)")
+        self.retry_after = retry_after
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-After 헤더(초 또는 HTTP 날짜)를 초 단위로 변환"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+class CircuitBreaker:
+    """closed / open / half-open 상태를 가진 서킷 브레이커"""
+
+    def __init__(self, failure_threshold: int = 5, base_backoff: float = 30.0, max_backoff: float = 600.0):
+        self.failure_threshold = max(1, failure_threshold)
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+
+        self.state = CLOSED
+        self._consecutive_failures = 0
+        self._open_level = 0          # 연속으로 열린 횟수 (대기 시간 지수)
+        self._open_until = 0.0
+        self._probe_in_flight = False
+
+        # 통계
+        self.times_opened = 0
+        self.rejected_requests = 0
+        self.last_opened_at = None
+        self.last_error = None
+
+    def _backoff_seconds(self) -> float:
+        """지수 대기 시간 + ±20% 지터"""
+        delay = min(self.max_backoff, self.base_backoff * (2 ** self._open_level))
+        return delay * random.uniform(0.8, 1.2)
+
+    def retry_after(self) -> float:
+        """다시 요청할 수 있을 때까지 남은 초"""
+        return max(0.0, self._open_until - time.monotonic())
+
+    def allows_requests(self) -> bool:
+        """지금 요청을 보낼 수 있는지 (상태를 바꾸지 않음)"""
+        if self.state == CLOSED:
+            return True
+        if self.state == OPEN:
+            return self.retry_after() <= 0
+        return not self._probe_in_flight
+
+    def before_request(self):
+        """요청 전 호출 - 보낼 수 없으면 CircuitOpenError 발생"""
+        if self.state == CLOSED:
+            return
+
+        if self.state == OPEN and self.retry_after() <= 0:
+            self.state = HALF_OPEN
+            print("🟡 API 서킷 반개방: 복구 확인 요청을 보냅니다")
+
+        if self.state == HALF_OPEN and not self._probe_in_flight:
+            self._probe_in_flight = True
+            return
+
+        self.rejected_requests += 1
+        raise CircuitOpenError(max(self.retry_after(), 1.0))
+
+    def record_success(self):
+        """요청 성공 기록 - 반개방 상태면 닫음"""
+        if self.state != CLOSED:
+            print("🟢 API 서킷 닫힘: API가 복구되었습니다")
+        self.state = CLOSED
+        self._consecutive_failures = 0
+        self._open_level = 0
+        self._probe_in_flight = False
+
+    def record_failure(self, error: str, retry_after: Optional[float] = None):
+        """요청 실패 기록 - 임계치를 넘거나 Retry-After를 받으면 서킷을 엶"""
+        self.last_error = error
+        self._consecutive_failures += 1
+        self._probe_in_flight = False
+
+        if self.state == HALF_OPEN or retry_after is not None or self._consecutive_failures >= self.failure_threshold:
+            self._open(retry_after)
+
+    def release_probe(self):
+        """결과 없이 끝난(취소된) 복구 확인 요청 정리"""
+        self._probe_in_flight = False
+
+    def _open(self, retry_after: Optional[float]):
+        delay = self._backoff_seconds()
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+
+        self.state = OPEN
+        self._open_until = time.monotonic() + delay
+        self._open_level += 1
+        self.times_opened += 1
+        self.last_opened_at = time.time()
+        print(f"🔴 API 서킷 열림: {delay:.0f}초 동안 요청 중단 (원인: {self.last_error})")
+
+    def get_stats(self) -> dict:
+        """서킷 상태 반환"""
+        return {
+            "state": self.state,
+            "state_name": STATE_NAMES[self.state],
+            "retry_after": round(self.retry_after(), 1) if self.state == OPEN else 0.0,
+            "consecutive_failures": self._consecutive_failures,
+            "times_opened": self.times_opened,
+            "rejected_requests": self.rejected_requests,
+            "last_opened_at": self.last_opened_at,
+            "last_error": self.last_error
+        }
+
+
+def _create_api_circuit_breaker() -> CircuitBreaker:
+    """config 설정으로 MC_API_BASE 서킷 브레이커 생성"""
+    try:
+        from config import config
+        return CircuitBreaker(
+            failure_threshold=config.API_CIRCUIT_FAILURE_THRESHOLD,
+            base_backoff=config.API_CIRCUIT_BASE_BACKOFF_SECONDS,
+            max_backoff=config.API_CIRCUIT_MAX_BACKOFF_SECONDS
+        )
+    except ImportError:
+        return CircuitBreaker()
+
+
+# 전역 API 서킷 브레이커 인스턴스 (MC_API_BASE 공용)
+api_circuit_breaker = _create_api_circuit_breaker()
@@ -2,13 +2,30 @@ import discord
 from discord import app_commands
 from discord.ext import commands
 from typing import Literal, List
-import aiohttp
 import os
-import time
+
+from api_handler import fetch_api, get_fetch_stats
+from circuit_breaker import api_circuit_breaker, CLOSED
+from http_session import http_session_manager
+from queue_worker import queue_worker_pool
+from retry_manager import retry_manager
+from planetearth_client import (
+    resolve_member, record_verification, get_nation_towns, schedule_town_index_refresh,
+    ResolutionError, AccountNotLinkedError
+)
+from member_sync import sync_member, get_member_sync_stats
+from bulk_resolve import resolve_members_with_progress
+from census import take_census, CATEGORY_LABELS
+from log_digest import log_digest
+from paginator import PaginatorView
+from rate_limiter import api_rate_limiter
+from resolution_cache import resolution_cache
+from resolution_store import resolution_store
+from town_index import town_index
 
 # 안전한 import 처리
 try:
-    from queue_manager import queue_manager
+    from queue_manager import queue_manager, LANE_MANUAL, LANE_BULK
     print("✅ queue_manager 로드 성공")
 except ImportError as e:
     print(f"❌ queue_manager 로드 실패: {e}")
@@ -16,9 +33,14 @@ except ImportError as e:
     class DummyQueueManager:
         def get_queue_size(self): return 0
         def is_processing(self): return False
-        def add_user(self, user_id): pass
+        def add_user(self, user_id, lane=None): pass
+        def add_users(self, user_ids, lane=None): return 0
         def clear_queue(self): return 0
+        def get_lane_stats(self): return []
+        def get_delayed_count(self): return 0
     queue_manager = DummyQueueManager()
+    LANE_MANUAL = "manual"
+    LANE_BULK = "bulk"
 
 try:
     from exception_manager import exception_manager
@@ -68,32 +90,14 @@ except ImportError as e:
         """대체 함수: town_role_manager가 없을 때 기본 마을 목록 반환"""
         print(f"⚠️ town_role_manager가 없어서 대체 함수 사용: {nation_name}")
         try:
-            api_base = MC_API_BASE or "https://api.planetearth.kr"
+            towns = await get_nation_towns(nation_name)
+            if not towns:
+                print(f"ℹ️ {nation_name}에 마을이 없습니다.")
+                return ["Seoul", "Busan", "Incheon"]  # 기본 테스트 마을
+            
+            print(f"✅ {nation_name} 마을 목록: {len(towns)}개")
+            return towns
             
-            async with aiohttp.ClientSession() as session:
-                url = f"{api_base}/nation?name={nation_name}"
-                print(f"🔍 대체 API 호출: {url}")
-                
-                async with session.get(url, timeout=aiohttp.ClientTimeout(total=2)) as response:
-                    if response.status != 200:
-                        print(f"❌ API 응답 오류: HTTP {response.status}")
-                        return ["Seoul", "Busan", "Incheon"]  # 기본 테스트 마을
-                    
-                    data = await response.json()
-                    if not data.get('data') or not data['data']:
-                        print(f"❌ 국가 데이터 없음: {nation_name}")
-                        return ["Seoul", "Busan", "Incheon"]  # 기본 테스트 마을
-                    
-                    nation_data = data['data'][0]
-                    towns = nation_data.get('towns', [])
-                    
-                    if not towns:
-                        print(f"ℹ️ {nation_name}에 마을이 없습니다.")
-                        return ["Seoul", "Busan", "Incheon"]  # 기본 테스트 마을
-                    
-                    print(f"✅ {nation_name} 마을 목록: {len(towns)}개")
-                    return towns
-                    
         except Exception as e:
             print(f"❌ 대체 함수에서 오류: {e}")
             # 최후의 대체 마을 목록
@@ -104,6 +108,11 @@ MC_API_BASE = os.getenv("MC_API_BASE", "https://api.planetearth.kr")
 BASE_NATION = os.getenv("BASE_NATION", "Red_Mafia")
 SUCCESS_ROLE_ID = int(os.getenv("SUCCESS_ROLE_ID", "0"))
 SUCCESS_ROLE_ID_OUT = int(os.getenv("SUCCESS_ROLE_ID_OUT", "0"))
+VERIFY_FRESHNESS_HOURS = float(os.getenv("VERIFY_FRESHNESS_HOURS", "24"))
+IMMEDIATE_CHECK_CONCURRENCY = int(os.getenv("IMMEDIATE_CHECK_CONCURRENCY", "5"))
+
+# 즉시 확인 진행 상황 표시 간격 (초)
+PROGRESS_EDIT_SECONDS = 3.0
 
 # verify_town_in_nation 함수 추가
 async def verify_town_in_nation(town_name: str, nation_name: str) -> bool:
@@ -115,85 +124,34 @@ async def verify_town_in_nation(town_name: str, nation_name: str) -> bool:
         print(f"❌ 마을 검증 오류: {e}")
         return False
 
-# 자동완성 함수를 독립적으로 정의 - 개선된 버전
+# 자동완성 함수를 독립적으로 정의 - 메모리 색인만 사용 (API를 기다리지 않음)
 async def town_autocomplete(interaction: discord.Interaction, current: str) -> List[app_commands.Choice[str]]:
-    """마을 이름 자동완성 - 개선된 버전"""
+    """마을 이름 자동완성 - 마을 색인에서 검색 (색인은 스케줄러가 백그라운드에서 갱신)"""
     try:
-        print(f"🔍 자동완성 요청: current='{current}', user={interaction.user.display_name}")
-        
         if not TOWN_ROLE_ENABLED:
-            print("⚠️ TOWN_ROLE_ENABLED가 False입니다.")
             return [app_commands.Choice(name="마을 역할 기능이 비활성화됨", value="disabled")]
-            
-        # 캐시된 마을 목록이 있다면 사용 (빠른 응답을 위해)
-        if hasattr(town_autocomplete, '_cached_towns') and hasattr(town_autocomplete, '_cache_time'):
-            current_time = time.time()
-            # 캐시가 5분 이내라면 사용
-            if current_time - town_autocomplete._cache_time < 300:
-                print(f"📦 캐시된 마을 목록 사용: {len(town_autocomplete._cached_towns)}개")
-                towns = town_autocomplete._cached_towns
-            else:
-                towns = None
-        else:
-            towns = None
         
-        # 캐시가 없거나 만료된 경우 새로 가져오기
+        towns = town_index.search_towns(BASE_NATION, current)
+        
         if towns is None:
-            print(f"🌐 API에서 마을 목록 가져오는 중... (국가: {BASE_NATION})")
-            try:
-                # 타임아웃을 짧게 설정 (자동완성은 3초 제한)
-                towns = await get_towns_in_nation(BASE_NATION)
-                print(f"✅ API에서 {len(towns) if towns else 0}개 마을 가져옴")
-                
-                # 캐시 저장
-                if towns:
-                    town_autocomplete._cached_towns = towns
-                    town_autocomplete._cache_time = time.time()
-                    print(f"💾 마을 목록 캐시됨")
-                    
-            except Exception as api_error:
-                print(f"❌ API 호출 실패: {api_error}")
-                # API 실패 시 기본 안내 메시지
-                return [app_commands.Choice(name="마을 목록을 불러올 수 없습니다", value="api_error")]
+            # 색인이 아직 없으면 저장소의 마을 목록으로 채우고, 최신 목록은 백그라운드에서 받아 옴
+            schedule_town_index_refresh()
+            if town_index.seed_town_names(BASE_NATION, resolution_store.get_nation_towns(BASE_NATION)):
+                print(f"💾 저장된 마을 목록으로 자동완성 색인 준비 ({BASE_NATION})")
+                towns = town_index.search_towns(BASE_NATION, current)
+            else:
+                return [app_commands.Choice(name="마을 목록을 불러오는 중입니다. 잠시 후 다시 입력해주세요", value="loading")]
         
         if not towns:
-            print(f"⚠️ {BASE_NATION}에 마을이 없습니다.")
+            if current:
+                return [app_commands.Choice(name=f"'{current[:80]}'와 일치하는 마을이 없습니다", value="no_match")]
             return [app_commands.Choice(name=f"{BASE_NATION}에 마을이 없습니다", value="no_towns")]
         
-        print(f"🏘️ 총 {len(towns)}개 마을 발견")
-        
-        # 현재 입력값으로 필터링
-        if current:
-            # 대소문자 구분 없이 검색
-            current_lower = current.lower()
-            filtered_towns = []
-            
-            for town in towns:
-                town_lower = town.lower()
-                # 시작하는 마을을 먼저, 포함하는 마을을 나중에
-                if town_lower.startswith(current_lower):
-                    filtered_towns.insert(0, town)
-                elif current_lower in town_lower:
-                    filtered_towns.append(town)
-            
-            print(f"🔍 '{current}' 검색 결과: {len(filtered_towns)}개 마을")
-        else:
-            # 입력이 없으면 처음 25개 마을 반환
-            filtered_towns = towns[:25]
-            print(f"📋 전체 마을 목록에서 처음 {len(filtered_towns)}개 반환")
-        
-        # Discord 제한인 25개까지만 반환
-        limited_towns = filtered_towns[:25]
-        
-        # Choice 객체 생성
-        choices = []
-        for town in limited_towns:
-            # 마을 이름이 너무 길면 잘라서 표시
-            display_name = town if len(town) <= 100 else town[:97] + "..."
-            choices.append(app_commands.Choice(name=display_name, value=town))
-        
-        print(f"✅ 자동완성 완료: {len(choices)}개 선택지 반환")
-        return choices
+        # Discord 제한: 선택지 25개, 이름 100자
+        return [
+            app_commands.Choice(name=town if len(town) <= 100 else town[:97] + "...", value=town)
+            for town in towns[:25]
+        ]
         
     except Exception as e:
         print(f"💥 자동완성 함수에서 예외 발생: {e}")
@@ -206,17 +164,35 @@ async def town_autocomplete(interaction: discord.Interaction, current: str) -> L
 class TownRoleConfirmView(discord.ui.View):
     """마을 역할 연동 확인 버튼 뷰"""
     
-    def __init__(self, town_name: str, role_id: int, role_obj: discord.Role, is_valid_town: bool):
+    def __init__(self, town_name: str, role_id: int, role_obj: discord.Role, is_valid_town: bool,
+                 suggestions: List[str] = None):
         super().__init__(timeout=60.0)  # 60초 타임아웃
         self.town_name = town_name
         self.role_id = role_id
         self.role_obj = role_obj
         self.is_valid_town = is_valid_town
         self.result = None
+        
+        # 비슷한 이름의 마을 버튼 (누르면 그 마을로 연동)
+        for suggestion in (suggestions or [])[:3]:
+            button = discord.ui.Button(label=f"🔁 {suggestion}"[:80], style=discord.ButtonStyle.blurple, row=1)
+            button.callback = self._make_suggestion_callback(suggestion)
+            self.add_item(button)
+    
+    def _make_suggestion_callback(self, suggestion: str):
+        async def callback(interaction: discord.Interaction):
+            self.town_name = suggestion
+            self.is_valid_town = True
+            await self._confirm(interaction)
+        return callback
     
     @discord.ui.button(label="✅ 연동하기", style=discord.ButtonStyle.green)
     async def confirm_add(self, interaction: discord.Interaction, button: discord.ui.Button):
         """연동 확인 버튼"""
+        await self._confirm(interaction)
+    
+    async def _confirm(self, interaction: discord.Interaction):
+        """현재 마을 이름으로 연동"""
         self.result = "confirm"
         
         # 매핑 추가
@@ -280,41 +256,6 @@ class SlashCommands(commands.Cog):
     def is_admin(interaction: discord.Interaction) -> bool:
         return interaction.user.guild_permissions.administrator
 
-    async def send_long_message_via_webhook(self, interaction: discord.Interaction, embeds_data):
-        """웹훅을 통해 긴 메시지를 여러 개로 나누어 전송"""
-        try:
-            # 웹훅 생성
-            webhook = await interaction.channel.create_webhook(name="국민확인봇")
-            
-            # 각 임베드 데이터를 개별 메시지로 전송
-            for embed_data in embeds_data:
-                embed = discord.Embed(
-                    title=embed_data["title"],
-                    color=embed_data["color"]
-                )
-                
-                for field in embed_data["fields"]:
-                    embed.add_field(
-                        name=field["name"],
-                        value=field["value"],
-                        inline=field.get("inline", False)
-                    )
-                
-                await webhook.send(embed=embed)
-            
-            # 웹훅 삭제
-            await webhook.delete()
-            
-        except Exception as e:
-            # 웹훅 실패 시 기존 방식으로 폴백
-            print(f"웹훅 전송 실패: {e}")
-            embed = discord.Embed(
-                title="🛡️ 국민 확인 결과 (요약)",
-                description="전체 결과가 너무 길어서 요약본만 표시됩니다.",
-                color=0x00bfff
-            )
-            await interaction.followup.send(embed=embed, ephemeral=True)
-
     @app_commands.command(name="도움말", description="봇의 모든 명령어를 확인합니다")
     async def 도움말(self, interaction: discord.Interaction):
         """봇의 모든 명령어와 설명을 표시 - 개선된 버전"""
@@ -373,7 +314,8 @@ class SlashCommands(commands.Cog):
             basic_admin_text = ""
             basic_admin_commands = {
                 "테스트": "봇의 기본 기능을 테스트합니다",
-                "스케줄확인": "자동 실행 스케줄 정보를 확인합니다"
+                "스케줄확인": "자동 실행 스케줄 정보를 확인합니다",
+                "캐시": "API 조회 캐시를 확인하거나 삭제합니다"
             }
             
             for cmd_name, desc in basic_admin_commands.items():
@@ -389,6 +331,7 @@ class SlashCommands(commands.Cog):
             user_mgmt_text = ""
             user_mgmt_commands = {
                 "국민확인": "사용자들의 국적을 확인합니다",
+                "인구조사": "저장된 확인 결과로 국가/마을 분포를 확인합니다",
                 "예외설정": "자동실행 예외 대상을 관리합니다"
             }
             
@@ -410,8 +353,9 @@ class SlashCommands(commands.Cog):
             queue_mgmt_commands = {
                 "대기열상태": "현재 대기열 상태를 확인합니다",
                 "대기열초기화": "대기열을 모두 비웁니다",
-                "자동실행시작": "자동 역할 부여를 수동으로 시작합니다",
-                "자동실행": "자동 등록할 역할을 설정합니다"
+                "자동실행시작": "자동 역할 부여를 수동으로 시작합니다 (모의실행: 추가 없이 결과만 확인)",
+                "자동실행": "자동 등록할 역할을 설정합니다",
+                "실패목록": "재시도에 모두 실패한 사용자를 확인/재시도합니다"
             }
             
             for cmd_name, desc in queue_mgmt_commands.items():
@@ -487,7 +431,7 @@ class SlashCommands(commands.Cog):
                 )
         else:
             # 관리자가 아닌 경우
-            total_admin_commands = 11 + (1 if CALLSIGN_ENABLED else 0) + (5 if TOWN_ROLE_ENABLED else 0)
+            total_admin_commands = 14 + (1 if CALLSIGN_ENABLED else 0) + (5 if TOWN_ROLE_ENABLED else 0)
             embed.add_field(
                 name="🛡️ 관리자 전용 명령어",
                 value=f"🔒 관리자 전용 명령어 **{total_admin_commands}개**가 있습니다.\n"
@@ -597,34 +541,13 @@ class SlashCommands(commands.Cog):
         mc_id = None
         
         try:
-            async with aiohttp.ClientSession() as session:
-                # 1단계: 디스코드 ID → 마크 ID
-                url1 = f"{MC_API_BASE}/discord?discord={user_id}"
-                async with session.get(url1, timeout=aiohttp.ClientTimeout(total=10)) as r1:
-                    if r1.status == 200:
-                        data1 = await r1.json()
-                        if data1.get('data') and data1['data']:
-                            mc_id = data1['data'][0].get('name')
-                            if mc_id:
-                                time.sleep(2)
-                                
-                                # 2단계: 마크 ID → 마을
-                                url2 = f"{MC_API_BASE}/resident?name={mc_id}"
-                                async with session.get(url2, timeout=aiohttp.ClientTimeout(total=10)) as r2:
-                                    if r2.status == 200:
-                                        data2 = await r2.json()
-                                        if data2.get('data') and data2['data']:
-                                            town = data2['data'][0].get('town')
-                                            if town:
-                                                time.sleep(2)
-                                                
-                                                # 3단계: 마을 → 국가
-                                                url3 = f"{MC_API_BASE}/town?name={town}"
-                                                async with session.get(url3, timeout=aiohttp.ClientTimeout(total=10)) as r3:
-                                                    if r3.status == 200:
-                                                        data3 = await r3.json()
-                                                        if data3.get('data') and data3['data']:
-                                                            user_nation = data3['data'][0].get('nation')
+            resolution = await resolve_member(user_id)
+            mc_id = resolution.mc_id
+            user_nation = resolution.nation
+        except ResolutionError as e:
+            # 마크 ID까지만 조회된 경우에도 닉네임 안내에 사용
+            mc_id = e.mc_id
+            print(f"⚠️ 콜사인 설정 시 국가 확인 실패: {e}")
         except Exception as e:
             print(f"⚠️ 콜사인 설정 시 국가 확인 오류: {e}")
         
@@ -775,40 +698,29 @@ class SlashCommands(commands.Cog):
             # 콜사인 목록 표시
             try:
                 all_callsigns = callsign_manager.get_all_callsigns()
-                
-                embed = discord.Embed(
-                    title="📋 콜사인 목록",
-                    color=0x00bfff
-                )
-                
-                if not all_callsigns:
-                    embed.description = "현재 설정된 콜사인이 없습니다."
-                else:
-                    embed.description = f"총 **{len(all_callsigns)}개**의 콜사인이 설정되어 있습니다."
-                    
-                    # 10개씩 나누어서 표시
-                    items = list(all_callsigns.items())
-                    for i in range(0, len(items), 10):
-                        chunk = items[i:i+10]
-                        field_items = []
-                        
-                        for user_id, callsign in chunk:
-                            field_items.append(f"• <@{user_id}> → **{callsign}**")
-                        
-                        embed.add_field(
-                            name=f"콜사인 목록 ({i+1}-{min(i+10, len(items))})",
-                            value="\n".join(field_items),
-                            inline=False
-                        )
-                        
             except Exception as e:
-                embed = discord.Embed(
-                    title="❌ 오류",
-                    description=f"콜사인 목록을 가져오는 중 오류가 발생했습니다.\n{str(e)}",
-                    color=0xff0000
+                await interaction.response.send_message(
+                    embed=discord.Embed(
+                        title="❌ 오류",
+                        description=f"콜사인 목록을 가져오는 중 오류가 발생했습니다.\n{str(e)}",
+                        color=0xff0000
+                    ),
+                    ephemeral=True
                 )
+                return
             
-            await interaction.response.send_message(embed=embed, ephemeral=True)
+            # 콜사인 이름순 스냅샷을 페이지로 표시
+            items = sorted(all_callsigns.items(), key=lambda item: str(item[1]).lower())
+            view = PaginatorView(
+                title="📋 콜사인 목록",
+                items=items,
+                format_item=lambda item: f"• <@{item[0]}> → **{item[1]}**",
+                description=f"총 **{len(items)}개**의 콜사인이 설정되어 있습니다." if items else None,
+                field_name="콜사인 목록",
+                empty_text="현재 설정된 콜사인이 없습니다.",
+                owner_id=interaction.user.id
+            )
+            await view.send(interaction)
             return
         
         elif 기능 == "초기화":
@@ -981,44 +893,39 @@ class SlashCommands(commands.Cog):
             # 현재 연동된 마을-역할 목록 표시
             try:
                 mappings = town_role_manager.get_all_mappings()
-                
-                embed = discord.Embed(
-                    title="📋 마을-역할 연동 목록",
-                    color=0x00bfff
-                )
-                
-                if not mappings:
-                    embed.description = "현재 연동된 마을-역할이 없습니다."
-                else:
-                    embed.description = f"총 **{len(mappings)}개**의 마을-역할이 연동되어 있습니다."
-                    
-                    # 10개씩 나누어서 표시
-                    items = list(mappings.items())
-                    for i in range(0, len(items), 10):
-                        chunk = items[i:i+10]
-                        field_items = []
-                        
-                        for town_name, role_id in chunk:
-                            # 역할이 존재하는지 확인
-                            role = interaction.guild.get_role(role_id)
-                            if role:
-                                field_items.append(f"• **{town_name}** → {role.mention}")
-                            else:
-                                field_items.append(f"• **{town_name}** → ⚠️ 역할 없음 (ID: {role_id})")
-                        
-                        embed.add_field(
-                            name=f"연동 목록 ({i+1}-{min(i+10, len(items))})",
-                            value="\n".join(field_items),
-                            inline=False
-                        )
             except Exception as e:
-                embed = discord.Embed(
-                    title="❌ 오류",
-                    description=f"마을-역할 목록을 가져오는 중 오류가 발생했습니다.\n{str(e)}",
-                    color=0xff0000
+                await interaction.response.send_message(
+                    embed=discord.Embed(
+                        title="❌ 오류",
+                        description=f"마을-역할 목록을 가져오는 중 오류가 발생했습니다.\n{str(e)}",
+                        color=0xff0000
+                    ),
+                    ephemeral=True
                 )
+                return
             
-            await interaction.response.send_message(embed=embed, ephemeral=True)
+            guild = interaction.guild
+            
+            def format_mapping(item):
+                # 역할이 존재하는지 확인 (표시하는 페이지의 항목만)
+                town_name, role_id = item
+                role = guild.get_role(role_id)
+                if role:
+                    return f"• **{town_name}** → {role.mention}"
+                return f"• **{town_name}** → ⚠️ 역할 없음 (ID: {role_id})"
+            
+            # 마을 이름순 스냅샷을 페이지로 표시
+            items = sorted(mappings.items(), key=lambda item: item[0].lower())
+            view = PaginatorView(
+                title="📋 마을-역할 연동 목록",
+                items=items,
+                format_item=format_mapping,
+                description=f"총 **{len(items)}개**의 마을-역할이 연동되어 있습니다." if items else None,
+                field_name="연동 목록",
+                empty_text="현재 연동된 마을-역할이 없습니다.",
+                owner_id=interaction.user.id
+            )
+            await view.send(interaction)
             return
         
         # 추가/제거 시 매개변수 검증
@@ -1083,6 +990,14 @@ class SlashCommands(commands.Cog):
                         value=f"• **마을:** {마을}\n• **역할:** {role_obj.mention}\n• **상태:** ⚠️ 미검증",
                         inline=False
                     )
+                    suggestions = town_index.suggest_towns(BASE_NATION, 마을)
+                    if suggestions:
+                        embed.add_field(
+                            name="🔎 혹시 이 마을인가요?",
+                            value="\n".join(f"• **{town}**" for town in suggestions) +
+                                  "\n아래 🔁 버튼을 누르면 해당 마을로 연동합니다.",
+                            inline=False
+                        )
                     embed.add_field(
                         name="💡 안내",
                         value="마을이 검증되지 않았지만 수동으로 연동할 수 있습니다.\n"
@@ -1099,7 +1014,10 @@ class SlashCommands(commands.Cog):
                 )
                 
                 # 버튼 뷰 생성
-                view = TownRoleConfirmView(마을, role_id, role_obj, is_valid_town)
+                view = TownRoleConfirmView(
+                    마을, role_id, role_obj, is_valid_town,
+                    suggestions=None if is_valid_town else suggestions
+                )
                 
                 await interaction.followup.send(embed=embed, view=view, ephemeral=True)
                 return
@@ -1158,143 +1076,30 @@ class SlashCommands(commands.Cog):
         print(f"🔍 /확인 명령어 시작 - 사용자: {member.display_name} (ID: {discord_id})")
         
         try:
-            async with aiohttp.ClientSession() as session:
-                # 1단계: 디스코드 ID → 마크 ID
-                url1 = f"{MC_API_BASE}/discord?discord={discord_id}"
-                print(f"  🔗 1단계 API 호출: {url1}")
-                
-                async with session.get(url1, timeout=aiohttp.ClientTimeout(total=10)) as r1:
-                    print(f"  📥 1단계 응답: HTTP {r1.status}")
-                    if r1.status != 200:
-                        await interaction.followup.send(
-                            embed=discord.Embed(
-                                title="❌ 확인 실패",
-                                description="마인크래프트 계정 정보를 찾을 수 없습니다.\n디스코드와 마인크래프트 계정이 연동되어 있는지 확인해주세요.",
-                                color=0xff0000
-                            ),
-                            ephemeral=True
-                        )
-                        return
-                    
-                    data1 = await r1.json()
-                    print(f"  📋 1단계 데이터: {data1}")
-                    
-                    if not data1.get('data') or not data1['data']:
-                        await interaction.followup.send(
-                            embed=discord.Embed(
-                                title="❌ 확인 실패",
-                                description="마인크래프트 계정 정보가 없습니다.\n디스코드와 마인크래프트 계정이 연동되어 있는지 확인해주세요.",
-                                color=0xff0000
-                            ),
-                            ephemeral=True
-                        )
-                        return
-                        
-                    mc_id = data1['data'][0].get('name')
-                    if not mc_id:
-                        await interaction.followup.send(
-                            embed=discord.Embed(
-                                title="❌ 확인 실패",
-                                description="마인크래프트 닉네임을 찾을 수 없습니다.",
-                                color=0xff0000
-                            ),
-                            ephemeral=True
-                        )
-                        return
-                    
-                    print(f"  ✅ 마크 ID 획득: {mc_id}")
-                    time.sleep(2)
-
-                # 2단계: 마크 ID → 마을
-                url2 = f"{MC_API_BASE}/resident?name={mc_id}"
-                print(f"  🔗 2단계 API 호출: {url2}")
-                
-                async with session.get(url2, timeout=aiohttp.ClientTimeout(total=10)) as r2:
-                    print(f"  📥 2단계 응답: HTTP {r2.status}")
-                    if r2.status != 200:
-                        await interaction.followup.send(
-                            embed=discord.Embed(
-                                title="❌ 확인 실패",
-                                description=f"마을 정보를 조회할 수 없습니다.\n마인크래프트 닉네임: **{mc_id}**",
-                                color=0xff0000
-                            ),
-                            ephemeral=True
-                        )
-                        return
-                        
-                    data2 = await r2.json()
-                    print(f"  📋 2단계 데이터: {data2}")
-                    
-                    if not data2.get('data') or not data2['data']:
-                        await interaction.followup.send(
-                            embed=discord.Embed(
-                                title="❌ 확인 실패",
-                                description=f"마을에 소속되어 있지 않습니다.\n마인크래프트 닉네임: **{mc_id}**",
-                                color=0xff0000
-                            ),
-                            ephemeral=True
-                        )
-                        return
-                        
-                    town = data2['data'][0].get('town')
-                    if not town:
-                        await interaction.followup.send(
-                            embed=discord.Embed(
-                                title="❌ 확인 실패",
-                                description=f"마을 정보가 없습니다.\n마인크래프트 닉네임: **{mc_id}**",
-                                color=0xff0000
-                            ),
-                            ephemeral=True
-                        )
-                        return
-                    
-                    print(f"  ✅ 마을 획득: {town}")
-                    time.sleep(2)
-
-                # 3단계: 마을 → 국가
-                url3 = f"{MC_API_BASE}/town?name={town}"
-                print(f"  🔗 3단계 API 호출: {url3}")
+            # 디스코드 ID → 마크 ID → 마을 → 국가 조회
+            try:
+                resolution = await resolve_member(discord_id)
+            except ResolutionError as e:
+                record_verification(discord_id, e)
+                description = f"{e.message}."
+                if isinstance(e, AccountNotLinkedError):
+                    description += "\n디스코드와 마인크래프트 계정이 연동되어 있는지 확인해주세요."
+                elif e.town:
+                    description += f"\n마을: **{e.town}**"
+                elif e.mc_id:
+                    description += f"\n마인크래프트 닉네임: **{e.mc_id}**"
                 
-                async with session.get(url3, timeout=aiohttp.ClientTimeout(total=10)) as r3:
-                    print(f"  📥 3단계 응답: HTTP {r3.status}")
-                    if r3.status != 200:
-                        await interaction.followup.send(
-                            embed=discord.Embed(
-                                title="❌ 확인 실패",
-                                description=f"국가 정보를 조회할 수 없습니다.\n마을: **{town}**",
-                                color=0xff0000
-                            ),
-                            ephemeral=True
-                        )
-                        return
-                        
-                    data3 = await r3.json()
-                    print(f"  📋 3단계 데이터: {data3}")
-                    
-                    if not data3.get('data') or not data3['data']:
-                        await interaction.followup.send(
-                            embed=discord.Embed(
-                                title="❌ 확인 실패",
-                                description=f"국가에 소속되어 있지 않습니다.\n마을: **{town}**",
-                                color=0xff0000
-                            ),
-                            ephemeral=True
-                        )
-                        return
-                        
-                    nation = data3['data'][0].get('nation')
-                    if not nation:
-                        await interaction.followup.send(
-                            embed=discord.Embed(
-                                title="❌ 확인 실패",
-                                description=f"국가 정보가 없습니다.\n마을: **{town}**",
-                                color=0xff0000
-                            ),
-                            ephemeral=True
-                        )
-                        return
-                    
-                    print(f"  ✅ 국가 획득: {nation}")
+                await interaction.followup.send(
+                    embed=discord.Embed(
+                        title="❌ 확인 실패",
+                        description=description,
+                        color=0xff0000
+                    ),
+                    ephemeral=True
+                )
+                return
+            
+            mc_id, town, nation = resolution.mc_id, resolution.town, resolution.nation
 
             # 역할 부여 및 닉네임 변경
             guild = interaction.guild
@@ -1329,120 +1134,19 @@ class SlashCommands(commands.Cog):
                 if nation != BASE_NATION:
                     print(f"  🌍 다른 국가 소속으로 콜사인 미적용: {nation}")
             
-            # 변경 사항 추적
-            changes = []
-            
-            try:
-                # 닉네임 변경
-                if member.display_name != new_nickname:
-                    await member.edit(nick=new_nickname)
-                    changes.append(f"• 닉네임이 **``{new_nickname}``**로 변경됨")
-                    print(f"  ✅ 닉네임 변경: {new_nickname}")
-                else:
-                    print(f"  ℹ️ 닉네임 유지: {new_nickname}")
-            except discord.Forbidden:
-                changes.append("• ⚠️ 닉네임 변경 권한 없음")
-                print(f"  ⚠️ 닉네임 변경 권한 없음")
-            except Exception as e:
-                changes.append(f"• ⚠️ 닉네임 변경 실패: {str(e)[:50]}")
-                print(f"  ⚠️ 닉네임 변경 실패: {e}")
-
-            # 매핑된 마을 역할 부여 (새로운 시스템)
-            town_role_added = None
-            if TOWN_ROLE_ENABLED and town_role_manager:
-                try:
-                    role_id = town_role_manager.get_role_id(town)
-                    if role_id:
-                        town_role = guild.get_role(role_id)
-                        if town_role:
-                            if town_role not in member.roles:
-                                await member.add_roles(town_role)
-                                town_role_added = town_role.name
-                                changes.append(f"• **{town_role.name}** 마을 역할 추가됨")
-                                print(f"  ✅ 매핑된 마을 역할 부여: {town_role.name}")
-                            else:
-                                print(f"  ℹ️ 이미 마을 역할 보유: {town_role.name}")
-                        else:
-                            changes.append(f"• ⚠️ 마을 역할을 찾을 수 없음 (ID: {role_id})")
-                            print(f"  ⚠️ 마을 역할 없음: {role_id}")
-                    else:
-                        changes.append(f"• ℹ️ **{town}** 마을은 역할이 연동되지 않음")
-                        print(f"  ℹ️ {town} 마을은 역할이 매핑되지 않음")
-                except Exception as e:
-                    changes.append(f"• ⚠️ 마을 역할 처리 실패: {str(e)[:50]}")
-                    print(f"  ⚠️ 마을 역할 처리 실패: {e}")
-
-            # 국가별 역할 부여 (기존 로직)
-            role_added = None
-            role_removed = None
+            # 닉네임/역할 변경 (필요한 것만 계산하여 한 번의 요청으로 적용)
+            changes = await sync_member(member, nation, town, new_nickname)
+            record_verification(discord_id)
+            retry_manager.remove_dead_letter(discord_id)
             
             if nation == BASE_NATION:
-                # 국민인 경우
-                if SUCCESS_ROLE_ID != 0:
-                    success_role = guild.get_role(SUCCESS_ROLE_ID)
-                    if success_role:
-                        if success_role not in member.roles:
-                            try:
-                                await member.add_roles(success_role)
-                                role_added = success_role.name
-                                changes.append(f"• **{success_role.name}** 역할 추가됨")
-                                print(f"  ✅ 국민 역할 부여: {success_role.name}")
-                            except Exception as e:
-                                changes.append(f"• ⚠️ 국민 역할 부여 실패: {str(e)[:50]}")
-                                print(f"  ⚠️ 국민 역할 부여 실패: {e}")
-                        else:
-                            print(f"  ℹ️ 이미 국민 역할 보유: {success_role.name}")
-                
-                # 비국민 역할 제거
-                if SUCCESS_ROLE_ID_OUT != 0:
-                    out_role = guild.get_role(SUCCESS_ROLE_ID_OUT)
-                    if out_role and out_role in member.roles:
-                        try:
-                            await member.remove_roles(out_role)
-                            role_removed = out_role.name
-                            changes.append(f"• **{out_role.name}** 역할 제거됨")
-                            print(f"  ✅ 비국민 역할 제거: {out_role.name}")
-                        except Exception as e:
-                            changes.append(f"• ⚠️ 비국민 역할 제거 실패: {str(e)[:50]}")
-                            print(f"  ⚠️ 비국민 역할 제거 실패: {e}")
-                
                 # 성공 메시지 (국민)
                 embed = discord.Embed(
                     title="✅ 국민 확인 완료",
                     description=f"**{BASE_NATION}** 국민으로 확인되었습니다!",
                     color=0x00ff00
                 )
-                
             else:
-                # 비국민인 경우
-                if SUCCESS_ROLE_ID_OUT != 0:
-                    out_role = guild.get_role(SUCCESS_ROLE_ID_OUT)
-                    if out_role:
-                        if out_role not in member.roles:
-                            try:
-                                await member.add_roles(out_role)
-                                role_added = out_role.name
-                                changes.append(f"• **{out_role.name}** 역할 추가됨")
-                                print(f"  ✅ 비국민 역할 부여: {out_role.name}")
-                            except Exception as e:
-                                changes.append(f"• ⚠️ 비국민 역할 부여 실패: {str(e)[:50]}")
-                                print(f"  ⚠️ 비국민 역할 부여 실패: {e}")
-                        else:
-                            print(f"  ℹ️ 이미 비국민 역할 보유: {out_role.name}")
-                
-                # 국민 역할 제거
-                if SUCCESS_ROLE_ID != 0:
-                    success_role = guild.get_role(SUCCESS_ROLE_ID)
-                    if success_role and success_role in member.roles:
-                        try:
-                            await member.remove_roles(success_role)
-                            role_removed = success_role.name
-                            changes.append(f"• **{success_role.name}** 역할 제거됨")
-                            print(f"  ✅ 국민 역할 제거: {success_role.name}")
-                        except Exception as e:
-                            changes.append(f"• ⚠️ 국민 역할 제거 실패: {str(e)[:50]}")
-                            print(f"  ⚠️ 국민 역할 제거 실패: {e}")
-                
                 # 성공 메시지 (비국민)
                 embed = discord.Embed(
                     title="⚠️ 다른 국가 소속",
@@ -1633,6 +1337,13 @@ class SlashCommands(commands.Cog):
                               f"• **상태**: 연동 불가",
                         inline=False
                     )
+                    suggestions = town_index.suggest_towns(BASE_NATION, 마을)
+                    if suggestions:
+                        embed.add_field(
+                            name="🔎 혹시 이 마을인가요?",
+                            value="\n".join(f"• **{town}**" for town in suggestions),
+                            inline=False
+                        )
                     embed.color = 0xff0000
                     
             except Exception as e:
@@ -1663,22 +1374,20 @@ class SlashCommands(commands.Cog):
         
         # API 테스트
         try:
-            async with aiohttp.ClientSession() as session:
-                # API 연결 테스트
-                url = f"{MC_API_BASE}/nation?name={BASE_NATION}"
-                async with session.get(url, timeout=aiohttp.ClientTimeout(total=3)) as response:
-                    if response.status == 200:
-                        embed.add_field(
-                            name="🌐 API 연결 테스트",
-                            value=f"• **상태**: ✅ 정상 연결\n• **응답 코드**: HTTP {response.status}",
-                            inline=False
-                        )
-                    else:
-                        embed.add_field(
-                            name="🌐 API 연결 테스트",
-                            value=f"• **상태**: ⚠️ 응답 코드 이상\n• **응답 코드**: HTTP {response.status}",
-                            inline=False
-                        )
+            # API 연결 테스트
+            status, _ = await fetch_api("/nation", {"name": BASE_NATION}, timeout=3)
+            if status == 200:
+                embed.add_field(
+                    name="🌐 API 연결 테스트",
+                    value=f"• **상태**: ✅ 정상 연결\n• **응답 코드**: HTTP {status}",
+                    inline=False
+                )
+            else:
+                embed.add_field(
+                    name="🌐 API 연결 테스트",
+                    value=f"• **상태**: ⚠️ 응답 코드 이상\n• **응답 코드**: HTTP {status}",
+                    inline=False
+                )
         except Exception as e:
             embed.add_field(
                 name="🌐 API 연결 테스트",
@@ -1690,7 +1399,7 @@ class SlashCommands(commands.Cog):
         embed.add_field(
             name="💡 사용 방법",
             value="1. `/마을역할 기능:추가 역할:@역할이름 마을:정확한마을이름`\n"
-                  "2. 마을 이름은 정확히 입력해야 합니다 (대소문자 구분)\n"
+                  "2. 마을 이름은 정확히 입력해야 합니다 (대소문자 구분, 틀리면 비슷한 마을을 안내)\n"
                   "3. 검증 후 **버튼**으로 연동 진행/취소 선택\n"
                   "4. 미검증 마을도 수동 연동 가능\n"
                   "5. 특정 마을 테스트: `/마을테스트 마을:마을이름`",
@@ -1749,6 +1458,23 @@ class SlashCommands(commands.Cog):
             inline=False
         )
         
+        # API 연결 재사용 통계
+        session_stats = http_session_manager.get_stats()
+        limiter_stats = api_rate_limiter.get_stats()
+        fetch_stats = get_fetch_stats()
+        circuit_stats = api_circuit_breaker.get_stats()
+        embed.add_field(
+            name="🌐 API 연결",
+            value=f"**요청 수:** {session_stats['requests']}회\n"
+                  f"**새 연결:** {session_stats['connections_created']}회\n"
+                  f"**재사용 연결:** {session_stats['connections_reused']}회 ({session_stats['reuse_rate']:.1f}%)\n"
+                  f"**DNS 캐시 적중:** {session_stats['dns_cache_hits']}회\n"
+                  f"**중복 요청 합침:** {fetch_stats['coalesced']}회 (진행 중 {fetch_stats['in_flight']}건)\n"
+                  f"**요청 제한:** 초당 {limiter_stats['rate_per_second']}회 (누적 대기 {limiter_stats['total_wait_seconds']}초)\n"
+                  f"**서킷 상태:** {circuit_stats['state_name']} (차단 {circuit_stats['times_opened']}회)",
+            inline=False
+        )
+
         # 예외 관리자 상태
         exception_count = len(exception_manager.get_exceptions())
         embed.add_field(
@@ -1817,12 +1543,37 @@ class SlashCommands(commands.Cog):
             day_names = ["월요일", "화요일", "수요일", "목요일", "금요일", "토요일", "일요일"]
             day_name = day_names[info["auto_execution_day"]]
             
+            if info.get("auto_execution_mode") == "rolling":
+                schedule_value = (
+                    f"**순환 확인** - {info['rolling_interval_minutes']}분마다 "
+                    f"1/{info['rolling_bucket_count']}씩, {info['rolling_period_hours']}시간마다 전체\n"
+                    f"현재 묶음: {info['rolling_current_bucket'] + 1}/{info['rolling_bucket_count']}"
+                )
+            else:
+                schedule_value = f"**매주 {day_name}** {info['auto_execution_hour']:02d}:{info['auto_execution_minute']:02d}"
+            
             embed.add_field(
                 name="🕒 자동 실행 스케줄",
-                value=f"**매주 {day_name}** {info['auto_execution_hour']:02d}:{info['auto_execution_minute']:02d}",
+                value=schedule_value,
                 inline=False
             )
             
+            # 주민 변경 감시 결과
+            watch = info.get("resident_watch")
+            if watch:
+                if watch["last_run_at"]:
+                    watch_value = (
+                        f"마지막 확인: <t:{int(watch['last_run_at'])}:R> (주민 {watch['residents']}명)\n"
+                        f"들어옴 {watch['joined']}명 · 떠남 {watch['left']}명 · 이동 {watch['moved']}명"
+                    )
+                else:
+                    watch_value = "아직 실행되지 않았습니다."
+                embed.add_field(
+                    name=f"👀 주민 변경 감시 ({watch['nation']})",
+                    value=watch_value,
+                    inline=False
+                )
+            
             # 등록된 작업들
             if info["jobs"]:
                 job_list = []
@@ -1859,8 +1610,9 @@ class SlashCommands(commands.Cog):
             await interaction.response.send_message(embed=embed, ephemeral=True)
 
     @app_commands.command(name="자동실행시작", description="자동 역할 부여를 수동으로 시작합니다")
+    @app_commands.describe(모의실행="대기열에 추가하지 않고 추가될 인원과 절약되는 API 요청 수만 확인합니다")
     @app_commands.check(is_admin)
-    async def 자동실행시작(self, interaction: discord.Interaction):
+    async def 자동실행시작(self, interaction: discord.Interaction, 모의실행: bool = False):
         """자동 역할 부여를 수동으로 실행"""
         await interaction.response.defer(thinking=True)
         
@@ -1871,8 +1623,9 @@ class SlashCommands(commands.Cog):
             current_queue_size = queue_manager.get_queue_size()
             
             embed = discord.Embed(
-                title="🚀 자동 역할 실행 시작",
-                description="auto_roles.txt 파일의 역할 멤버들을 대기열에 추가하고 있습니다...",
+                title="🧪 자동 역할 모의 실행" if 모의실행 else "🚀 자동 역할 실행 시작",
+                description="auto_roles.txt 파일의 역할 멤버들을 확인하고 있습니다..." if 모의실행
+                            else "auto_roles.txt 파일의 역할 멤버들을 대기열에 추가하고 있습니다...",
                 color=0xffaa00
             )
             
@@ -1885,9 +1638,31 @@ class SlashCommands(commands.Cog):
             await interaction.followup.send(embed=embed, ephemeral=True)
             
             # 자동 역할 실행
-            result = await manual_execute_auto_roles(self.bot)
+            result = await manual_execute_auto_roles(self.bot, dry_run=모의실행)
             
-            if result["success"]:
+            if result["success"] and 모의실행:
+                embed = discord.Embed(
+                    title="🧪 모의 실행 결과",
+                    description=result["message"],
+                    color=0x00aaff
+                )
+                
+                embed.add_field(
+                    name="📊 결과",
+                    value=f"• 대상 멤버: **{result['targeted']}명**\n"
+                          f"• 추가 예정: **{result['added_count']}명**\n"
+                          f"• 이미 대기 중: **{result['already_queued']}명**\n"
+                          f"• 예외 대상: **{result['excluded']}명**",
+                    inline=False
+                )
+                
+                embed.add_field(
+                    name="⏭️ 최근 확인으로 건너뜀",
+                    value=f"• 건너뛸 인원: **{result['fresh']}명** (최근 {VERIFY_FRESHNESS_HOURS:g}시간 내 확인)\n"
+                          f"• 절약되는 API 요청: 약 **{result['api_calls_saved']}회**",
+                    inline=False
+                )
+            elif result["success"]:
                 embed = discord.Embed(
                     title="✅ 자동 역할 실행 완료",
                     description=result["message"],
@@ -1898,12 +1673,14 @@ class SlashCommands(commands.Cog):
                 
                 embed.add_field(
                     name="📊 결과",
-                    value=f"• 추가된 사용자: **{result.get('added_count', 0)}명**\n• 현재 대기열: **{new_queue_size}명**",
+                    value=f"• 추가된 사용자: **{result.get('added_count', 0)}명**\n"
+                          f"• 최근 확인으로 건너뜀: **{result.get('fresh', 0)}명**\n"
+                          f"• 현재 대기열: **{new_queue_size}명**",
                     inline=False
                 )
                 
                 if new_queue_size > 0:
-                    estimated_time = new_queue_size * 36  # 대략 배치당 36초 추정
+                    estimated_time = queue_worker_pool.estimate_seconds(new_queue_size)
                     minutes = estimated_time // 60
                     seconds = estimated_time % 60
                     
@@ -1958,30 +1735,18 @@ class SlashCommands(commands.Cog):
         
         if 기능 == "목록":
             # 예외 목록 표시
-            exceptions = exception_manager.get_exceptions()
+            exceptions = sorted(exception_manager.get_exceptions())
             
-            embed = discord.Embed(
+            view = PaginatorView(
                 title="📋 자동실행 예외 목록",
-                color=0x00bfff
+                items=exceptions,
+                format_item=lambda user_id: f"• <@{user_id}>",
+                description=f"총 **{len(exceptions)}명**이 예외 설정되어 있습니다." if exceptions else None,
+                field_name="예외 대상",
+                empty_text="현재 예외 설정된 사용자가 없습니다.",
+                owner_id=interaction.user.id
             )
-            
-            if not exceptions:
-                embed.description = "현재 예외 설정된 사용자가 없습니다."
-            else:
-                embed.description = f"총 **{len(exceptions)}명**이 예외 설정되어 있습니다."
-                
-                # 10명씩 나누어서 표시
-                for i in range(0, len(exceptions), 10):
-                    chunk = exceptions[i:i+10]
-                    mentions = [f"<@{user_id}>" for user_id in chunk]
-                    
-                    embed.add_field(
-                        name=f"예외 대상 ({i+1}-{min(i+10, len(exceptions))})",
-                        value="\n".join(mentions),
-                        inline=False
-                    )
-            
-            await interaction.response.send_message(embed=embed, ephemeral=True)
+            await view.send(interaction)
             return
         
         # 추가/제거 시 대상이 필요함
@@ -2106,16 +1871,10 @@ class SlashCommands(commands.Cog):
         """대기열을 통한 처리"""
         await interaction.response.defer(thinking=True)
         
-        added_count = 0
-        already_in_queue = 0
-        
-        # 대기열에 사용자 추가
-        for member in members:
-            try:
-                queue_manager.add_user(member.id)
-                added_count += 1
-            except:
-                already_in_queue += 1
+        # 대기열에 사용자 한 번에 추가 (이미 대기 중인 사용자는 직접 요청 구간으로 앞당겨짐)
+        user_ids = {member.id for member in members}
+        added_count = queue_manager.add_users(user_ids, LANE_MANUAL)
+        already_in_queue = len(user_ids) - added_count
         
         # 결과 메시지 생성
         embed = discord.Embed(
@@ -2153,232 +1912,126 @@ class SlashCommands(commands.Cog):
         await interaction.followup.send(embed=embed, ephemeral=True)
 
     async def _handle_immediate_processing(self, interaction: discord.Interaction, members: list, target_type: str, target_name: str):
-        """기존 즉시 처리 방식 (API 제한 위험)"""
-        await interaction.response.defer(thinking=True)
+        """즉시 처리 (여러 명을 동시에 조회하고 진행 상황을 응답 메시지에 표시)"""
+        await interaction.response.defer(thinking=True, ephemeral=True)
 
         not_base_nation = []
         errors = []
 
-        print(f"🔍 /국민확인 명령어 시작 - 대상: {target_type} '{target_name}', 총 {len(members)}명")
+        print(f"🔍 /국민확인 명령어 시작 - 대상: {target_type} '{target_name}', 총 {len(members)}명 "
+              f"(동시 조회 {IMMEDIATE_CHECK_CONCURRENCY}개)")
 
-        async with aiohttp.ClientSession() as session:
-            for idx, member in enumerate(members, 1):
-                discord_id = member.id
-                print(f"📋 [{idx}/{len(members)}] 처리 중: {member.display_name} (ID: {discord_id})")
+        progress_shown = False
 
-                try:
-                    # 1단계: 디스코드 ID → 마크 ID
-                    url1 = f"{MC_API_BASE}/discord?discord={discord_id}"
-                    print(f"  🔗 1단계 API 호출: {url1}")
-                    
-                    async with session.get(url1, timeout=aiohttp.ClientTimeout(total=10)) as r1:
-                        print(f"  📥 1단계 응답: HTTP {r1.status}")
-                        if r1.status != 200:
-                            error_msg = f"마크ID 조회 실패 ({r1.status})"
-                            errors.append(f"{member.mention} - {error_msg}")
-                            print(f"  ❌ {error_msg}")
-                            continue
-                        
-                        data1 = await r1.json()
-                        print(f"  📋 1단계 데이터: {data1}")
-                        
-                        if not data1.get('data') or not data1['data']:
-                            error_msg = "마크ID 데이터 없음"
-                            errors.append(f"{member.mention} - {error_msg}")
-                            print(f"  ❌ {error_msg}")
-                            continue
-                            
-                        mc_id = data1['data'][0].get('name')
-                        if not mc_id:
-                            error_msg = "마크ID 없음"
-                            errors.append(f"{member.mention} - {error_msg}")
-                            print(f"  ❌ {error_msg}")
-                            continue
-                        
-                        print(f"  ✅ 마크 ID 획득: {mc_id}")
-                        time.sleep(5)
-
-                    # 2단계: 마크 ID → 마을
-                    url2 = f"{MC_API_BASE}/resident?name={mc_id}"
-                    print(f"  🔗 2단계 API 호출: {url2}")
-                    
-                    async with session.get(url2, timeout=aiohttp.ClientTimeout(total=10)) as r2:
-                        print(f"  📥 2단계 응답: HTTP {r2.status}")
-                        if r2.status != 200:
-                            error_msg = f"마을 조회 실패 ({r2.status})"
-                            errors.append(f"{member.mention} (마크: {mc_id}) - {error_msg}")
-                            print(f"  ❌ {error_msg}")
-                            continue
-                            
-                        data2 = await r2.json()
-                        print(f"  📋 2단계 데이터: {data2}")
-                        
-                        if not data2.get('data') or not data2['data']:
-                            error_msg = "마을 데이터 없음"
-                            errors.append(f"{member.mention} (마크: {mc_id}) - {error_msg}")
-                            print(f"  ❌ {error_msg}")
-                            continue
-                            
-                        town = data2['data'][0].get('town')
-                        if not town:
-                            error_msg = "마을 없음"
-                            errors.append(f"{member.mention} (마크: {mc_id}) - {error_msg}")
-                            print(f"  ❌ {error_msg}")
-                            continue
-                        
-                        print(f"  ✅ 마을 획득: {town}")
-                        time.sleep(5)
+        async def show_progress(progress):
+            nonlocal progress_shown
+            await interaction.edit_original_response(content=progress.format())
+            progress_shown = True
 
-                    # 3단계: 마을 → 국가
-                    url3 = f"{MC_API_BASE}/town?name={town}"
-                    print(f"  🔗 3단계 API 호출: {url3}")
-                    
-                    async with session.get(url3, timeout=aiohttp.ClientTimeout(total=10)) as r3:
-                        print(f"  📥 3단계 응답: HTTP {r3.status}")
-                        if r3.status != 200:
-                            error_msg = f"국가 조회 실패 ({r3.status})"
-                            errors.append(f"{member.mention} (마을: {town}) - {error_msg}")
-                            print(f"  ❌ {error_msg}")
-                            continue
-                            
-                        data3 = await r3.json()
-                        print(f"  📋 3단계 데이터: {data3}")
-                        
-                        if not data3.get('data') or not data3['data']:
-                            error_msg = "국가 데이터 없음"
-                            errors.append(f"{member.mention} (마을: {town}) - {error_msg}")
-                            print(f"  ❌ {error_msg}")
-                            continue
-                            
-                        nation = data3['data'][0].get('nation')
-                        if not nation:
-                            error_msg = "국가 없음"
-                            errors.append(f"{member.mention} (마을: {town}) - {error_msg}")
-                            print(f"  ❌ {error_msg}")
-                            continue
-                        
-                        print(f"  ✅ 국가 획득: {nation}")
-                        time.sleep(5)
-
-                        if nation != BASE_NATION:
-                            not_base_nation.append(f"{member.mention} (국가: {nation}, 마크: {mc_id})")
-                            print(f"  ⚠️ 다른 국가 소속: {nation}")
-                        else:
-                            print(f"  ✅ {BASE_NATION} 국민 확인")
+        results = await resolve_members_with_progress(
+            [member.id for member in members],
+            IMMEDIATE_CHECK_CONCURRENCY,
+            show_progress,
+            PROGRESS_EDIT_SECONDS
+        )
 
-                except Exception as e:
-                    error_msg = f"오류 발생: {str(e)[:50]}"
-                    errors.append(f"{member.mention} - {error_msg}")
-                    print(f"  💥 예외 발생: {e}")
+        for member in members:
+            result = results[member.id]
+            if isinstance(result, ResolutionError):
+                if result.town:
+                    errors.append(f"{member.mention} (마을: {result.town}) - {result.message}")
+                elif result.mc_id:
+                    errors.append(f"{member.mention} (마크: {result.mc_id}) - {result.message}")
+                else:
+                    errors.append(f"{member.mention} - {result.message}")
+            elif isinstance(result, Exception):
+                errors.append(f"{member.mention} - 오류 발생: {str(result)[:50]}")
+                print(f"  💥 예외 발생 ({member.display_name}): {result}")
+            elif result.nation != BASE_NATION:
+                not_base_nation.append(f"{member.mention} (국가: {result.nation}, 마크: {result.mc_id})")
 
         print(f"🏁 /국민확인 처리 완료 - 총 {len(members)}명 중 다른국가: {len(not_base_nation)}명, 오류: {len(errors)}명")
 
-        # 메시지를 여러 개의 임베드로 분할하여 준비
-        embeds_data = []
-        
-        # 첫 번째 임베드 (기본 응답)
-        main_embed = {
-            "title": f"🛡️ 국민 확인 결과",
-            "color": 0x00bfff,
-            "fields": []
-        }
-
-        # 대상 정보 추가
+        # 대상 정보
         if target_type == "유저":
             description = f"**{target_name}** 사용자 확인 완료"
         else:
             description = f"**{target_name}** 역할 ({len(members)}명) 확인 완료"
         
-        main_embed["description"] = description
-
-        # not_base_nation이 있으면 일부를 첫 번째 임베드에 추가
-        if not_base_nation:
-            display_count = min(10, len(not_base_nation))
-            value = "\n".join(not_base_nation[:display_count])
-            if len(not_base_nation) > 10:
-                value += f"\n...그리고 {len(not_base_nation) - 10}명 더"
-            
-            main_embed["fields"].append({
-                "name": f"⚠️ 다른 국가 소속 ({len(not_base_nation)}명)",
-                "value": value,
-                "inline": False
-            })
-
-        # errors가 있으면 일부를 첫 번째 임베드에 추가
-        if errors:
-            display_count = min(10, len(errors))
-            value = "\n".join(errors[:display_count])
-            if len(errors) > 10:
-                value += f"\n...그리고 {len(errors) - 10}개 더"
-                
-            main_embed["fields"].append({
-                "name": f"⚠️ 오류 또는 실패 ({len(errors)}명)",
-                "value": value,
-                "inline": False
-            })
-
-        if not main_embed["fields"]:
-            main_embed["fields"].append({
-                "name": f"✅ {BASE_NATION} 국민 확인 완료",
-                "value": f"모든 {len(members)}명이 {BASE_NATION} 소속입니다!",
-                "inline": False
-            })
+        if not not_base_nation and not errors:
+            description += f"\n✅ 모든 {len(members)}명이 {BASE_NATION} 소속입니다!"
+        else:
+            description += (f"\n⚠️ 다른 국가 소속 **{len(not_base_nation)}명** · "
+                            f"❌ 오류 또는 실패 **{len(errors)}명**")
+        
+        # 진행 상황 메시지를 지우고 결과 첫 페이지를 나만 보이는 메시지로 전송 (나머지는 버튼으로 넘겨 봄)
+        if progress_shown:
+            try:
+                await interaction.delete_original_response()
+            except discord.HTTPException:
+                pass
+        view = PaginatorView(
+            title="🛡️ 국민 확인 결과",
+            items=[f"⚠️ {line}" for line in not_base_nation] + [f"❌ {line}" for line in errors],
+            description=description,
+            field_name="확인 필요 멤버",
+            empty_text=f"모든 멤버가 {BASE_NATION} 국민으로 확인되었습니다.",
+            owner_id=interaction.user.id
+        )
+        await view.send(interaction)
 
-        # 첫 번째 응답 전송
+    @app_commands.command(name="인구조사", description="[관리자] 저장된 확인 결과로 서버 멤버의 국가/마을 분포를 확인합니다")
+    @app_commands.describe(갱신="확인 기록이 없거나 오래된 멤버를 대기열에 추가합니다 (예외 사용자 제외, 기본: 추가 안 함)")
+    @app_commands.check(is_admin)
+    async def 인구조사(self, interaction: discord.Interaction, 갱신: bool = False):
+        """저장소의 마지막 확인 결과로 국가/마을 분포 집계 (API 호출 없음)"""
+        member_ids = [member.id for member in interaction.guild.members if not member.bot]
+        census = take_census(member_ids, BASE_NATION, VERIFY_FRESHNESS_HOURS * 3600)
+        
+        print(f"📊 인구조사: 멤버 {census.total}명, {census.elapsed_ms:.1f}ms "
+              f"(오래된 기록 {len(census.stale_ids)}명, 기록 없음 {len(census.missing_ids)}명)")
+        
         embed = discord.Embed(
-            title=main_embed["title"],
-            color=main_embed["color"]
+            title="📊 서버 인구조사",
+            description=f"봇을 제외한 멤버 **{census.total}명**의 마지막 확인 결과입니다.",
+            color=0x00bfff
         )
         
-        if "description" in main_embed:
-            embed.description = main_embed["description"]
-            
-        for field in main_embed["fields"]:
-            embed.add_field(
-                name=field["name"],
-                value=field["value"],
-                inline=field.get("inline", False)
-            )
-        await interaction.followup.send(embed=embed, ephemeral=True)
-
-        # 추가 데이터가 있으면 웹훅으로 전송
-        # not_base_nation 추가 페이지들
-        if len(not_base_nation) > 10:
-            for i in range(10, len(not_base_nation), 15):
-                chunk = not_base_nation[i:i+15]
-                embed_data = {
-                    "title": f"⚠️ 다른 국가 소속 (추가 {(i-10)//15 + 1}페이지)",
-                    "color": 0xff9900,
-                    "fields": [
-                        {
-                            "name": f"멤버 목록 ({i+1}-{min(i+15, len(not_base_nation))} / {len(not_base_nation)})",
-                            "value": "\n".join(chunk),
-                            "inline": False
-                        }
-                    ]
-                }
-                embeds_data.append(embed_data)
-
-        # errors 추가 페이지들
-        if len(errors) > 10:
-            for i in range(10, len(errors), 15):
-                chunk = errors[i:i+15]
-                embed_data = {
-                    "title": f"⚠️ 오류 또는 실패 (추가 {(i-10)//15 + 1}페이지)",
-                    "color": 0xff0000,
-                    "fields": [
-                        {
-                            "name": f"오류 목록 ({i+1}-{min(i+15, len(errors))} / {len(errors)})",
-                            "value": "\n".join(chunk),
-                            "inline": False
-                        }
-                    ]
-                }
-                embeds_data.append(embed_data)
-
-        # 추가 임베드가 있으면 웹훅으로 전송
-        if embeds_data:
-            await self.send_long_message_via_webhook(interaction, embeds_data)
+        embed.add_field(
+            name="📋 분류별",
+            value="\n".join(
+                f"• {label}: **{count}명** ({count / census.total * 100:.1f}%)" if census.total else f"• {label}: **0명**"
+                for label, count in zip(CATEGORY_LABELS, census.categories)
+            ),
+            inline=False
+        )
+        
+        if census.nations:
+            nation_lines = [f"• {nation}: {count}명" for nation, count in census.nations[:10]]
+            if len(census.nations) > 10:
+                nation_lines.append(f"• ... 외 {len(census.nations) - 10}개 국가")
+            embed.add_field(name="🌍 국가 분포", value="\n".join(nation_lines), inline=True)
+        
+        if census.base_towns:
+            town_lines = [f"• {town}: {count}명" for town, count in census.base_towns[:15]]
+            if len(census.base_towns) > 15:
+                town_lines.append(f"• ... 외 {len(census.base_towns) - 15}개 마을")
+            embed.add_field(name=f"🏘️ {BASE_NATION} 마을 분포", value="\n".join(town_lines), inline=True)
+        
+        # 기록이 없거나 오래된 멤버만 다시 확인 (예외 사용자 제외)
+        exception_ids = set(exception_manager.get_exceptions())
+        refresh_ids = [user_id for user_id in census.missing_ids + census.stale_ids if user_id not in exception_ids]
+        refresh_text = (f"• 확인 기록 없음: **{len(census.missing_ids)}명**\n"
+                        f"• {VERIFY_FRESHNESS_HOURS:g}시간 지난 기록: **{len(census.stale_ids)}명**")
+        if 갱신 and refresh_ids:
+            added_count = queue_manager.add_users(refresh_ids, LANE_BULK)
+            refresh_text += f"\n🔄 대기열에 **{added_count}명** 추가 (확인 후 다시 조사하면 반영됩니다)"
+        elif refresh_ids:
+            refresh_text += "\n💡 `갱신:True`로 실행하면 이 멤버들을 다시 확인합니다."
+        embed.add_field(name="🕒 기록 상태", value=refresh_text, inline=False)
+        
+        embed.set_footer(text=f"집계 {census.elapsed_ms:.1f}ms · API 호출 없음")
+        await interaction.response.send_message(embed=embed, ephemeral=True)
 
     @app_commands.command(name="대기열상태", description="현재 대기열 상태를 확인합니다")
     @app_commands.check(is_admin)
@@ -2405,8 +2058,76 @@ class SlashCommands(commands.Cog):
             inline=True
         )
         
+        worker_stats = queue_worker_pool.get_stats()
+        speed_text = f"{worker_stats['users_per_minute']}명/분" if worker_stats['users_per_minute'] else "측정 전"
+        embed.add_field(
+            name="👷 작업자",
+            value=f"{worker_stats['busy']}/{worker_stats['worker_count']}개 처리 중\n"
+                  f"처리 속도: {speed_text}",
+            inline=True
+        )
+        
+        # 처리 구간별 대기 현황
+        def format_wait(seconds):
+            seconds = int(seconds)
+            return f"{seconds // 60}분 {seconds % 60}초" if seconds >= 60 else f"{seconds}초"
+        
+        lane_lines = []
+        for lane in queue_manager.get_lane_stats():
+            line = f"{lane['name']} (가중치 {lane['weight']}): **{lane['size']}명**"
+            if lane['size'] > 0:
+                line += f" · 최장 대기 {format_wait(lane['oldest_wait'])}"
+            if lane['average_wait'] is not None:
+                line += f" · 평균 대기 {format_wait(lane['average_wait'])}"
+            lane_lines.append(line)
+        
+        if lane_lines:
+            embed.add_field(
+                name="🚦 처리 구간",
+                value="\n".join(lane_lines),
+                inline=False
+            )
+        
+        delayed_count = queue_manager.get_delayed_count()
+        dead_letter_count = retry_manager.get_dead_letter_count()
+        if delayed_count or dead_letter_count:
+            embed.add_field(
+                name="🔁 재시도",
+                value=f"재시도 대기: **{delayed_count}명**\n"
+                      f"실패 목록: **{dead_letter_count}명** (`/실패목록`)",
+                inline=False
+            )
+        
+        digest_stats = log_digest.get_stats()
+        if digest_stats["mode"] == "digest":
+            embed.add_field(
+                name="📋 처리 결과 요약",
+                value=f"전송 대기: **{digest_stats['pending']}건** · 요약 전송 {digest_stats['flushes']}회\n"
+                      f"줄인 로그 메시지: {digest_stats['messages_saved']}개"
+                      + (" · 변경된 사용자만 기록" if digest_stats["changes_only"] else ""),
+                inline=False
+            )
+        
+        sync_stats = get_member_sync_stats()
+        if sync_stats["members"]:
+            embed.add_field(
+                name="✏️ 닉네임/역할 적용",
+                value=f"확인 {sync_stats['members']}명 · 수정 요청 {sync_stats['edits']}회\n"
+                      f"변경 없음 {sync_stats['skipped']}명 · 절약한 요청 {sync_stats['requests_saved']}회",
+                inline=False
+            )
+        
+        circuit_stats = api_circuit_breaker.get_stats()
+        if circuit_stats["state"] != CLOSED:
+            embed.add_field(
+                name="🔌 API 상태",
+                value=f"{circuit_stats['state_name']} - 처리 일시 중지\n"
+                      f"재시도까지 약 {circuit_stats['retry_after']:.0f}초 (원인: {circuit_stats['last_error']})",
+                inline=False
+            )
+        
         if queue_size > 0:
-            estimated_time = queue_size * 36  # 대략 배치당 36초 추정
+            estimated_time = queue_worker_pool.estimate_seconds(queue_size)  # 최근 처리 속도 기준
             minutes = estimated_time // 60
             seconds = estimated_time % 60
             hours = minutes // 60
@@ -2447,6 +2168,166 @@ class SlashCommands(commands.Cog):
         
         await interaction.response.send_message(embed=embed, ephemeral=True)
 
+    @app_commands.command(name="캐시", description="API 조회 캐시를 확인하거나 삭제합니다")
+    @app_commands.describe(
+        기능="수행할 작업을 선택하세요",
+        대상="(유저삭제 시) 유저 멘션 또는 유저 ID / (마을삭제 시) 마을 이름"
+    )
+    @app_commands.check(is_admin)
+    async def 캐시(
+        self,
+        interaction: discord.Interaction,
+        기능: Literal["상태", "유저삭제", "마을삭제", "전체삭제"],
+        대상: str = None
+    ):
+        """API 조회 캐시 관리"""
+
+        if 기능 == "상태":
+            embed = discord.Embed(
+                title="🗃️ 조회 캐시 상태",
+                color=0x00bfff
+            )
+
+            for stats in resolution_cache.get_stats():
+                embed.add_field(
+                    name=f"🔗 {stats['name']}",
+                    value=f"항목: {stats['size']}/{stats['max_size']}\n"
+                          f"적중: {stats['hits']} (실패 캐시 {stats['negative_hits']})\n"
+                          f"미적중: {stats['misses']}\n"
+                          f"적중률: {stats['hit_rate']:.1f}%",
+                    inline=True
+                )
+
+            embed.add_field(
+                name="💾 저장소",
+                value=f"사용자: {resolution_store.get_member_count()}명\n"
+                      f"마을: {resolution_store.get_town_count()}개\n"
+                      f"확인 기록: {resolution_store.get_verification_count()}명",
+                inline=True
+            )
+
+            index_stats = town_index.get_stats()
+            last_refresh = (
+                f"<t:{int(index_stats['last_refresh'])}:R>" if index_stats['last_refresh'] else "아직 없음"
+            )
+            embed.add_field(
+                name="🗺️ 마을 색인",
+                value=f"마을: {index_stats['towns']}개 (국가 {index_stats['nations']}개)\n"
+                      f"적중: {index_stats['hits']} / 미적중: {index_stats['misses']}\n"
+                      f"적중률: {index_stats['hit_rate']:.1f}%\n"
+                      f"마지막 갱신: {last_refresh}",
+                inline=True
+            )
+
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+
+        if 기능 == "전체삭제":
+            cleared_count = resolution_cache.clear() + resolution_store.clear()
+            embed = discord.Embed(
+                title="🧹 캐시 초기화 완료",
+                description=f"캐시 항목 **{cleared_count}개**를 삭제했습니다.",
+                color=0xff6600
+            )
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+
+        # 유저삭제/마을삭제 시 대상이 필요함
+        if not 대상:
+            await interaction.response.send_message(
+                "❌ 유저삭제/마을삭제 기능을 사용할 때는 대상을 입력해야 합니다.\n"
+                "예: `/캐시 기능:유저삭제 대상:@사용자` 또는 `/캐시 기능:마을삭제 대상:마을이름`",
+                ephemeral=True
+            )
+            return
+
+        if 기능 == "유저삭제":
+            # 멘션 형식 처리 (< > 제거)
+            target_clean = 대상.replace('<@', '').replace('>', '').replace('!', '')
+
+            try:
+                user_id = int(target_clean)
+            except ValueError:
+                await interaction.response.send_message(
+                    "❌ 올바른 사용자 ID 또는 멘션을 입력해주세요.\n"
+                    "예: `@사용자` 또는 `123456789`",
+                    ephemeral=True
+                )
+                return
+
+            removed = resolution_cache.invalidate_user(user_id)
+            removed = resolution_store.forget_member(user_id) or removed
+            target_text = f"<@{user_id}>님의 캐시"
+        else:
+            removed = resolution_cache.invalidate_town(대상)
+            removed = resolution_store.forget_town(대상) or removed
+            removed = town_index.forget_town(대상) or removed
+            target_text = f"**{대상}** 마을의 캐시"
+
+        if removed:
+            embed = discord.Embed(
+                title="✅ 캐시 삭제 완료",
+                description=f"{target_text}를 삭제했습니다.\n다음 조회 시 API에서 새로 가져옵니다.",
+                color=0x00ff00
+            )
+        else:
+            embed = discord.Embed(
+                title="⚠️ 캐시 없음",
+                description=f"{target_text}가 없습니다.",
+                color=0xffaa00
+            )
+
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
+    @app_commands.command(name="실패목록", description="재시도에 모두 실패한 사용자를 관리합니다")
+    @app_commands.describe(기능="수행할 작업을 선택하세요")
+    @app_commands.check(is_admin)
+    async def 실패목록(
+        self,
+        interaction: discord.Interaction,
+        기능: Literal["목록", "재시도", "비우기"]
+    ):
+        """재시도 실패 목록 관리"""
+        
+        if 기능 == "목록":
+            dead_letters = retry_manager.get_dead_letters()
+            
+            # 실패 시각순 스냅샷을 페이지로 표시
+            items = sorted(dead_letters.items(), key=lambda item: str(item[1].get('failed_at', '')))
+            view = PaginatorView(
+                title="☠️ 재시도 실패 목록",
+                items=items,
+                format_item=lambda item: f"<@{item[0]}> - {item[1].get('error_type', '오류')} ({item[1].get('failed_at', '')})",
+                description=(
+                    f"총 **{len(items)}명**이 {retry_manager.max_attempts}회 재시도에 실패했습니다.\n"
+                    f"`/실패목록 기능:재시도`로 모두 다시 대기열에 넣을 수 있습니다."
+                ) if items else None,
+                field_name="실패 대상",
+                empty_text="재시도에 모두 실패한 사용자가 없습니다.",
+                owner_id=interaction.user.id
+            )
+            await view.send(interaction)
+            return
+        
+        if 기능 == "재시도":
+            user_ids = retry_manager.take_dead_letters()
+            added_count = queue_manager.add_users(user_ids, LANE_MANUAL)
+            
+            embed = discord.Embed(
+                title="🔁 실패 목록 재시도",
+                description=f"**{len(user_ids)}명** 중 **{added_count}명**을 대기열에 다시 추가했습니다.",
+                color=0x00ff00
+            )
+        else:
+            cleared_count = retry_manager.clear_dead_letters()
+            embed = discord.Embed(
+                title="🧹 실패 목록 비우기 완료",
+                description=f"**{cleared_count}명**이 실패 목록에서 제거되었습니다.",
+                color=0xff6600
+            )
+        
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
     @app_commands.command(name="자동실행", description="자동 등록할 역할을 설정")
     @app_commands.describe(역할id="역할 ID")
     @app_commands.check(is_admin)
@@ -2469,6 +2350,9 @@ class SlashCommands(commands.Cog):
     @국민확인.error  
     @대기열상태.error
     @대기열초기화.error
+    @캐시.error
+    @인구조사.error
+    @실패목록.error
     @자동실행.error
     @도움말.error
     @마을역할.error
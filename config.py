@@ -27,6 +27,25 @@ class Config:
 
         # API 설정
         self.MC_API_BASE = self._get_env("MC_API_BASE", "https://api.planetearth.kr")
+        self.MC_API_RATE_PER_SECOND = self._get_env_float("MC_API_RATE_PER_SECOND", 1.0)
+        self.MC_API_RATE_BURST = self._get_env_int("MC_API_RATE_BURST", 3)
+        self.MC_API_CONNECTION_LIMIT = self._get_env_int("MC_API_CONNECTION_LIMIT", 10)
+        self.MC_API_KEEPALIVE_SECONDS = self._get_env_float("MC_API_KEEPALIVE_SECONDS", 30.0)
+        self.MC_API_DNS_CACHE_SECONDS = self._get_env_int("MC_API_DNS_CACHE_SECONDS", 300)
+        self.API_CIRCUIT_FAILURE_THRESHOLD = self._get_env_int("API_CIRCUIT_FAILURE_THRESHOLD", 5)
+        self.API_CIRCUIT_BASE_BACKOFF_SECONDS = self._get_env_float("API_CIRCUIT_BASE_BACKOFF_SECONDS", 30.0)
+        self.API_CIRCUIT_MAX_BACKOFF_SECONDS = self._get_env_float("API_CIRCUIT_MAX_BACKOFF_SECONDS", 600.0)
+
+        # 조회 캐시 설정
+        self.RESOLUTION_CACHE_SIZE = self._get_env_int("RESOLUTION_CACHE_SIZE", 5000)
+        self.CACHE_LINK_TTL_HOURS = self._get_env_float("CACHE_LINK_TTL_HOURS", 168.0)
+        self.CACHE_RESIDENT_TTL_HOURS = self._get_env_float("CACHE_RESIDENT_TTL_HOURS", 6.0)
+        self.CACHE_TOWN_TTL_HOURS = self._get_env_float("CACHE_TOWN_TTL_HOURS", 1.0)
+        self.CACHE_NEGATIVE_TTL_MINUTES = self._get_env_float("CACHE_NEGATIVE_TTL_MINUTES", 10.0)
+        self.RESOLUTION_STORE_PATH = self._get_env("RESOLUTION_STORE_PATH", "resolution_store.db")
+        self.TOWN_INDEX_REFRESH_MINUTES = self._get_env_int("TOWN_INDEX_REFRESH_MINUTES", 30)
+        self.TOWN_INDEX_MAX_NATIONS = self._get_env_int("TOWN_INDEX_MAX_NATIONS", 20)
+        self.RESIDENT_WATCH_INTERVAL_MINUTES = self._get_env_int("RESIDENT_WATCH_INTERVAL_MINUTES", 60)
         
         # Discord 서버 설정
         self.GUILD_ID = self._get_env_int("GUILD_ID")
@@ -36,6 +55,10 @@ class Config:
         self.LOG_CHANNEL_ID = self._get_env_int("LOG_CHANNEL_ID")
         self.SUCCESS_CHANNEL_ID = self._get_env_int("SUCCESS_CHANNEL_ID")
         self.FAILURE_CHANNEL_ID = self._get_env_int("FAILURE_CHANNEL_ID")
+        self.LOG_MODE = self._get_env("LOG_MODE", "digest").lower()
+        self.LOG_DIGEST_INTERVAL_SECONDS = self._get_env_float("LOG_DIGEST_INTERVAL_SECONDS", 300.0)
+        self.LOG_DIGEST_MAX_ENTRIES = self._get_env_int("LOG_DIGEST_MAX_ENTRIES", 50)
+        self.LOG_CHANGES_ONLY = self._get_env_bool("LOG_CHANGES_ONLY", False)
         self.WELCOME_CHANNEL_ID = self._get_env_int("WELCOME_CHANNEL_ID")
         
         # 자동 실행 설정
@@ -43,12 +66,29 @@ class Config:
         self.AUTO_EXECUTION_DAY = self._get_env_int("AUTO_EXECUTION_DAY", 6)
         self.AUTO_EXECUTION_HOUR = self._get_env_int("AUTO_EXECUTION_HOUR", 2)
         self.AUTO_EXECUTION_MINUTE = self._get_env_int("AUTO_EXECUTION_MINUTE", 0)
+        self.AUTO_EXECUTION_MODE = self._get_env("AUTO_EXECUTION_MODE", "weekly").lower()
+        self.ROLLING_PERIOD_HOURS = self._get_env_int("ROLLING_PERIOD_HOURS", 168)
+        self.ROLLING_INTERVAL_MINUTES = self._get_env_int("ROLLING_INTERVAL_MINUTES", 60)
+        self.QUEUE_WORKER_COUNT = self._get_env_int("QUEUE_WORKER_COUNT", 3)
+        self.IMMEDIATE_CHECK_CONCURRENCY = self._get_env_int("IMMEDIATE_CHECK_CONCURRENCY", 5)
+        self.QUEUE_JOURNAL_PATH = self._get_env("QUEUE_JOURNAL_PATH", "queue_journal.log")
+        self.QUEUE_WEIGHT_JOIN = self._get_env_int("QUEUE_WEIGHT_JOIN", 6)
+        self.QUEUE_WEIGHT_MANUAL = self._get_env_int("QUEUE_WEIGHT_MANUAL", 3)
+        self.QUEUE_WEIGHT_BULK = self._get_env_int("QUEUE_WEIGHT_BULK", 1)
+        self.RETRY_MAX_ATTEMPTS = self._get_env_int("RETRY_MAX_ATTEMPTS", 4)
+        self.RETRY_BASE_DELAY_SECONDS = self._get_env_float("RETRY_BASE_DELAY_SECONDS", 60.0)
+        self.RETRY_MAX_DELAY_SECONDS = self._get_env_float("RETRY_MAX_DELAY_SECONDS", 1800.0)
+        self.VERIFY_FRESHNESS_HOURS = self._get_env_float("VERIFY_FRESHNESS_HOURS", 24.0)
 
         # 범위 유효성 검사
         if not (0 <= self.AUTO_EXECUTION_HOUR <= 23):
             raise ValueError("❌ AUTO_EXECUTION_HOUR는 0~23 사이여야 합니다.")
         if not (0 <= self.AUTO_EXECUTION_MINUTE <= 59):
             raise ValueError("❌ AUTO_EXECUTION_MINUTE는 0~59 사이여야 합니다.")
+        if self.AUTO_EXECUTION_MODE not in ("weekly", "rolling"):
+            raise ValueError("❌ AUTO_EXECUTION_MODE는 weekly 또는 rolling이어야 합니다.")
+        if not (1 <= self.ROLLING_INTERVAL_MINUTES <= self.ROLLING_PERIOD_HOURS * 60):
+            raise ValueError("❌ ROLLING_INTERVAL_MINUTES는 1 이상, ROLLING_PERIOD_HOURS 이하여야 합니다.")
         
         # 추가 설정
         self.AUTO_ADD_NEW_MEMBERS = self._get_env_bool("AUTO_ADD_NEW_MEMBERS", True)
@@ -75,6 +115,17 @@ class Config:
             print(f"⚠️ {key}의 값 '{value}'을(를) 정수로 변환할 수 없습니다. 기본값 사용: {default}")
             return default
     
+    def _get_env_float(self, key: str, default: Optional[float] = None) -> Optional[float]:
+        """환경변수를 float로 변환하여 가져오기"""
+        value = os.getenv(key)
+        if value is None:
+            return default
+        try:
+            return float(value)
+        except ValueError:
+            print(f"⚠️ {key}의 값 '{value}'을(를) 실수로 변환할 수 없습니다. 기본값 사용: {default}")
+            return default
+    
     def _get_env_bool(self, key: str, default: bool = False) -> bool:
         """환경변수를 bool로 변환하여 가져오기"""
         value = os.getenv(key, "").lower()
@@ -105,6 +156,11 @@ class Config:
         config_items = [
             ("DISCORD_TOKEN", "✅ 설정됨" if self.DISCORD_TOKEN else "❌ 누락"),
             ("MC_API_BASE", self.MC_API_BASE),
+            ("MC_API_RATE_PER_SECOND", self.MC_API_RATE_PER_SECOND),
+            ("MC_API_RATE_BURST", self.MC_API_RATE_BURST),
+            ("MC_API_CONNECTION_LIMIT", self.MC_API_CONNECTION_LIMIT),
+            ("RESOLUTION_CACHE_SIZE", self.RESOLUTION_CACHE_SIZE),
+            ("RESOLUTION_STORE_PATH", self.RESOLUTION_STORE_PATH),
             ("GUILD_ID", self.GUILD_ID),
             ("SUCCESS_ROLE_ID", self.SUCCESS_ROLE_ID),
             ("SUCCESS_CHANNEL_ID", self.SUCCESS_CHANNEL_ID),
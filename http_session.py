@@ -0,0 +1,117 @@
+# http_session.py
+"""
+PlanetEarth API 공용 HTTP 세션 관리
+봇이 하나의 aiohttp 세션을 소유하고 모든 API 요청이 연결을 재사용합니다.
+"""
+
+from contextlib import asynccontextmanager
+
+import aiohttp
+
+
+class HttpSessionManager:
+    """keep-alive 연결 풀을 가진 aiohttp 세션을 관리하는 클래스"""
+
+    def __init__(self, limit_per_host: int = 10, keepalive_timeout: float = 30.0, dns_cache_ttl: int = 300):
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.dns_cache_ttl = dns_cache_ttl
+        self._session = None
+
+        # 연결 재사용 통계
+        self._stats = {
+            "requests": 0,
+            "connections_created": 0,
+            "connections_reused": 0,
+            "dns_cache_hits": 0,
+            "dns_cache_misses": 0,
+            "sessions_created": 0
+        }
+
+    def _create_trace_config(self) -> aiohttp.TraceConfig:
+        """연결 생성/재사용을 집계하는 TraceConfig 생성"""
+        trace_config = aiohttp.TraceConfig()
+
+        async def on_request_start(session, context, params):
+            self._stats["requests"] += 1
+
+        async def on_connection_create_end(session, context, params):
+            self._stats["connections_created"] += 1
+
+        async def on_connection_reuseconn(session, context, params):
+            self._stats["connections_reused"] += 1
+
+        async def on_dns_cache_hit(session, context, params):
+            self._stats["dns_cache_hits"] += 1
+
+        async def on_dns_cache_miss(session, context, params):
+            self._stats["dns_cache_misses"] += 1
+
+        trace_config.on_request_start.append(on_request_start)
+        trace_config.on_connection_create_end.append(on_connection_create_end)
+        trace_config.on_connection_reuseconn.append(on_connection_reuseconn)
+        trace_config.on_dns_cache_hit.append(on_dns_cache_hit)
+        trace_config.on_dns_cache_miss.append(on_dns_cache_miss)
+        return trace_config
+
+    async def start(self):
+        """세션 생성 (이미 열려 있으면 그대로 사용)"""
+        if self._session and not self._session.closed:
+            return
+
+        connector = aiohttp.TCPConnector(
+            limit_per_host=self.limit_per_host,
+            keepalive_timeout=self.keepalive_timeout,
+            use_dns_cache=True,
+            ttl_dns_cache=self.dns_cache_ttl
+        )
+        self._session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=10),
+            trace_configs=[self._create_trace_config()]
+        )
+        self._stats["sessions_created"] += 1
+        print(f"✅ API 세션 생성 (호스트당 연결: {self.limit_per_host}, keep-alive: {self.keepalive_timeout}초)")
+
+    async def close(self):
+        """세션 종료"""
+        if self._session and not self._session.closed:
+            await self._session.close()
+            print("🛑 API 세션 종료")
+        self._session = None
+
+    async def get_session(self) -> aiohttp.ClientSession:
+        """공용 세션 반환 (필요 시 생성)"""
+        if not self._session or self._session.closed:
+            await self.start()
+        return self._session
+
+    @asynccontextmanager
+    async def session(self):
+        """공용 세션을 빌려주는 컨텍스트 매니저 (종료 시 세션을 닫지 않음)"""
+        yield await self.get_session()
+
+    def get_stats(self) -> dict:
+        """연결 재사용 통계 반환"""
+        stats = dict(self._stats)
+        total_connections = stats["connections_created"] + stats["connections_reused"]
+        stats["reuse_rate"] = (stats["connections_reused"] / total_connections * 100) if total_connections else 0.0
+        stats["is_open"] = bool(self._session and not self._session.closed)
+        return stats
+
+
+def _create_http_session_manager() -> HttpSessionManager:
+    """config 설정으로 세션 관리자 생성"""
+    try:
+        from config import config
+        return HttpSessionManager(
+            limit_per_host=config.MC_API_CONNECTION_LIMIT,
+            keepalive_timeout=config.MC_API_KEEPALIVE_SECONDS,
+            dns_cache_ttl=config.MC_API_DNS_CACHE_SECONDS
+        )
+    except ImportError:
+        return HttpSessionManager()
+
+
+# 전역 HTTP 세션 관리자 인스턴스
+http_session_manager = _create_http_session_manager()
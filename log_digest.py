@@ -0,0 +1,209 @@
+# log_digest.py
+"""
+처리 결과 로그 요약
+대기열 처리 결과를 사용자마다 채널에 보내지 않고 모아 두었다가,
+일정 시간마다 또는 일정 개수가 쌓이면 요약 임베드(확인 N명, 변경 M명, 실패 K명 - 원인별)로 보냅니다.
+"""
+
+import time
+from collections import Counter
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, List, Optional
+
+import discord
+
+from planetearth_client import AccountNotLinkedError, NoTownError, NoNationError, ApiRequestError
+
+LOG_MODE_EACH = "each"      # 사용자마다 임베드 전송 (기존 방식)
+LOG_MODE_DIGEST = "digest"  # 모아서 요약 임베드 전송
+
+# 실패 원인 분류 (위에서부터 먼저 일치하는 항목)
+FAILURE_REASONS = [
+    (AccountNotLinkedError, "🔗 계정 미연동"),
+    (NoTownError, "🏚️ 마을 없음"),
+    (NoNationError, "🏳️ 국가 없음"),
+    (ApiRequestError, "🔌 API 오류"),
+    (discord.HTTPException, "🤖 디스코드 오류"),
+]
+
+MEMBER_NOT_FOUND = "👻 서버에 없음"
+OTHER_ERROR = "❓ 기타 오류"
+
+# 임베드 한 필드에 표시할 최대 사용자 수
+MAX_LISTED_USERS = 15
+
+
+def classify_failure(error: Optional[Exception]) -> str:
+    """실패 원인 분류 이름 반환"""
+    if error is None:
+        return MEMBER_NOT_FOUND
+    for error_type, reason in FAILURE_REASONS:
+        if isinstance(error, error_type):
+            return reason
+    return OTHER_ERROR
+
+
+class LogDigest:
+    """처리 결과를 모아 요약 임베드로 보내는 클래스"""
+
+    def __init__(self, mode: str = LOG_MODE_DIGEST, interval_seconds: float = 300.0, max_entries: int = 50,
+                 changes_only: bool = False):
+        self.mode = mode if mode in (LOG_MODE_EACH, LOG_MODE_DIGEST) else LOG_MODE_DIGEST
+        self.interval_seconds = interval_seconds
+        self.max_entries = max(1, max_entries)
+        self.changes_only = changes_only
+        self._reset()
+
+        # 통계
+        self.flushes = 0
+        self.messages_saved = 0
+
+    def _reset(self):
+        self._started_at = time.time()
+        self._verified = 0
+        self._nations = Counter()
+        self._changed: List[str] = []   # 변경된 사용자 한 줄 요약
+        self._failures: Dict[str, List[str]] = {}  # 원인 -> 사용자 목록
+        self._dead_lettered: List[str] = []
+        self._entries = 0
+
+    @property
+    def is_digest(self) -> bool:
+        return self.mode == LOG_MODE_DIGEST
+
+    def should_log_success(self, changed: bool) -> bool:
+        """사용자별 성공 임베드를 보낼지 (사용자마다 전송하는 모드에서만 사용)"""
+        return changed or not self.changes_only
+
+    def get_pending_count(self) -> int:
+        return self._entries
+
+    def add_success(self, member: discord.Member, mc_id: str, nation: str, changes: List[str], changed: bool):
+        """확인 성공 기록"""
+        self._verified += 1
+        self._nations[nation] += 1
+        self._entries += 1
+        if changed:
+            summary = ", ".join(line.lstrip("• ").replace("*", "") for line in changes)
+            self._changed.append(f"{member.mention} `{mc_id}` - {summary[:80]}")
+
+    def add_failure(self, user_id: int, member: Optional[discord.Member], error: Optional[Exception],
+                    dead_lettered: bool = False):
+        """확인 실패 기록 (error가 None이면 서버에서 사용자를 찾지 못한 경우)"""
+        user = member.mention if member else f"`{user_id}`"
+        self._failures.setdefault(classify_failure(error), []).append(user)
+        if dead_lettered:
+            self._dead_lettered.append(user)
+        self._entries += 1
+
+    def is_full(self) -> bool:
+        return self._entries >= self.max_entries
+
+    def is_due(self) -> bool:
+        return self._entries > 0 and time.time() - self._started_at >= self.interval_seconds
+
+    @staticmethod
+    def _format_users(users: List[str]) -> str:
+        listed = "\n".join(f"• {user}" for user in users[:MAX_LISTED_USERS])
+        if len(users) > MAX_LISTED_USERS:
+            listed += f"\n• ... 외 {len(users) - MAX_LISTED_USERS}명"
+        return listed[:1024]
+
+    def build_embeds(self) -> tuple:
+        """(성공 요약 임베드, 실패 요약 임베드) - 해당 내용이 없으면 None"""
+        period = f"<t:{int(self._started_at)}:t> ~ <t:{int(time.time())}:t>"
+        success_embed = None
+        failure_embed = None
+
+        # 변경된 사용자만 기록하는 경우 변경이 없으면 성공 요약을 보내지 않음
+        if self._verified and (self._changed or not self.changes_only):
+            success_embed = discord.Embed(
+                title="📋 처리 결과 요약",
+                description=f"{period}\n"
+                            f"✅ 확인 **{self._verified}명** · 🔄 변경 **{len(self._changed)}명**",
+                color=0x00ff00
+            )
+            success_embed.add_field(
+                name="🌍 국가별",
+                value="\n".join(f"• {nation}: {count}명" for nation, count in self._nations.most_common(10)),
+                inline=False
+            )
+            if self._changed:
+                success_embed.add_field(
+                    name="🔄 변경된 사용자",
+                    value=self._format_users(self._changed),
+                    inline=False
+                )
+            success_embed.timestamp = datetime.now()
+
+        failed = sum(len(users) for users in self._failures.values())
+        if failed:
+            failure_embed = discord.Embed(
+                title="❌ 처리 실패 요약",
+                description=f"{period}\n❌ 실패 **{failed}명**",
+                color=0xff0000
+            )
+            for reason, users in sorted(self._failures.items(), key=lambda item: -len(item[1]))[:10]:
+                failure_embed.add_field(
+                    name=f"{reason} ({len(users)}명)",
+                    value=self._format_users(users),
+                    inline=False
+                )
+            if self._dead_lettered:
+                failure_embed.add_field(
+                    name=f"☠️ 재시도 중단 ({len(self._dead_lettered)}명)",
+                    value="재시도를 모두 실패하여 실패 목록에 추가되었습니다. (`/실패목록`)",
+                    inline=False
+                )
+            failure_embed.timestamp = datetime.now()
+
+        return success_embed, failure_embed
+
+    async def flush(self, send: Callable[[str, discord.Embed], Awaitable]):
+        """모아 둔 결과를 요약 임베드로 전송 - send(종류, 임베드), 종류는 "success" 또는 "failure" """
+        if not self._entries:
+            return
+
+        entries = self._entries
+        success_embed, failure_embed = self.build_embeds()
+        self._reset()
+
+        sent = 0
+        if success_embed:
+            await send("success", success_embed)
+            sent += 1
+        if failure_embed:
+            await send("failure", failure_embed)
+            sent += 1
+
+        self.flushes += 1
+        self.messages_saved += max(0, entries - sent)
+        print(f"📋 처리 결과 요약 전송: {entries}건 → 메시지 {sent}개")
+
+    def get_stats(self) -> dict:
+        """요약 상태 반환"""
+        return {
+            "mode": self.mode,
+            "changes_only": self.changes_only,
+            "pending": self._entries,
+            "flushes": self.flushes,
+            "messages_saved": self.messages_saved
+        }
+
+
+def _create_log_digest() -> LogDigest:
+    """config 설정으로 로그 요약 생성"""
+    try:
+        from config import config
+        return LogDigest(
+            mode=config.LOG_MODE,
+            interval_seconds=config.LOG_DIGEST_INTERVAL_SECONDS,
+            max_entries=config.LOG_DIGEST_MAX_ENTRIES,
+            changes_only=config.LOG_CHANGES_ONLY
+        )
+    except ImportError:
+        return LogDigest()
+
+
+# 전역 로그 요약 인스턴스
+log_digest = _create_log_digest()
@@ -26,6 +26,15 @@ except ImportError:
     print("⚠️ scheduler.py에서 is_exception_user 함수를 로드할 수 없습니다.")
     is_exception_user = None
 
+# 공용 API 세션 관리자 로드
+from http_session import http_session_manager
+
+# 조회 저장소 로드
+from resolution_store import resolution_store
+
+# 대기열 작업자 풀 로드
+from queue_worker import queue_worker_pool
+
 # Intents 설정
 intents = discord.Intents.all()
 bot = commands.Bot(command_prefix="/", intents=intents)
@@ -50,6 +59,12 @@ async def on_ready():
         except Exception as e:
             print(f"⚠️ 예외 관리자 초기화 오류: {e}")
     
+    # 공용 API 세션 준비 (재연결 시에도 세션 유지)
+    try:
+        await http_session_manager.start()
+    except Exception as e:
+        print(f"⚠️ API 세션 생성 오류: {e}")
+    
     # 확장 로드
     print("📦 확장 로드 중...")
     await load_extensions()
@@ -122,7 +137,7 @@ async def on_member_join(member):
         
         # queue_manager 로드
         try:
-            from queue_manager import queue_manager
+            from queue_manager import queue_manager, LANE_JOIN
         except ImportError as e:
             print(f"❌ queue_manager 로드 실패: {e}")
             return
@@ -169,9 +184,11 @@ async def on_member_join(member):
         try:
             # 이미 대기열에 있는지 확인
             if hasattr(queue_manager, 'is_user_in_queue') and queue_manager.is_user_in_queue(member.id):
+                # 대량 확인 구간에 있었다면 신규 입장 구간으로 옮겨 먼저 처리
+                queue_manager.add_user(member.id, LANE_JOIN)
                 print(f"ℹ️ 이미 대기열에 있음: {member.display_name}")
             else:
-                queue_manager.add_user(member.id)
+                queue_manager.add_user(member.id, LANE_JOIN)
                 print(f"✅ 대기열에 추가됨: {member.display_name} (현재 대기열: {queue_manager.get_queue_size()}명)")
                 
                 # 성공 채널에 알림 (선택사항)
@@ -239,6 +256,9 @@ async def main():
         print("💡 .env 파일에 DISCORD_TOKEN을 설정해주세요.")
         return
         
+    # 공용 API 세션 생성
+    await http_session_manager.start()
+    
     # 봇 실행
     try:
         async with bot:
@@ -250,6 +270,18 @@ async def main():
         print(f"❌ 봇 실행 중 오류: {e}")
         import traceback
         traceback.print_exc()
+    finally:
+        # 대기열 작업자 종료 (처리 중인 사용자는 마무리)
+        await queue_worker_pool.stop()
+        
+        # 대기열 저널 닫기
+        from queue_manager import queue_manager
+        queue_manager.close()
+        
+        # 공용 API 세션 종료
+        await http_session_manager.close()
+        # 조회 저장소 닫기
+        resolution_store.close()
 
 # 메인 실행
 if __name__ == "__main__":
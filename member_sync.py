@@ -0,0 +1,169 @@
+# member_sync.py
+"""
+멤버 닉네임/역할 동기화
+국적 확인 결과로 원하는 닉네임과 역할 목록을 먼저 계산하고 현재 상태와 비교하여,
+바뀐 것이 있을 때만 member.edit(nick=..., roles=[...]) 한 번으로 적용합니다.
+(닉네임, 마을 역할, 국민/비국민 역할을 각각 따로 요청하지 않음)
+"""
+
+import os
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+
+import discord
+
+# town_role_manager 안전하게 import
+try:
+    from town_role_manager import town_role_manager
+    TOWN_ROLE_ENABLED = True
+except ImportError:
+    town_role_manager = None
+    TOWN_ROLE_ENABLED = False
+
+# config.py에서 환경변수 가져오기
+try:
+    from config import config
+    BASE_NATION = config.BASE_NATION
+    SUCCESS_ROLE_ID = config.SUCCESS_ROLE_ID
+    SUCCESS_ROLE_ID_OUT = getattr(config, 'SUCCESS_ROLE_ID_OUT', 0)
+except ImportError:
+    BASE_NATION = os.getenv("BASE_NATION", "Red_Mafia")
+    SUCCESS_ROLE_ID = int(os.getenv("SUCCESS_ROLE_ID", "0"))
+    SUCCESS_ROLE_ID_OUT = int(os.getenv("SUCCESS_ROLE_ID_OUT", "0"))
+
+# 통계 (한 번에 적용하여 줄어든 디스코드 요청 수)
+_sync_stats = {"members": 0, "edits": 0, "skipped": 0, "requests_saved": 0}
+
+
+@dataclass
+class MemberUpdate:
+    """멤버에게 적용할 변경 사항"""
+    nickname: Optional[str] = None  # None이면 닉네임 유지
+    add_roles: List[Tuple[discord.Role, str]] = field(default_factory=list)  # (역할, 변경 문구)
+    remove_roles: List[Tuple[discord.Role, str]] = field(default_factory=list)
+    notes: List[str] = field(default_factory=list)  # 적용과 관계없는 안내 (역할을 찾을 수 없음 등)
+
+    def has_changes(self) -> bool:
+        return self.nickname is not None or bool(self.add_roles) or bool(self.remove_roles)
+
+    def request_count(self) -> int:
+        """항목마다 따로 요청했을 때의 디스코드 요청 수"""
+        return (self.nickname is not None) + len(self.add_roles) + len(self.remove_roles)
+
+
+def plan_member_update(member: discord.Member, nation: str, town: Optional[str], nickname: Optional[str]) -> MemberUpdate:
+    """국적 확인 결과로 필요한 변경 사항 계산 (디스코드 요청 없음)"""
+    guild = member.guild
+    update = MemberUpdate()
+
+    if nickname and member.display_name != nickname:
+        update.nickname = nickname
+
+    # 매핑된 마을 역할
+    if town and TOWN_ROLE_ENABLED and town_role_manager:
+        role_id = town_role_manager.get_role_id(town)
+        if role_id:
+            town_role = guild.get_role(role_id)
+            if town_role is None:
+                update.notes.append(f"• ⚠️ 마을 역할을 찾을 수 없음 (ID: {role_id})")
+            elif member.get_role(town_role.id) is None:
+                update.add_roles.append((town_role, f"• **{town_role.name}** 마을 역할 추가됨"))
+        else:
+            update.notes.append(f"• ℹ️ **{town}** 마을은 역할이 연동되지 않음")
+
+    # 국민/비국민 역할 (하나를 부여하고 다른 하나는 제거)
+    if nation == BASE_NATION:
+        grant_id, revoke_id = SUCCESS_ROLE_ID, SUCCESS_ROLE_ID_OUT
+    else:
+        grant_id, revoke_id = SUCCESS_ROLE_ID_OUT, SUCCESS_ROLE_ID
+
+    grant_role = guild.get_role(grant_id) if grant_id else None
+    if grant_role and member.get_role(grant_role.id) is None:
+        update.add_roles.append((grant_role, f"• **{grant_role.name}** 역할 추가됨"))
+
+    revoke_role = guild.get_role(revoke_id) if revoke_id else None
+    if revoke_role and member.get_role(revoke_role.id) is not None:
+        update.remove_roles.append((revoke_role, f"• **{revoke_role.name}** 역할 제거됨"))
+
+    return update
+
+
+def _edit_failure_message(key: str, error: discord.HTTPException) -> str:
+    """닉네임/역할 변경 실패 문구 (로그 출력 포함)"""
+    target = "닉네임" if key == "nick" else "역할"
+    if isinstance(error, discord.Forbidden):
+        print(f"  ⚠️ {target} 변경 권한 없음")
+        return f"• ⚠️ {target} 변경 권한 없음"
+    print(f"  ⚠️ {target} 변경 실패: {error}")
+    return f"• ⚠️ {target} 변경 실패: {str(error)[:50]}"
+
+
+async def apply_member_update(member: discord.Member, update: MemberUpdate) -> List[str]:
+    """변경 사항을 member.edit 한 번으로 적용하고 변경 내역 문구 반환 (바뀐 것이 없으면 요청하지 않음)
+
+    한 번에 적용하다 실패하면 닉네임과 역할을 따로 다시 적용하여, 실제로 실패한 쪽만 알립니다.
+    """
+    changes = list(update.notes)
+    _sync_stats["members"] += 1
+
+    if not update.has_changes():
+        _sync_stats["skipped"] += 1
+        print("  ℹ️ 닉네임/역할 변경 없음 - 요청 생략")
+        return changes
+
+    kwargs = {}
+    if update.nickname is not None:
+        kwargs["nick"] = update.nickname
+    if update.add_roles or update.remove_roles:
+        remove_ids = {role.id for role, _ in update.remove_roles}
+        roles = [role for role in member.roles if not role.is_default() and role.id not in remove_ids]
+        roles.extend(role for role, _ in update.add_roles)
+        kwargs["roles"] = roles
+
+    requests = 1
+    failed = set()
+    try:
+        await member.edit(**kwargs)
+    except discord.HTTPException as e:
+        if len(kwargs) > 1:
+            # 닉네임과 역할 중 어느 쪽이 실패했는지 알 수 없으므로 따로 다시 적용
+            # (서버 소유자, 봇보다 높은 역할 등은 한쪽만 막힘)
+            print(f"  ⚠️ 멤버 수정 실패 - 닉네임/역할 따로 적용: {e}")
+            for key in ("roles", "nick"):
+                requests += 1
+                try:
+                    await member.edit(**{key: kwargs[key]})
+                except discord.HTTPException as part_error:
+                    changes.append(_edit_failure_message(key, part_error))
+                    failed.add(key)
+        else:
+            key = next(iter(kwargs))
+            changes.append(_edit_failure_message(key, e))
+            failed.add(key)
+
+    _sync_stats["edits"] += requests
+    if failed.issuperset(kwargs):
+        return changes
+    _sync_stats["requests_saved"] += max(0, update.request_count() - requests)
+
+    if "nick" in kwargs and "nick" not in failed:
+        changes.append(f"• 닉네임이 **``{update.nickname}``**로 변경됨")
+    if "roles" in kwargs and "roles" not in failed:
+        changes.extend(message for _, message in update.add_roles)
+        changes.extend(message for _, message in update.remove_roles)
+
+    applied_roles = "roles" in kwargs and "roles" not in failed
+    print(f"  ✅ 멤버 수정 (요청 {requests}회): "
+          f"닉네임 {'변경' if 'nick' in kwargs and 'nick' not in failed else '유지'}, "
+          f"역할 +{len(update.add_roles) if applied_roles else 0} -{len(update.remove_roles) if applied_roles else 0}")
+    return changes
+
+
+async def sync_member(member: discord.Member, nation: str, town: Optional[str], nickname: Optional[str]) -> List[str]:
+    """닉네임/역할 계산 후 적용 - 변경 내역 문구 반환"""
+    return await apply_member_update(member, plan_member_update(member, nation, town, nickname))
+
+
+def get_member_sync_stats() -> dict:
+    """동기화 통계 반환"""
+    return dict(_sync_stats)
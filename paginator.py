@@ -0,0 +1,152 @@
+# paginator.py
+"""
+페이지 버튼 목록 뷰
+긴 목록을 모든 페이지 임베드로 미리 만들지 않고, 정렬된 목록 스냅샷에서 버튼을 누른 페이지만 그때 만듭니다.
+메시지 하나로 몇 개의 항목이든 표시할 수 있습니다.
+페이지는 항목 수(page_size)와 임베드 필드 글자 수 제한(1024자)을 함께 지키도록 나누며, 줄을 중간에서 자르지 않습니다.
+"""
+
+from typing import Callable, List, Optional, Sequence
+
+import discord
+
+# 한 페이지에 표시할 기본 항목 수
+DEFAULT_PAGE_SIZE = 15
+
+# 임베드 필드 값 최대 글자 수
+FIELD_VALUE_LIMIT = 1024
+
+
+def _fit_line(line: str) -> str:
+    """한 줄만으로 필드 제한을 넘으면 그 줄만 줄임"""
+    return line if len(line) <= FIELD_VALUE_LIMIT else line[:FIELD_VALUE_LIMIT - 1] + "…"
+
+
+class PaginatorView(discord.ui.View):
+    """정렬된 항목 목록을 페이지 단위로 보여주는 버튼 뷰"""
+
+    def __init__(self, title: str, items: Sequence, format_item: Callable[[object], str] = str,
+                 description: Optional[str] = None, field_name: str = "목록", color: int = 0x00bfff,
+                 empty_text: str = "표시할 항목이 없습니다.", page_size: int = DEFAULT_PAGE_SIZE,
+                 owner_id: Optional[int] = None, timeout: float = 300.0):
+        super().__init__(timeout=timeout)
+        self.title = title
+        self.items = items  # 호출자가 만든 스냅샷 (페이지를 넘기는 동안 바뀌지 않음)
+        self.format_item = format_item
+        self.description = description
+        self.field_name = field_name
+        self.color = color
+        self.empty_text = empty_text
+        self.page_size = max(1, page_size)
+        self.owner_id = owner_id
+        self.page = 0
+        self.message: Optional[discord.Message] = None
+        self._page_starts = self._split_pages()
+        self._update_buttons()
+
+    def _split_pages(self) -> List[int]:
+        """페이지별 시작 위치 계산 (줄 길이만 한 번 훑고, 포맷한 문자열은 보관하지 않음)"""
+        starts = [0]
+        count = 0
+        length = 0
+        for index, item in enumerate(self.items):
+            line_length = len(_fit_line(self.format_item(item)))
+            added = line_length + (1 if count else 0)  # 줄바꿈 포함
+            if count and (count >= self.page_size or length + added > FIELD_VALUE_LIMIT):
+                starts.append(index)
+                count = 0
+                length = 0
+                added = line_length
+            count += 1
+            length += added
+        return starts
+
+    @property
+    def page_count(self) -> int:
+        return len(self._page_starts)
+
+    def build_embed(self) -> discord.Embed:
+        """현재 페이지 임베드 생성 (현재 페이지 항목만 포맷)"""
+        embed = discord.Embed(title=self.title, description=self.description, color=self.color)
+
+        if not self.items:
+            embed.add_field(name=self.field_name, value=self.empty_text, inline=False)
+            return embed
+
+        start = self._page_starts[self.page]
+        end = self._page_starts[self.page + 1] if self.page + 1 < self.page_count else len(self.items)
+        lines = [_fit_line(self.format_item(item)) for item in self.items[start:end]]
+        embed.add_field(
+            name=f"{self.field_name} ({start + 1}-{end} / {len(self.items)})",
+            value="\n".join(lines),
+            inline=False
+        )
+        embed.set_footer(text=f"페이지 {self.page + 1}/{self.page_count}")
+        return embed
+
+    def _update_buttons(self):
+        first_page = self.page == 0
+        last_page = self.page >= self.page_count - 1
+        self.first_button.disabled = first_page
+        self.previous_button.disabled = first_page
+        self.next_button.disabled = last_page
+        self.last_button.disabled = last_page
+        self.page_button.label = f"{self.page + 1}/{self.page_count}"
+
+    async def _show_page(self, interaction: discord.Interaction, page: int):
+        self.page = max(0, min(page, self.page_count - 1))
+        self._update_buttons()
+        await interaction.response.edit_message(embed=self.build_embed(), view=self)
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        """명령어를 실행한 사용자만 페이지를 넘길 수 있음"""
+        if self.owner_id is not None and interaction.user.id != self.owner_id:
+            await interaction.response.send_message("❌ 명령어를 실행한 사용자만 사용할 수 있습니다.", ephemeral=True)
+            return False
+        return True
+
+    @discord.ui.button(label="⏮", style=discord.ButtonStyle.gray)
+    async def first_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self._show_page(interaction, 0)
+
+    @discord.ui.button(label="◀", style=discord.ButtonStyle.gray)
+    async def previous_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self._show_page(interaction, self.page - 1)
+
+    @discord.ui.button(label="1/1", style=discord.ButtonStyle.gray, disabled=True)
+    async def page_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        pass
+
+    @discord.ui.button(label="▶", style=discord.ButtonStyle.gray)
+    async def next_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self._show_page(interaction, self.page + 1)
+
+    @discord.ui.button(label="⏭", style=discord.ButtonStyle.gray)
+    async def last_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self._show_page(interaction, self.page_count - 1)
+
+    async def on_timeout(self):
+        """타임아웃 시 버튼 제거"""
+        if self.message:
+            try:
+                await self.message.edit(view=None)
+            except discord.HTTPException:
+                pass
+
+    async def send(self, interaction: discord.Interaction, ephemeral: bool = True):
+        """첫 페이지 전송 (페이지가 하나면 버튼 없이)
+
+        이미 응답(defer)한 상호작용이면 후속 메시지로 보냅니다.
+        defer(thinking=True) 직후라면 "생각 중" 메시지를 대체하며, 이때 공개 여부는 defer를 따릅니다.
+        """
+        embed = self.build_embed()
+        view = self if self.page_count > 1 else discord.utils.MISSING
+
+        if interaction.response.is_done():
+            self.message = await interaction.followup.send(embed=embed, view=view, ephemeral=ephemeral, wait=True)
+        else:
+            await interaction.response.send_message(embed=embed, view=view, ephemeral=ephemeral)
+            self.message = await interaction.original_response()
+
+        if self.page_count <= 1:
+            self.stop()
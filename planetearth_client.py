@@ -0,0 +1,305 @@
+# planetearth_client.py
+"""
+PlanetEarth API 클라이언트
+디스코드 ID → 마인크래프트 닉네임 → 마을 → 국가 조회를 한 곳에서 처리합니다.
+모든 조회 경로(대기열, /확인, /콜사인, /국민확인)가 이 모듈을 사용합니다.
+"""
+
+import asyncio
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+import aiohttp
+
+from api_handler import fetch_api
+from circuit_breaker import CircuitOpenError
+from resolution_cache import resolution_cache
+from resolution_store import resolution_store
+from town_index import town_index
+
+# 조회 성공 시 확인 기록에 남기는 결과
+VERIFIED_OK = "ok"
+
+
+@dataclass(frozen=True)
+class Resolution:
+    """디스코드 사용자의 마인크래프트 소속 정보"""
+    mc_id: str
+    town: str
+    nation: str
+
+
+class ResolutionError(Exception):
+    """국적 조회 실패 기본 예외
+
+    조회 도중 알아낸 정보(mc_id, town)를 함께 담아 호출자가 실패 메시지에 표시할 수 있게 합니다.
+    """
+    step = 0
+    verification_result = None  # 확인 기록에 남길 결과 (일시적 오류는 None으로 기록하지 않음)
+
+    def __init__(self, message: str, step: Optional[int] = None, mc_id: Optional[str] = None,
+                 town: Optional[str] = None, status: Optional[int] = None):
+        super().__init__(message)
+        self.message = message
+        if step is not None:
+            self.step = step
+        self.mc_id = mc_id
+        self.town = town
+        self.status = status
+
+
+class AccountNotLinkedError(ResolutionError):
+    """1단계: 디스코드와 마인크래프트 계정이 연동되지 않음"""
+    step = 1
+    verification_result = "not_linked"
+
+
+class NoTownError(ResolutionError):
+    """2단계: 마을에 소속되어 있지 않음"""
+    step = 2
+    verification_result = "no_town"
+
+
+class NoNationError(ResolutionError):
+    """3단계: 마을이 국가에 소속되어 있지 않음"""
+    step = 3
+    verification_result = "no_nation"
+
+
+class ApiRequestError(ResolutionError):
+    """API 응답 오류, 타임아웃, 연결 실패"""
+
+
+class ApiUnavailableError(ApiRequestError):
+    """서킷 브레이커가 열려 있어 API 요청을 보내지 않음"""
+
+    def __init__(self, message: str, retry_after: float = 0.0, **kwargs):
+        super().__init__(message, **kwargs)
+        self.retry_after = retry_after
+
+
+async def _get_first_entry(path: str, params: dict, step: int, label: str, not_found_error=None) -> Optional[dict]:
+    """API를 호출하여 data 배열의 첫 항목 반환 (데이터가 없으면 None)
+
+    404 응답은 not_found_error가 주어지면 해당 예외로, 아니면 None으로 처리합니다.
+    """
+    try:
+        status, data = await fetch_api(path, params)
+    except CircuitOpenError as e:
+        raise ApiUnavailableError(
+            f"API 장애로 요청이 일시 중단되었습니다 ({e.retry_after:.0f}초 후 재시도)", retry_after=e.retry_after, step=step
+        )
+    except asyncio.TimeoutError:
+        raise ApiRequestError(f"{label} 조회 시간이 초과되었습니다", step=step)
+    except aiohttp.ClientError as e:
+        raise ApiRequestError(f"{label} 조회 중 연결 오류가 발생했습니다: {str(e)[:50]}", step=step)
+
+    if status == 404:
+        if not_found_error is None:
+            return None
+        raise not_found_error(f"{label}를 찾을 수 없습니다 (HTTP 404)", status=status)
+    if status != 200:
+        raise ApiRequestError(f"{label}를 조회할 수 없습니다 (HTTP {status})", step=step, status=status)
+
+    if not data or not data.get('data'):
+        return None
+    return data['data'][0]
+
+
+def _warm_from_store(cache, key, stored_lookup):
+    """메모리 캐시에 없으면 저장소에 남아 있는 값을 남은 유효 시간만큼 채움"""
+    if cache.peek(key) is not None:
+        return
+    stored = stored_lookup(key, cache.ttl_seconds)
+    if stored:
+        value, age = stored
+        cache.set(key, value, ttl_seconds=cache.ttl_seconds - age)
+
+
+async def get_minecraft_name(discord_id: int) -> str:
+    """1단계: 디스코드 ID → 마인크래프트 닉네임 (캐시/저장소 사용)"""
+    cache = resolution_cache.links
+    _warm_from_store(cache, discord_id, resolution_store.get_link)
+    return await cache.get_or_load(
+        discord_id, lambda: _load_minecraft_name(discord_id), (AccountNotLinkedError,)
+    )
+
+
+async def _load_minecraft_name(discord_id: int) -> str:
+    try:
+        mc_id = await _fetch_minecraft_name(discord_id)
+    except AccountNotLinkedError:
+        resolution_store.forget_member(discord_id)
+        raise
+    resolution_store.save_link(discord_id, mc_id)
+    return mc_id
+
+
+async def _fetch_minecraft_name(discord_id: int) -> str:
+    entry = await _get_first_entry("/discord", {"discord": str(discord_id)}, 1, "마인크래프트 계정 연동 정보", AccountNotLinkedError)
+    if entry is None:
+        raise AccountNotLinkedError("마인크래프트 계정이 연동되지 않았습니다")
+
+    mc_id = entry.get('name')
+    if not mc_id:
+        raise AccountNotLinkedError("마인크래프트 닉네임을 찾을 수 없습니다")
+    return mc_id
+
+
+async def get_resident_town(mc_id: str) -> str:
+    """2단계: 마인크래프트 닉네임 → 마을 (캐시/저장소 사용)"""
+    cache = resolution_cache.residents
+    _warm_from_store(cache, mc_id, resolution_store.get_resident)
+    return await cache.get_or_load(
+        mc_id, lambda: _load_resident_town(mc_id), (NoTownError,)
+    )
+
+
+async def _load_resident_town(mc_id: str) -> str:
+    try:
+        town = await _fetch_resident_town(mc_id)
+    except NoTownError:
+        resolution_store.save_resident(mc_id, None)
+        raise
+    resolution_store.save_resident(mc_id, town)
+    return town
+
+
+async def _fetch_resident_town(mc_id: str) -> str:
+    entry = await _get_first_entry("/resident", {"name": mc_id}, 2, "마을 정보", NoTownError)
+    if entry is None:
+        raise NoTownError("마을에 소속되어 있지 않습니다")
+
+    town = entry.get('town')
+    if not town:
+        raise NoTownError("마을 정보가 없습니다")
+    return town
+
+
+async def get_town_nation(town: str) -> str:
+    """3단계: 마을 → 국가 (색인/캐시/저장소 사용)"""
+    nation = town_index.lookup(town)
+    if nation:
+        return nation
+
+    cache = resolution_cache.towns
+    _warm_from_store(cache, town, resolution_store.get_town)
+    return await cache.get_or_load(
+        town, lambda: _load_town_nation(town), (NoNationError,)
+    )
+
+
+async def _load_town_nation(town: str) -> str:
+    try:
+        nation = await _fetch_town_nation(town)
+    except NoNationError:
+        resolution_store.save_town(town, None)
+        raise
+    resolution_store.save_town(town, nation)
+    town_index.track_nation(nation)
+    return nation
+
+
+async def _fetch_town_nation(town: str) -> str:
+    entry = await _get_first_entry("/town", {"name": town}, 3, "국가 정보", NoNationError)
+    if entry is None:
+        raise NoNationError("국가에 소속되어 있지 않습니다")
+
+    nation = entry.get('nation')
+    if not nation:
+        raise NoNationError("국가 정보가 없습니다")
+    return nation
+
+
+async def get_nation_towns(nation_name: str) -> List[str]:
+    """국가에 속한 마을 목록 조회 (국가가 없으면 빈 목록)"""
+    entry = await _get_first_entry("/nation", {"name": nation_name}, 0, "국가 정보")
+    towns = (entry.get('towns', []) or []) if entry else []
+
+    # 받은 목록으로 마을 → 국가 색인 갱신
+    town_index.update_nation(nation_name, towns)
+    resolution_store.save_nation_towns(nation_name, towns)
+    return towns
+
+
+async def get_town_residents(town: str) -> Tuple[Optional[str], List[str]]:
+    """마을의 (국가, 주민 마크 ID 목록) 조회 - 마을이 없으면 (None, [])"""
+    entry = await _get_first_entry("/town", {"name": town}, 3, "마을 정보")
+    if entry is None:
+        return None, []
+
+    nation = entry.get('nation') or None
+    resolution_store.save_town(town, nation)
+
+    residents = []
+    for resident in entry.get('residents', []) or []:
+        # 이름 문자열 또는 {"name": ...} 형식 모두 지원
+        name = resident.get('name') if isinstance(resident, dict) else resident
+        if name:
+            residents.append(name)
+    return nation, residents
+
+
+async def refresh_town_index():
+    """색인 대상 국가들의 마을 목록을 /nation으로 다시 받아 색인 갱신"""
+    nations = town_index.get_tracked_nations()
+    town_count = 0
+
+    for nation in nations:
+        try:
+            town_count += len(await get_nation_towns(nation))
+        except ResolutionError as e:
+            print(f"⚠️ 마을 색인 갱신 실패 ({nation}): {e.message}")
+
+    town_index.mark_refreshed()
+    print(f"🗺️ 마을 색인 갱신 완료: 국가 {len(nations)}개, 마을 {town_count}개")
+
+
+_town_index_refresh_task: Optional[asyncio.Task] = None
+
+
+def schedule_town_index_refresh() -> asyncio.Task:
+    """마을 색인 갱신을 백그라운드에서 시작 (이미 진행 중이면 그 작업을 반환)"""
+    global _town_index_refresh_task
+    if _town_index_refresh_task is None or _town_index_refresh_task.done():
+        _town_index_refresh_task = asyncio.create_task(refresh_town_index(), name="town-index-refresh")
+    return _town_index_refresh_task
+
+
+async def resolve_member(discord_id: int) -> Resolution:
+    """디스코드 ID로 마인크래프트 닉네임, 마을, 국가를 모두 조회
+
+    실패 시 ResolutionError 하위 예외를 발생시키며, 예외에는 그때까지 조회된 mc_id/town이 담겨 있습니다.
+    확인 기록은 남기지 않습니다 (역할까지 맞춘 호출자가 record_verification으로 기록).
+    """
+    mc_id = None
+    town = None
+
+    try:
+        mc_id = await get_minecraft_name(discord_id)
+        print(f"  ✅ 마크 ID: {mc_id}")
+
+        town = await get_resident_town(mc_id)
+        print(f"  ✅ 마을: {town}")
+
+        nation = await get_town_nation(town)
+        print(f"  ✅ 국가: {nation}")
+        resolution_store.save_nation(discord_id, nation)
+    except ResolutionError as e:
+        e.mc_id = e.mc_id or mc_id
+        e.town = e.town or town
+        print(f"  ❌ {e.step}단계 실패: {e.message}")
+        raise
+
+    return Resolution(mc_id=mc_id, town=town, nation=nation)
+
+
+def record_verification(discord_id: int, error: Optional[ResolutionError] = None):
+    """닉네임/역할까지 맞춘 확인 결과를 확인 기록에 저장 (일시적 오류는 기록하지 않음)
+
+    조회만 하는 경로(/국민확인, /콜사인)에서는 호출하지 않아야 대량 확인에서 최근 확인됨으로 건너뛰지 않습니다.
+    """
+    if error is None:
+        resolution_store.record_verification(discord_id, VERIFIED_OK)
+    elif error.verification_result:
+        resolution_store.record_verification(discord_id, error.verification_result)
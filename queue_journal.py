@@ -0,0 +1,144 @@
+# queue_journal.py
+"""
+대기열 저널 (추가 전용 파일)
+대기열 추가/꺼내기/완료를 한 줄씩 기록하고, 재시작 시 기록을 다시 읽어 대기열을 순서대로 복구합니다.
+처리 도중 종료되어 완료 기록이 없는 사용자는 대기열 맨 앞으로 복구됩니다.
+
+기록 형식 (한 줄에 하나):
+    A <user_id> <lane>   대기열에 추가 (이미 있으면 해당 처리 구간으로 이동)
+    T <user_id>   처리를 위해 꺼냄
+    D <user_id>   처리 완료
+    C             대기 중인 사용자 전체 삭제
+"""
+
+import os
+import time
+from typing import Iterable, List, Optional, Tuple
+
+ADD = "A"
+TAKE = "T"
+DONE = "D"
+CLEAR = "C"
+
+
+class QueueJournal:
+    """대기열 변경을 파일에 추가 기록하고 복구하는 클래스"""
+
+    def __init__(self, filename: str = "queue_journal.log", fsync_interval: float = 1.0, min_compact_lines: int = 1000):
+        self.filename = filename
+        self.fsync_interval = fsync_interval
+        self.min_compact_lines = min_compact_lines
+        self._file = None
+        self._line_count = 0
+        self._last_fsync = 0.0
+
+        # 통계
+        self.compactions = 0
+
+    def replay(self, default_lane: str) -> Tuple[List[Tuple[int, str]], List[Tuple[int, str]]]:
+        """저널을 읽어 (처리 중이던 사용자, 대기 중인 사용자)를 (user_id, lane) 목록으로 순서대로 반환"""
+        pending = {}  # user_id -> lane (삽입 순서 유지)
+        taken = {}
+
+        if os.path.exists(self.filename):
+            try:
+                with open(self.filename, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        self._line_count += 1
+                        parts = line.split()
+                        if not parts:
+                            continue
+                        op = parts[0]
+                        if op == CLEAR:
+                            pending.clear()
+                            continue
+                        # 비정상 종료로 잘린 줄은 무시
+                        if len(parts) not in (2, 3) or not parts[1].isdigit():
+                            continue
+                        user_id = int(parts[1])
+                        if op == ADD:
+                            lane = parts[2] if len(parts) == 3 else default_lane
+                            pending.pop(user_id, None)
+                            pending[user_id] = lane
+                        elif op == TAKE:
+                            taken[user_id] = pending.pop(user_id, default_lane)
+                        elif op == DONE:
+                            taken.pop(user_id, None)
+            except OSError as e:
+                print(f"❌ 대기열 저널 읽기 실패: {e}")
+
+        in_flight = list(taken.items())
+        waiting = [(user_id, lane) for user_id, lane in pending.items() if user_id not in taken]
+        return in_flight, waiting
+
+    def _open(self):
+        if self._file is None:
+            self._file = open(self.filename, 'a', encoding='utf-8')
+
+    def append(self, op: str, user_ids: Iterable[int] = (), lane: Optional[str] = None):
+        """변경 기록 추가 (user_ids가 여러 개면 한 번에 기록)"""
+        if op == CLEAR:
+            lines = [f"{CLEAR}\n"]
+        elif op == ADD:
+            lines = [f"{ADD} {user_id} {lane}\n" for user_id in user_ids]
+        else:
+            lines = [f"{op} {user_id}\n" for user_id in user_ids]
+        if not lines:
+            return
+
+        try:
+            self._open()
+            self._file.write("".join(lines))
+            self._file.flush()
+            self._line_count += len(lines)
+
+            # 디스크 동기화는 최대 fsync_interval초마다 한 번
+            now = time.monotonic()
+            if now - self._last_fsync >= self.fsync_interval:
+                os.fsync(self._file.fileno())
+                self._last_fsync = now
+        except OSError as e:
+            print(f"❌ 대기열 저널 기록 실패: {e}")
+
+    def should_compact(self, live_count: int) -> bool:
+        """기록이 실제 대기열보다 충분히 길어졌는지 확인"""
+        return self._line_count > max(self.min_compact_lines, live_count * 4)
+
+    def compact(self, in_flight: Iterable[Tuple[int, str]], waiting: Iterable[Tuple[int, str]]):
+        """현재 대기열 상태만 남기도록 저널 다시 쓰기 - (user_id, lane) 목록"""
+        in_flight = list(in_flight)
+        lines = [f"{ADD} {user_id} {lane}\n{TAKE} {user_id}\n" for user_id, lane in in_flight]
+        lines.extend(f"{ADD} {user_id} {lane}\n" for user_id, lane in waiting)
+        temp_filename = f"{self.filename}.tmp"
+
+        try:
+            with open(temp_filename, 'w', encoding='utf-8') as f:
+                f.write("".join(lines))
+                f.flush()
+                os.fsync(f.fileno())
+
+            self.close()
+            os.replace(temp_filename, self.filename)
+            self._line_count = len(lines) + len(in_flight)
+            self.compactions += 1
+        except OSError as e:
+            print(f"❌ 대기열 저널 정리 실패: {e}")
+
+    def close(self):
+        """저널 파일 닫기 (디스크 동기화 포함)"""
+        if self._file is not None:
+            try:
+                self._file.flush()
+                os.fsync(self._file.fileno())
+                self._file.close()
+            except OSError as e:
+                print(f"❌ 대기열 저널 닫기 실패: {e}")
+            self._file = None
+
+    def get_stats(self) -> dict:
+        """저널 상태 반환"""
+        return {
+            "filename": self.filename,
+            "lines": self._line_count,
+            "compactions": self.compactions
+        }
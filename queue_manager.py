@@ -1,41 +1,370 @@
+import asyncio
+import itertools
+import time
 from collections import deque
 
-# queue_manager.py에 다음 메서드를 추가하세요
+from queue_journal import QueueJournal, ADD, TAKE, DONE, CLEAR
+
+# queue_manager.py
+# 대기열: 처리 구간(lane)마다 deque, 중복 확인은 dict로 관리하여 추가/꺼내기/확인이 모두 O(1)
+# 구간 사이는 가중치 순환(smooth weighted round robin)으로 공정하게 꺼냄
+# 저널이 있으면 모든 변경을 파일에 기록하여 재시작 후 복구
+
+# 처리 구간 (우선순위 높은 순)
+LANE_JOIN = "join"      # 새로 들어온 멤버
+LANE_MANUAL = "manual"  # 관리자가 직접 요청한 확인 (/국민확인)
+LANE_BULK = "bulk"      # 주간 자동 실행 등 대량 확인
+
+LANE_NAMES = {
+    LANE_JOIN: "🆕 신규 입장",
+    LANE_MANUAL: "🙋 직접 요청",
+    LANE_BULK: "📦 대량 확인"
+}
+
+DEFAULT_LANE_WEIGHTS = {LANE_JOIN: 6, LANE_MANUAL: 3, LANE_BULK: 1}
 
 class QueueManager:
-    def __init__(self):
-        self.queue = []  # 또는 다른 데이터 구조
+    def __init__(self, journal: QueueJournal = None, lane_weights: dict = None):
+        self.lane_weights = dict(lane_weights or DEFAULT_LANE_WEIGHTS)
+        self._lanes = {lane: deque() for lane in self.lane_weights}  # lane -> deque[(user_id, 추가 시각, 항목 번호)]
+        self._lane_sizes = {lane: 0 for lane in self.lane_weights}
+        self._current_weights = {lane: 0 for lane in self.lane_weights}
+        self._members = {}  # user_id -> lane (대기열에 있는 사용자)
+        self._entry_seq = {}  # user_id -> 유효한 항목 번호 (구간을 옮기면 이전 항목은 번호가 달라 무시됨)
+        self._seq = itertools.count()
+        self._taken = {}  # user_id -> lane (꺼냈지만 처리 완료되지 않은 사용자)
+        self._delayed = {}  # user_id -> (lane, 타이머) (재시도 대기 중인 사용자)
+        self._lane_waits = {lane: deque(maxlen=100) for lane in self.lane_weights}  # 최근 대기 시간(초)
         self.processing = False
-    
+        self._not_empty = asyncio.Event()  # 대기열에 사용자가 들어오면 작업자를 깨움
+        self._journal = journal
+        if journal:
+            self._restore()
+
+    def _restore(self):
+        """저널에서 대기열 복구 (처리 중이던 사용자를 각 구간 맨 앞에)"""
+        in_flight, waiting = self._journal.replay(LANE_BULK)
+        for user_id, lane in in_flight + waiting:
+            if user_id not in self._members:
+                self._push(user_id, lane if lane in self._lanes else LANE_BULK)
+
+        # 복구된 상태만 남기도록 저널 정리
+        self._journal.compact([], self._pending_entries())
+        if self._members:
+            print(f"📂 대기열 복구: {len(self._members)}명 (처리 중이던 사용자 {len(in_flight)}명 포함)")
+
+    def _pending_entries(self):
+        """대기 중인 (user_id, lane) 목록 (구간별 순서 유지, 재시도 대기 포함)"""
+        entries = [
+            (user_id, lane)
+            for lane, lane_entries in self._lanes.items()
+            for user_id, _, seq in lane_entries
+            if self._entry_seq.get(user_id) == seq
+        ]
+        entries.extend((user_id, lane) for user_id, (lane, _) in self._delayed.items())
+        return entries
+
+    def _record(self, op: str, user_ids=(), lane: str = None):
+        """저널에 변경 기록 (필요하면 정리)"""
+        if not self._journal:
+            return
+        self._journal.append(op, user_ids, lane)
+        if self._journal.should_compact(len(self._members) + len(self._taken) + len(self._delayed)):
+            self._journal.compact(list(self._taken.items()), self._pending_entries())
+
+    def _push(self, user_id: int, lane: str):
+        seq = next(self._seq)
+        self._members[user_id] = lane
+        self._entry_seq[user_id] = seq
+        self._lanes[lane].append((user_id, time.monotonic(), seq))
+        self._lane_sizes[lane] += 1
+        self._not_empty.set()
+
+    def _priority(self, lane: str) -> int:
+        """구간 우선순위 (작을수록 높음)"""
+        return list(self._lanes).index(lane)
+
     def is_user_in_queue(self, user_id: int) -> bool:
-        """사용자가 이미 대기열에 있는지 확인"""
-        return user_id in self.queue
-    
-    def add_user(self, user_id: int):
-        """사용자를 대기열에 추가 (중복 방지)"""
-        if not self.is_user_in_queue(user_id):
-            self.queue.append(user_id)
-            return True
-        return False
-    
+        """사용자가 이미 대기열에 있는지 확인 (재시도 대기 포함)"""
+        return user_id in self._members or user_id in self._delayed
+
+    def add_user(self, user_id: int, lane: str = None):
+        """사용자를 대기열에 추가 (중복 방지)
+
+        lane을 생략하면 처리 중이던 사용자는 원래 구간으로, 그 외에는 대량 확인 구간으로 들어갑니다.
+        이미 낮은 우선순위 구간에 있으면 높은 구간으로 옮기고 False를 반환합니다.
+        """
+        if lane is None:
+            lane = self._taken.get(user_id, LANE_BULK)
+        if lane not in self._lanes:
+            lane = LANE_BULK
+
+        # 재시도 대기 중이면 기다리지 않고 바로 대기열에 넣음
+        if user_id in self._delayed:
+            delayed_lane, handle = self._delayed.pop(user_id)
+            handle.cancel()
+            if self._priority(delayed_lane) < self._priority(lane):
+                lane = delayed_lane
+            self._push(user_id, lane)
+            self._record(ADD, (user_id,), lane)
+            return False
+
+        current_lane = self._members.get(user_id)
+        if current_lane is not None:
+            if self._priority(lane) < self._priority(current_lane):
+                # 이전 구간의 항목은 꺼낼 때 건너뜀
+                self._lane_sizes[current_lane] -= 1
+                self._push(user_id, lane)
+                self._record(ADD, (user_id,), lane)
+            return False
+
+        self._push(user_id, lane)
+        self._record(ADD, (user_id,), lane)
+        return True
+
+    def add_users(self, user_ids, lane: str = None) -> int:
+        """여러 사용자를 한 번에 대기열에 추가 - 새로 추가된 인원 반환
+
+        새 사용자는 저널에 한 번에 기록하고, 이미 있는 사용자는 add_user와 같이 우선순위만 조정합니다.
+        """
+        if lane is None or lane not in self._lanes:
+            lane = LANE_BULK
+
+        added = []
+        for user_id in dict.fromkeys(user_ids):
+            if self.is_user_in_queue(user_id):
+                self.add_user(user_id, lane)
+                continue
+            self._push(user_id, lane)
+            added.append(user_id)
+
+        self._record(ADD, added, lane)
+        return len(added)
+
+    def add_user_later(self, user_id: int, delay: float, lane: str = None) -> bool:
+        """delay초 뒤에 대기열에 추가 (재시도용)
+
+        저널에는 바로 기록되므로 대기 중에 재시작해도 사용자가 사라지지 않습니다.
+        """
+        if lane is None:
+            lane = self._taken.get(user_id, LANE_BULK)
+        if self.is_user_in_queue(user_id):
+            return False
+
+        handle = asyncio.get_running_loop().call_later(delay, self._release_delayed, user_id)
+        self._delayed[user_id] = (lane, handle)
+        self._record(ADD, (user_id,), lane)
+        return True
+
+    def _release_delayed(self, user_id: int):
+        """재시도 대기 시간이 끝난 사용자를 대기열에 넣음"""
+        entry = self._delayed.pop(user_id, None)
+        if entry and user_id not in self._members:
+            self._push(user_id, entry[0])
+
+    def get_delayed_count(self) -> int:
+        """재시도 대기 중인 인원"""
+        return len(self._delayed)
+
+    def _select_lane(self):
+        """가중치 순환으로 다음 구간 선택 (비어 있는 구간 제외)"""
+        active = [lane for lane, size in self._lane_sizes.items() if size > 0]
+        if len(active) <= 1:
+            return active[0] if active else None
+
+        total = 0
+        for lane in active:
+            self._current_weights[lane] += self.lane_weights[lane]
+            total += self.lane_weights[lane]
+
+        selected = max(active, key=lambda lane: self._current_weights[lane])
+        self._current_weights[selected] -= total
+        return selected
+
     def get_next(self):
         """대기열에서 다음 사용자 가져오기"""
-        if self.queue:
-            return self.queue.pop(0)
+        lane = self._select_lane()
+        if lane is None:
+            return None
+
+        entries = self._lanes[lane]
+        while entries:
+            user_id, enqueued_at, seq = entries.popleft()
+            # 다른 구간으로 옮겨졌거나 다시 추가되어 번호가 바뀐 항목은 건너뜀
+            if self._entry_seq.get(user_id) != seq:
+                continue
+
+            del self._members[user_id]
+            del self._entry_seq[user_id]
+            self._lane_sizes[lane] -= 1
+            self._lane_waits[lane].append(time.monotonic() - enqueued_at)
+            self._taken[user_id] = lane
+            self._record(TAKE, (user_id,))
+            return user_id
+
         return None
-    
+
+    def mark_done(self, user_id: int):
+        """꺼낸 사용자의 처리 완료 기록 (완료 전 종료되면 재시작 시 다시 처리)"""
+        if user_id in self._taken:
+            del self._taken[user_id]
+            self._record(DONE, (user_id,))
+
+    async def wait_for_user(self):
+        """대기열에 사용자가 들어올 때까지 대기"""
+        while not self._members:
+            self._not_empty.clear()
+            await self._not_empty.wait()
+
     def get_queue_size(self) -> int:
-        """현재 대기열 크기 반환"""
-        return len(self.queue)
-    
+        """현재 대기열 크기 반환 (재시도 대기 제외)"""
+        return len(self._members)
+
+    def get_lane_stats(self) -> list:
+        """구간별 대기 인원, 가장 오래 기다린 시간, 최근 평균 대기 시간(초)"""
+        now = time.monotonic()
+        stats = []
+        for lane, entries in self._lanes.items():
+            oldest_wait = 0.0
+            for user_id, enqueued_at, seq in entries:
+                if self._entry_seq.get(user_id) == seq:
+                    oldest_wait = now - enqueued_at
+                    break
+
+            waits = self._lane_waits[lane]
+            stats.append({
+                "lane": lane,
+                "name": LANE_NAMES.get(lane, lane),
+                "weight": self.lane_weights[lane],
+                "size": self._lane_sizes[lane],
+                "oldest_wait": oldest_wait,
+                "average_wait": sum(waits) / len(waits) if waits else None
+            })
+        return stats
+
     def is_processing(self) -> bool:
         """현재 처리 중인지 여부 반환"""
         return self.processing
-    
+
     def clear_queue(self) -> int:
         """대기열 초기화 및 제거된 항목 수 반환"""
-        count = len(self.queue)
-        self.queue.clear()
+        count = len(self._members)
+        for lane in self._lanes:
+            self._lanes[lane].clear()
+            self._lane_sizes[lane] = 0
+        self._members.clear()
+        self._entry_seq.clear()
+        for _, handle in self._delayed.values():
+            handle.cancel()
+        count += len(self._delayed)
+        self._delayed.clear()
+        self._record(CLEAR)
         return count
 
-queue_manager = QueueManager()
+    def close(self):
+        """저널 닫기"""
+        if self._journal:
+            self._journal.close()
+
+def _create_queue_manager() -> QueueManager:
+    """config 설정으로 대기열 생성 (저널 경로가 비어 있으면 메모리 전용)"""
+    try:
+        from config import config
+        journal_path = config.QUEUE_JOURNAL_PATH
+        lane_weights = {
+            LANE_JOIN: config.QUEUE_WEIGHT_JOIN,
+            LANE_MANUAL: config.QUEUE_WEIGHT_MANUAL,
+            LANE_BULK: config.QUEUE_WEIGHT_BULK
+        }
+    except ImportError:
+        journal_path = "queue_journal.log"
+        lane_weights = DEFAULT_LANE_WEIGHTS
+
+    return QueueManager(QueueJournal(journal_path) if journal_path else None, lane_weights)
+
+queue_manager = _create_queue_manager()
+
+if __name__ == "__main__":
+    # 성능 테스트: 이전 list 기반 대기열과 비교
+
+    class ListQueueManager:
+        """이전 구현 (list + in 검사 + pop(0))"""
+        def __init__(self):
+            self.queue = []
+
+        def add_user(self, user_id: int):
+            if user_id not in self.queue:
+                self.queue.append(user_id)
+                return True
+            return False
+
+        def get_next(self):
+            if self.queue:
+                return self.queue.pop(0)
+            return None
+
+    def measure(manager_class, size: int, ops: int = 1000) -> tuple:
+        """대기열에 size명이 있을 때 추가/꺼내기 1회 평균 시간(µs)"""
+        manager = manager_class()
+        for user_id in range(size):
+            if isinstance(manager, QueueManager):
+                manager.add_user(user_id)
+            else:
+                manager.queue.append(user_id)
+
+        # 새 사용자 추가 (중복 확인 포함)
+        started = time.perf_counter()
+        for user_id in range(size, size + ops):
+            manager.add_user(user_id)
+        add_us = (time.perf_counter() - started) / ops * 1_000_000
+
+        # 앞에서 꺼내기
+        started = time.perf_counter()
+        for _ in range(ops):
+            manager.get_next()
+        next_us = (time.perf_counter() - started) / ops * 1_000_000
+        return add_us, next_us
+
+    def measure_bulk(manager_class, size: int) -> float:
+        """빈 대기열에 size명 추가 후 모두 꺼내는 시간(초)"""
+        manager = manager_class()
+        started = time.perf_counter()
+        for user_id in range(size):
+            manager.add_user(user_id)
+        while manager.get_next() is not None:
+            pass
+        return time.perf_counter() - started
+
+    print("🧪 QueueManager 성능 테스트")
+    for size in (10_000, 100_000):
+        old_add, old_next = measure(ListQueueManager, size)
+        new_add, new_next = measure(QueueManager, size)
+        print(f"📋 대기열 {size:,}명")
+        print(f"   - add_user: list {old_add:8.2f}µs → deque+dict {new_add:6.2f}µs ({old_add / new_add:,.0f}배)")
+        print(f"   - get_next: list {old_next:8.2f}µs → deque+dict {new_next:6.2f}µs ({old_next / new_next:,.0f}배)")
+
+    # 10,000명 역할 전체 등록 후 처리 (이전 구현은 O(n²))
+    old_bulk = measure_bulk(ListQueueManager, 10_000)
+    new_bulk = measure_bulk(QueueManager, 10_000)
+    print(f"📋 10,000명 추가+처리: list {old_bulk:.3f}초 → deque+dict {new_bulk:.3f}초")
+    print(f"📋 100,000명 추가+처리: deque+dict {measure_bulk(QueueManager, 100_000):.3f}초")
+
+    # 저널 사용 시 한 명씩 추가 vs 한 번에 추가
+    import os
+    import tempfile
+    with tempfile.TemporaryDirectory() as temp_dir:
+        single = QueueManager(QueueJournal(os.path.join(temp_dir, "single.log")))
+        started = time.perf_counter()
+        for user_id in range(10_000):
+            single.add_user(user_id)
+        single_seconds = time.perf_counter() - started
+        single.close()
+
+        bulk = QueueManager(QueueJournal(os.path.join(temp_dir, "bulk.log")))
+        started = time.perf_counter()
+        bulk_added = bulk.add_users(range(10_000))
+        bulk_seconds = time.perf_counter() - started
+        bulk.close()
+    print(f"📋 저널 10,000명 추가: add_user {single_seconds:.3f}초 → add_users {bulk_seconds:.3f}초 ({bulk_added:,}명)")
+
+    print("✅ 테스트 완료")
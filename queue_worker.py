@@ -0,0 +1,183 @@
+# queue_worker.py
+"""
+대기열 처리 작업자 풀
+여러 개의 asyncio 작업자가 queue_manager를 계속 비우며, 처리 속도는 공용 API 요청 제한기만으로 조절됩니다.
+API 서킷이 열려 있으면 작업자는 사용자를 꺼내지 않고 기다립니다.
+"""
+
+import asyncio
+import time
+from collections import deque
+from typing import Awaitable, Callable, Optional
+
+from circuit_breaker import api_circuit_breaker, CLOSED
+from queue_manager import queue_manager
+from rate_limiter import api_rate_limiter
+
+# 사용자 1명당 평균 API 요청 수 (디스코드 → 마을 → 국가)
+API_CALLS_PER_USER = 3
+
+# 처리 속도 계산에 사용할 최근 기록 범위 (초)
+THROUGHPUT_WINDOW_SECONDS = 600
+
+
+class QueueWorkerPool:
+    """대기열을 계속 처리하는 asyncio 작업자 풀"""
+
+    def __init__(self, worker_count: int = 3):
+        self.worker_count = max(1, worker_count)
+        self._tasks = []
+        self._busy_tasks = set()
+        self._stopping = False
+        self._bot = None
+        self._handler = None
+        self._on_outage = None
+        self._on_recovery = None
+
+        # 통계 (최근 완료 시각으로 처리 속도 계산)
+        self._completed_at = deque(maxlen=50)
+        self.processed = 0
+        self.failed = 0
+
+    def start(self, bot, handler: Callable[..., Awaitable], on_outage: Optional[Callable] = None,
+              on_recovery: Optional[Callable] = None):
+        """작업자 시작 (이미 실행 중이면 무시)"""
+        if self.is_running():
+            return
+
+        self._bot = bot
+        self._handler = handler
+        self._on_outage = on_outage
+        self._on_recovery = on_recovery
+        self._stopping = False
+        self._tasks = [
+            asyncio.create_task(self._worker(index), name=f"queue-worker-{index}")
+            for index in range(self.worker_count)
+        ]
+        print(f"👷 대기열 작업자 {self.worker_count}개 시작")
+
+    async def stop(self, grace_seconds: float = 30.0):
+        """작업자 종료 - 처리 중인 사용자는 grace_seconds까지 기다린 뒤 중단"""
+        if not self._tasks:
+            return
+
+        self._stopping = True
+        busy = [task for task in self._tasks if task in self._busy_tasks]
+        for task in self._tasks:
+            if task not in self._busy_tasks:
+                task.cancel()
+
+        if busy:
+            print(f"⏳ 처리 중인 작업자 {len(busy)}개 종료 대기...")
+            _, pending = await asyncio.wait(busy, timeout=grace_seconds)
+            for task in pending:
+                task.cancel()
+
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._busy_tasks.clear()
+        queue_manager.processing = False
+        print("🛑 대기열 작업자 종료")
+
+    def is_running(self) -> bool:
+        return any(not task.done() for task in self._tasks)
+
+    async def _notify(self, callback):
+        """알림 콜백 실행 (실패해도 작업자는 계속 동작)"""
+        if callback is None:
+            return
+        try:
+            await callback(self._bot)
+        except Exception as e:
+            print(f"⚠️ 대기열 알림 전송 실패: {e}")
+
+    async def _worker(self, index: int):
+        task = asyncio.current_task()
+
+        while not self._stopping:
+            await queue_manager.wait_for_user()
+
+            # API 장애 중에는 사용자를 꺼내지 않고 대기열에 그대로 둠
+            if not api_circuit_breaker.allows_requests():
+                await self._notify(self._on_outage)
+                await asyncio.sleep(min(max(api_circuit_breaker.retry_after(), 1.0), 30.0))
+                continue
+
+            user_id = queue_manager.get_next()
+            if user_id is None:
+                continue
+
+            self._busy_tasks.add(task)
+            queue_manager.processing = True
+            try:
+                await self._handler(self._bot, user_id)
+                self.processed += 1
+            except asyncio.CancelledError:
+                # 종료로 끝내지 못한 사용자는 대기열로 되돌림
+                queue_manager.add_user(user_id)
+                raise
+            except Exception as e:
+                self.failed += 1
+                print(f"❌ 사용자 {user_id} 처리 실패: {e}")
+            finally:
+                # 완료 기록 (되돌린 사용자는 대기열에 다시 기록되어 있음)
+                queue_manager.mark_done(user_id)
+                self._busy_tasks.discard(task)
+                queue_manager.processing = bool(self._busy_tasks)
+                self._completed_at.append(time.monotonic())
+
+            if api_circuit_breaker.state == CLOSED:
+                await self._notify(self._on_recovery)
+
+            if queue_manager.get_queue_size() == 0 and not self._busy_tasks:
+                print(f"✅ 대기열 처리 완료 (누적 처리: {self.processed}명)")
+
+    def get_throughput(self) -> Optional[float]:
+        """최근 처리 속도 (명/초) - 기록이 부족하면 None"""
+        # 오래전 기록(이전 실행분)은 제외
+        now = time.monotonic()
+        recent = [t for t in self._completed_at if now - t <= THROUGHPUT_WINDOW_SECONDS]
+        if len(recent) < 2:
+            return None
+        span = recent[-1] - recent[0]
+        if span <= 0:
+            return None
+        return (len(recent) - 1) / span
+
+    def estimate_seconds(self, queue_size: int) -> int:
+        """대기열을 모두 처리하는 데 걸릴 예상 시간(초)"""
+        if queue_size <= 0:
+            return 0
+
+        throughput = self.get_throughput()
+        if throughput is None:
+            # 처리 기록이 없으면 API 요청 제한으로 추정
+            rate = api_rate_limiter.rate_per_second
+            throughput = rate / API_CALLS_PER_USER if rate > 0 else float(self.worker_count)
+
+        return int(queue_size / throughput)
+
+    def get_stats(self) -> dict:
+        """작업자 풀 상태 반환"""
+        throughput = self.get_throughput()
+        return {
+            "worker_count": self.worker_count,
+            "running": self.is_running(),
+            "busy": len(self._busy_tasks),
+            "processed": self.processed,
+            "failed": self.failed,
+            "users_per_minute": round(throughput * 60, 1) if throughput else None
+        }
+
+
+def _create_queue_worker_pool() -> QueueWorkerPool:
+    """config 설정으로 작업자 풀 생성"""
+    try:
+        from config import config
+        return QueueWorkerPool(config.QUEUE_WORKER_COUNT)
+    except ImportError:
+        return QueueWorkerPool()
+
+
+# 전역 대기열 작업자 풀 인스턴스
+queue_worker_pool = _create_queue_worker_pool()
@@ -0,0 +1,79 @@
+# rate_limiter.py
+"""
+MC_API_BASE 요청 속도 제한
+이벤트 루프를 막지 않는 asyncio 토큰 버킷으로 API 호출 간격을 조절합니다.
+"""
+
+import asyncio
+import time
+
+
+class TokenBucketRateLimiter:
+    """asyncio 토큰 버킷 기반 요청 제한기"""
+
+    def __init__(self, rate_per_second: float, burst: int = 1):
+        self.rate_per_second = rate_per_second
+        self.capacity = max(1, burst)
+        self._tokens = float(self.capacity)
+        self._updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+        # 통계
+        self.total_acquired = 0
+        self.total_wait_seconds = 0.0
+
+    def _refill(self):
+        """경과 시간만큼 토큰 보충"""
+        now = time.monotonic()
+        elapsed = now - self._updated_at
+        self._updated_at = now
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate_per_second)
+
+    async def acquire(self):
+        """요청 토큰 1개를 얻을 때까지 비동기로 대기"""
+        # 0 이하이면 제한 없음
+        if self.rate_per_second <= 0:
+            self.total_acquired += 1
+            return
+
+        started_at = time.monotonic()
+
+        # 잠금을 잡은 순서대로 토큰을 받으므로 대기자 간 순서가 보장됨
+        async with self._lock:
+            while True:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    break
+                await asyncio.sleep((1 - self._tokens) / self.rate_per_second)
+
+        self.total_acquired += 1
+        self.total_wait_seconds += time.monotonic() - started_at
+
+    def get_stats(self) -> dict:
+        """제한기 상태 반환"""
+        return {
+            "rate_per_second": self.rate_per_second,
+            "burst": self.capacity,
+            "total_acquired": self.total_acquired,
+            "total_wait_seconds": round(self.total_wait_seconds, 2)
+        }
+
+
+def _create_api_rate_limiter() -> TokenBucketRateLimiter:
+    """config 설정으로 MC_API_BASE 제한기 생성"""
+    try:
+        from config import config
+        rate = config.MC_API_RATE_PER_SECOND
+        burst = config.MC_API_RATE_BURST
+    except ImportError:
+        import os
+        rate = float(os.getenv("MC_API_RATE_PER_SECOND", "1.0"))
+        burst = int(os.getenv("MC_API_RATE_BURST", "3"))
+
+    print(f"✅ API 요청 제한: 초당 {rate}회 (버스트 {burst})")
+    return TokenBucketRateLimiter(rate, burst)
+
+
+# 전역 API 요청 제한기 인스턴스 (MC_API_BASE 공용)
+api_rate_limiter = _create_api_rate_limiter()
@@ -0,0 +1,120 @@
+# resident_watch.py
+"""
+국가 주민 변경 감시
+BASE_NATION의 마을 목록과 마을별 주민을 주기적으로 받아 이전 스냅샷과 비교하고,
+새로 들어온/떠난/마을을 옮긴 주민만 찾아냅니다. (전체 멤버 확인 대신 변경된 주민만 다시 확인)
+"""
+
+import time
+from typing import Dict, Optional, Set
+
+from planetearth_client import get_nation_towns, get_town_residents, ResolutionError
+from resolution_cache import resolution_cache
+from resolution_store import resolution_store
+
+
+class ResidentWatcher:
+    """국가 주민 스냅샷을 비교하여 변경된 마크 ID를 찾는 클래스"""
+
+    def __init__(self, nation: str):
+        self.nation = nation
+
+        # 통계
+        self.runs = 0
+        self.last_run_at = None
+        self.last_result = None
+
+    async def _collect(self, previous: Dict[str, str]) -> Optional[dict]:
+        """현재 주민 목록(마크 ID → 마을) 수집 - 국가 정보를 받지 못하면 None"""
+        towns = await get_nation_towns(self.nation)
+        if not towns:
+            return None
+
+        current = {}
+        failed_towns = set()
+        for town in towns:
+            try:
+                nation, residents = await get_town_residents(town)
+            except ResolutionError as e:
+                print(f"⚠️ 주민 목록 조회 실패 ({town}): {e.message}")
+                failed_towns.add(town)
+                continue
+            # 조회 사이에 국가를 떠난 마을은 제외
+            if nation != self.nation:
+                continue
+            for mc_id in residents:
+                current[mc_id] = town
+
+        # 조회에 실패한 마을의 주민은 이전 기록을 유지 (떠난 것으로 잘못 판단하지 않도록)
+        for mc_id, town in previous.items():
+            if town in failed_towns and mc_id not in current:
+                current[mc_id] = town
+
+        return {"residents": current, "towns": len(towns), "failed_towns": len(failed_towns)}
+
+    async def refresh(self) -> Optional[dict]:
+        """스냅샷을 새로 받아 이전 스냅샷과 비교 - 국가 정보를 받지 못하면 None
+
+        처음 실행(이전 스냅샷 없음)이면 기준 스냅샷만 저장하고 baseline=True를 반환합니다.
+        """
+        previous = resolution_store.get_resident_snapshot()
+        collected = await self._collect(previous)
+        if collected is None:
+            print(f"⚠️ 주민 변경 감시 건너뜀: {self.nation} 국가 정보를 받을 수 없습니다")
+            return None
+
+        current = collected["residents"]
+        joined: Set[str] = set(current) - set(previous)
+        left: Set[str] = set(previous) - set(current)
+        moved: Set[str] = {mc_id for mc_id in set(current) & set(previous) if current[mc_id] != previous[mc_id]}
+        resolution_store.replace_resident_snapshot(current)
+
+        baseline = not previous
+        if not baseline:
+            # 새 마을을 알고 있는 주민은 바로 반영하고, 떠난 주민은 다음 확인 때 다시 조회
+            for mc_id in joined | moved:
+                resolution_store.save_resident(mc_id, current[mc_id])
+                resolution_cache.residents.set(mc_id, current[mc_id])
+            for mc_id in left:
+                resolution_cache.residents.invalidate(mc_id)
+            resolution_store.expire_residents(left)
+
+        result = {
+            "baseline": baseline,
+            "towns": collected["towns"],
+            "failed_towns": collected["failed_towns"],
+            "residents": len(current),
+            "joined": set() if baseline else joined,
+            "left": set() if baseline else left,
+            "moved": set() if baseline else moved
+        }
+        self.runs += 1
+        self.last_run_at = time.time()
+        self.last_result = result
+        return result
+
+    def get_stats(self) -> dict:
+        """마지막 비교 결과 반환"""
+        result = self.last_result or {}
+        return {
+            "nation": self.nation,
+            "runs": self.runs,
+            "last_run_at": self.last_run_at,
+            "residents": result.get("residents", 0),
+            "joined": len(result.get("joined", ())),
+            "left": len(result.get("left", ())),
+            "moved": len(result.get("moved", ()))
+        }
+
+
+def _create_resident_watcher() -> ResidentWatcher:
+    """config 설정으로 주민 변경 감시 생성"""
+    try:
+        from config import config
+        return ResidentWatcher(config.BASE_NATION)
+    except ImportError:
+        return ResidentWatcher("Red_Mafia")
+
+
+# 전역 주민 변경 감시 인스턴스
+resident_watcher = _create_resident_watcher()
@@ -0,0 +1,203 @@
+# resolution_cache.py
+"""
+국적 조회 결과 메모리 캐시
+디스코드→마크 ID, 마크 ID→마을, 마을→국가 단계마다 별도의 유효 시간을 두고
+크기 제한(LRU)과 짧은 유효 시간의 실패 캐시(미연동, 404)를 지원합니다.
+같은 키를 동시에 조회하면 먼저 시작한 조회 결과를 함께 사용합니다.
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+
+class _NegativeEntry:
+    """실패 결과를 캐시하기 위한 항목 (예외 종류와 메시지 보관)"""
+    __slots__ = ("error_type", "message", "status")
+
+    def __init__(self, error: Exception):
+        self.error_type = type(error)
+        self.message = getattr(error, "message", str(error))
+        self.status = getattr(error, "status", None)
+
+    def to_error(self) -> Exception:
+        return self.error_type(self.message, status=self.status)
+
+
+class TTLCache:
+    """유효 시간과 최대 크기를 가진 LRU 캐시"""
+
+    def __init__(self, name: str, max_size: int, ttl_seconds: float, negative_ttl_seconds: float):
+        self.name = name
+        self.max_size = max(1, max_size)
+        self.ttl_seconds = ttl_seconds
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self._data: "OrderedDict[Any, Tuple[float, Any]]" = OrderedDict()  # key -> (만료 시각, 값)
+        self._loading: Dict[Any, asyncio.Future] = {}  # 진행 중인 조회
+
+        # 통계
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.shared_loads = 0
+
+    def get(self, key) -> Tuple[bool, Any]:
+        """(적중 여부, 값) 반환 - 실패 캐시 항목은 _NegativeEntry로 반환"""
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return False, None
+
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._data[key]
+            self.misses += 1
+            return False, None
+
+        self._data.move_to_end(key)
+        if isinstance(value, _NegativeEntry):
+            self.negative_hits += 1
+        else:
+            self.hits += 1
+        return True, value
+
+    def peek(self, key) -> Optional[Any]:
+        """통계/순서 변경 없이 유효한 성공 값 조회"""
+        entry = self._data.get(key)
+        if entry is None or entry[0] < time.monotonic() or isinstance(entry[1], _NegativeEntry):
+            return None
+        return entry[1]
+
+    def _store(self, key, value, ttl_seconds: float):
+        self._data[key] = (time.monotonic() + ttl_seconds, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def set(self, key, value, ttl_seconds: Optional[float] = None):
+        """성공 결과 저장"""
+        self._store(key, value, self.ttl_seconds if ttl_seconds is None else ttl_seconds)
+
+    def set_negative(self, key, error: Exception):
+        """실패 결과를 짧은 유효 시간으로 저장"""
+        self._store(key, _NegativeEntry(error), self.negative_ttl_seconds)
+
+    async def get_or_load(self, key, loader: Callable[[], Awaitable[Any]], negative_errors: tuple = ()):
+        """캐시에 있으면 반환, 없으면 loader 결과를 저장 후 반환
+
+        negative_errors에 해당하는 예외는 짧은 유효 시간으로 저장되어 다음 조회에서 같은 예외가 다시 발생합니다.
+        먼저 시작한 같은 키의 조회가 취소되면 기다리던 조회 중 하나가 다시 불러옵니다.
+        """
+        found, value = self.get(key)
+        if found:
+            if isinstance(value, _NegativeEntry):
+                raise value.to_error()
+            return value
+
+        # 같은 키를 이미 조회 중이면 그 결과를 기다림 (중복 API 호출 방지)
+        loading = self._loading.get(key)
+        while loading is not None:
+            self.shared_loads += 1
+            try:
+                return await asyncio.shield(loading)
+            except asyncio.CancelledError:
+                # 이 조회가 취소된 경우만 전달하고, 먼저 시작한 조회가 취소된 경우에는 직접 다시 조회
+                if not loading.cancelled():
+                    raise
+            loading = self._loading.get(key)
+
+        loading = asyncio.get_running_loop().create_future()
+        self._loading[key] = loading
+        try:
+            value = await loader()
+        except BaseException as e:
+            del self._loading[key]
+            if isinstance(e, negative_errors):
+                self.set_negative(key, e)
+            if isinstance(e, asyncio.CancelledError):
+                loading.cancel()
+            else:
+                loading.set_exception(e)
+                loading.exception()  # 기다리는 조회가 없어도 경고가 나지 않도록 확인 처리
+            raise
+
+        del self._loading[key]
+        self.set(key, value)
+        loading.set_result(value)
+        return value
+
+    def invalidate(self, key) -> bool:
+        """항목 하나 삭제"""
+        return self._data.pop(key, None) is not None
+
+    def clear(self) -> int:
+        """전체 삭제 및 삭제된 개수 반환"""
+        count = len(self._data)
+        self._data.clear()
+        return count
+
+    def get_stats(self) -> dict:
+        """캐시 통계 반환"""
+        lookups = self.hits + self.negative_hits + self.misses
+        return {
+            "name": self.name,
+            "size": len(self._data),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "negative_hits": self.negative_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "shared_loads": self.shared_loads,
+            "hit_rate": ((self.hits + self.negative_hits) / lookups * 100) if lookups else 0.0
+        }
+
+
+class ResolutionCache:
+    """국적 조회 단계별 캐시 모음"""
+
+    def __init__(self, max_size: int, link_ttl: float, resident_ttl: float, town_ttl: float, negative_ttl: float):
+        self.links = TTLCache("디스코드→마크", max_size, link_ttl, negative_ttl)       # discord_id -> mc_id
+        self.residents = TTLCache("마크→마을", max_size, resident_ttl, negative_ttl)   # mc_id -> town
+        self.towns = TTLCache("마을→국가", max_size, town_ttl, negative_ttl)           # town -> nation
+
+    def invalidate_user(self, discord_id: int) -> bool:
+        """사용자 관련 캐시 삭제 (연동 정보와 거주 마을)"""
+        mc_id = self.links.peek(discord_id)
+        removed = self.links.invalidate(discord_id)
+        if mc_id:
+            removed = self.residents.invalidate(mc_id) or removed
+        return removed
+
+    def invalidate_town(self, town: str) -> bool:
+        """마을 → 국가 캐시 삭제"""
+        return self.towns.invalidate(town)
+
+    def clear(self) -> int:
+        """모든 캐시 삭제 및 삭제된 개수 반환"""
+        return self.links.clear() + self.residents.clear() + self.towns.clear()
+
+    def get_stats(self) -> list:
+        """단계별 캐시 통계 반환"""
+        return [self.links.get_stats(), self.residents.get_stats(), self.towns.get_stats()]
+
+
+def _create_resolution_cache() -> ResolutionCache:
+    """config 설정으로 조회 캐시 생성"""
+    try:
+        from config import config
+        max_size = config.RESOLUTION_CACHE_SIZE
+        link_ttl = config.CACHE_LINK_TTL_HOURS * 3600
+        resident_ttl = config.CACHE_RESIDENT_TTL_HOURS * 3600
+        town_ttl = config.CACHE_TOWN_TTL_HOURS * 3600
+        negative_ttl = config.CACHE_NEGATIVE_TTL_MINUTES * 60
+    except ImportError:
+        max_size, link_ttl, resident_ttl, town_ttl, negative_ttl = 5000, 168 * 3600, 6 * 3600, 3600, 600
+
+    return ResolutionCache(max_size, link_ttl, resident_ttl, town_ttl, negative_ttl)
+
+
+# 전역 조회 캐시 인스턴스
+resolution_cache = _create_resolution_cache()
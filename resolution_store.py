@@ -0,0 +1,303 @@
+# resolution_store.py
+"""
+국적 조회 결과 영구 저장소 (SQLite, WAL 모드)
+봇을 재시작해도 API에서 확인한 연동/마을/국가 정보가 남아 있어 처음부터 다시 조회하지 않습니다.
+"""
+
+import sqlite3
+import time
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+
+class ResolutionStore:
+    """discord_id → mc_id/마을/국가, 마을 → 국가 정보를 저장하는 클래스"""
+
+    def __init__(self, filename: str = "resolution_store.db"):
+        self.filename = filename
+        self._conn = None
+        self.open()
+
+    def open(self):
+        """데이터베이스 연결 및 테이블 생성"""
+        try:
+            self._conn = sqlite3.connect(self.filename)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS members (
+                    discord_id INTEGER PRIMARY KEY,
+                    mc_id TEXT,
+                    town TEXT,
+                    nation TEXT,
+                    linked_at REAL,
+                    last_verified REAL
+                );
+                CREATE INDEX IF NOT EXISTS idx_members_mc_id ON members (mc_id);
+                CREATE TABLE IF NOT EXISTS towns (
+                    town TEXT PRIMARY KEY,
+                    nation TEXT,
+                    updated_at REAL
+                );
+                CREATE TABLE IF NOT EXISTS verifications (
+                    discord_id INTEGER PRIMARY KEY,
+                    verified_at REAL,
+                    result TEXT
+                );
+                CREATE INDEX IF NOT EXISTS idx_verifications_verified_at ON verifications (verified_at);
+                CREATE TABLE IF NOT EXISTS nation_residents (
+                    mc_id TEXT PRIMARY KEY,
+                    town TEXT NOT NULL
+                );
+            """)
+            self._conn.commit()
+            print(f"✅ 조회 저장소 로드: 사용자 {self.get_member_count()}명, 마을 {self.get_town_count()}개")
+        except sqlite3.Error as e:
+            print(f"❌ 조회 저장소 열기 실패: {e}")
+            self._conn = None
+
+    def close(self):
+        """데이터베이스 연결 종료"""
+        if self._conn:
+            self._conn.close()
+            self._conn = None
+
+    def _query_one(self, sql: str, params: tuple) -> Optional[tuple]:
+        if not self._conn:
+            return None
+        try:
+            return self._conn.execute(sql, params).fetchone()
+        except sqlite3.Error as e:
+            print(f"❌ 조회 저장소 읽기 실패: {e}")
+            return None
+
+    def _execute(self, sql: str, params: tuple = ()) -> int:
+        if not self._conn:
+            return 0
+        try:
+            cursor = self._conn.execute(sql, params)
+            self._conn.commit()
+            return cursor.rowcount
+        except sqlite3.Error as e:
+            print(f"❌ 조회 저장소 쓰기 실패: {e}")
+            return 0
+
+    @staticmethod
+    def _fresh(row: Optional[tuple], max_age: float) -> Optional[Tuple[str, float]]:
+        """(값, 경과 초) 반환 - 값이 없거나 max_age보다 오래되었으면 None"""
+        if not row or row[0] is None or row[1] is None:
+            return None
+        age = time.time() - row[1]
+        if age >= max_age:
+            return None
+        return row[0], age
+
+    # 조회
+    def get_link(self, discord_id: int, max_age: float) -> Optional[Tuple[str, float]]:
+        """디스코드 ID → (마크 ID, 경과 초)"""
+        row = self._query_one("SELECT mc_id, linked_at FROM members WHERE discord_id = ?", (discord_id,))
+        return self._fresh(row, max_age)
+
+    def get_resident(self, mc_id: str, max_age: float) -> Optional[Tuple[str, float]]:
+        """마크 ID → (마을, 경과 초)"""
+        row = self._query_one(
+            "SELECT town, last_verified FROM members WHERE mc_id = ? ORDER BY last_verified DESC LIMIT 1",
+            (mc_id,)
+        )
+        return self._fresh(row, max_age)
+
+    def get_town(self, town: str, max_age: float) -> Optional[Tuple[str, float]]:
+        """마을 → (국가, 경과 초)"""
+        row = self._query_one("SELECT nation, updated_at FROM towns WHERE town = ?", (town,))
+        return self._fresh(row, max_age)
+
+    # 저장
+    def save_link(self, discord_id: int, mc_id: str):
+        """API에서 확인한 디스코드 ↔ 마크 연동 저장"""
+        self._execute(
+            """INSERT INTO members (discord_id, mc_id, linked_at) VALUES (?, ?, ?)
+               ON CONFLICT(discord_id) DO UPDATE SET
+                   mc_id = excluded.mc_id,
+                   linked_at = excluded.linked_at,
+                   town = CASE WHEN members.mc_id = excluded.mc_id THEN members.town END,
+                   nation = CASE WHEN members.mc_id = excluded.mc_id THEN members.nation END,
+                   last_verified = CASE WHEN members.mc_id = excluded.mc_id THEN members.last_verified END""",
+            (discord_id, mc_id, time.time())
+        )
+
+    def save_resident(self, mc_id: str, town: Optional[str]):
+        """API에서 확인한 거주 마을 저장 (마을이 없으면 None)"""
+        self._execute(
+            "UPDATE members SET town = ?, nation = CASE WHEN town IS ? THEN nation END, last_verified = ? WHERE mc_id = ?",
+            (town, town, time.time(), mc_id)
+        )
+
+    def save_town(self, town: str, nation: Optional[str]):
+        """API에서 확인한 마을 → 국가 저장 (국가가 없으면 None)"""
+        self._execute(
+            """INSERT INTO towns (town, nation, updated_at) VALUES (?, ?, ?)
+               ON CONFLICT(town) DO UPDATE SET nation = excluded.nation, updated_at = excluded.updated_at""",
+            (town, nation, time.time())
+        )
+
+    def save_nation_towns(self, nation: str, towns: List[str]):
+        """국가 마을 목록을 마을 → 국가 정보로 한 번에 저장"""
+        if not self._conn or not towns:
+            return
+        now = time.time()
+        try:
+            self._conn.executemany(
+                """INSERT INTO towns (town, nation, updated_at) VALUES (?, ?, ?)
+                   ON CONFLICT(town) DO UPDATE SET nation = excluded.nation, updated_at = excluded.updated_at""",
+                [(town, nation, now) for town in towns]
+            )
+            self._conn.commit()
+        except sqlite3.Error as e:
+            print(f"❌ 조회 저장소 쓰기 실패: {e}")
+
+    def get_nation_towns(self, nation: str) -> List[str]:
+        """저장된 국가의 마을 목록 (갱신 시각과 관계없이)"""
+        if not self._conn:
+            return []
+        try:
+            return [row[0] for row in self._conn.execute("SELECT town FROM towns WHERE nation = ?", (nation,))]
+        except sqlite3.Error as e:
+            print(f"❌ 조회 저장소 읽기 실패: {e}")
+            return []
+
+    def save_nation(self, discord_id: int, nation: str):
+        """조회가 끝난 사용자의 국가 기록"""
+        self._execute("UPDATE members SET nation = ? WHERE discord_id = ?", (nation, discord_id))
+
+    # 확인 기록 (대량 확인 시 최근에 확인된 사용자 건너뛰기)
+    def record_verification(self, discord_id: int, result: str):
+        """사용자 확인 시각과 결과 기록 (연동 해제 등으로 사용자 정보가 삭제되어도 유지)"""
+        self._execute(
+            """INSERT INTO verifications (discord_id, verified_at, result) VALUES (?, ?, ?)
+               ON CONFLICT(discord_id) DO UPDATE SET verified_at = excluded.verified_at, result = excluded.result""",
+            (discord_id, time.time(), result)
+        )
+
+    def get_verification(self, discord_id: int, max_age: float) -> Optional[Tuple[str, float]]:
+        """디스코드 ID → (마지막 확인 결과, 경과 초)"""
+        row = self._query_one("SELECT result, verified_at FROM verifications WHERE discord_id = ?", (discord_id,))
+        return self._fresh(row, max_age)
+
+    def get_recently_verified(self, max_age: float) -> Set[int]:
+        """max_age초 안에 확인된 사용자 ID 집합"""
+        if not self._conn or max_age <= 0:
+            return set()
+        try:
+            rows = self._conn.execute(
+                "SELECT discord_id FROM verifications WHERE verified_at > ?", (time.time() - max_age,)
+            )
+            return {row[0] for row in rows}
+        except sqlite3.Error as e:
+            print(f"❌ 조회 저장소 읽기 실패: {e}")
+            return set()
+
+    def get_census_rows(self) -> List[tuple]:
+        """확인 기록이 있는 모든 사용자의 (디스코드 ID, 확인 시각, 결과, 마을, 국가)"""
+        if not self._conn:
+            return []
+        try:
+            return self._conn.execute(
+                """SELECT v.discord_id, v.verified_at, v.result, m.town, m.nation
+                   FROM verifications v LEFT JOIN members m ON m.discord_id = v.discord_id"""
+            ).fetchall()
+        except sqlite3.Error as e:
+            print(f"❌ 조회 저장소 읽기 실패: {e}")
+            return []
+
+    # 국가 주민 스냅샷 (변경된 주민만 다시 확인)
+    def get_resident_snapshot(self) -> Dict[str, str]:
+        """마지막으로 저장한 국가 주민 목록 (마크 ID → 마을)"""
+        if not self._conn:
+            return {}
+        try:
+            return dict(self._conn.execute("SELECT mc_id, town FROM nation_residents"))
+        except sqlite3.Error as e:
+            print(f"❌ 조회 저장소 읽기 실패: {e}")
+            return {}
+
+    def replace_resident_snapshot(self, residents: Dict[str, str]):
+        """국가 주민 목록을 새 스냅샷으로 교체"""
+        if not self._conn:
+            return
+        try:
+            with self._conn:
+                self._conn.execute("DELETE FROM nation_residents")
+                self._conn.executemany(
+                    "INSERT INTO nation_residents (mc_id, town) VALUES (?, ?)", residents.items()
+                )
+        except sqlite3.Error as e:
+            print(f"❌ 조회 저장소 쓰기 실패: {e}")
+
+    def get_discord_ids(self, mc_ids: Iterable[str]) -> Dict[str, int]:
+        """마크 ID 목록 → 연동된 디스코드 ID (저장소에 연동 기록이 있는 사용자만)"""
+        mc_ids = list(mc_ids)
+        linked = {}
+        if not self._conn:
+            return linked
+        try:
+            # SQLite 변수 개수 제한 때문에 나눠서 조회
+            for start in range(0, len(mc_ids), 500):
+                chunk = mc_ids[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT mc_id, discord_id FROM members WHERE mc_id IN ({placeholders})", chunk
+                )
+                linked.update(rows)
+        except sqlite3.Error as e:
+            print(f"❌ 조회 저장소 읽기 실패: {e}")
+        return linked
+
+    def expire_residents(self, mc_ids: Iterable[str]):
+        """저장된 거주 마을 정보를 만료시켜 다음 확인 때 API로 다시 조회하게 함"""
+        if not self._conn:
+            return
+        try:
+            self._conn.executemany(
+                "UPDATE members SET last_verified = NULL WHERE mc_id = ?", [(mc_id,) for mc_id in mc_ids]
+            )
+            self._conn.commit()
+        except sqlite3.Error as e:
+            print(f"❌ 조회 저장소 쓰기 실패: {e}")
+
+    # 삭제
+    def forget_member(self, discord_id: int) -> bool:
+        """사용자 정보 삭제 (연동 해제 시)"""
+        return self._execute("DELETE FROM members WHERE discord_id = ?", (discord_id,)) > 0
+
+    def forget_town(self, town: str) -> bool:
+        """마을 정보 삭제"""
+        return self._execute("DELETE FROM towns WHERE town = ?", (town,)) > 0
+
+    def clear(self) -> int:
+        """조회 정보(멤버/마을) 삭제 및 삭제된 행 개수 반환 (확인 기록과 주민 스냅샷은 유지)"""
+        return self._execute("DELETE FROM members") + self._execute("DELETE FROM towns")
+
+    # 통계
+    def get_member_count(self) -> int:
+        row = self._query_one("SELECT COUNT(*) FROM members", ())
+        return row[0] if row else 0
+
+    def get_town_count(self) -> int:
+        row = self._query_one("SELECT COUNT(*) FROM towns", ())
+        return row[0] if row else 0
+
+    def get_verification_count(self) -> int:
+        row = self._query_one("SELECT COUNT(*) FROM verifications", ())
+        return row[0] if row else 0
+
+
+def _create_resolution_store() -> ResolutionStore:
+    """config 설정으로 조회 저장소 생성"""
+    try:
+        from config import config
+        return ResolutionStore(config.RESOLUTION_STORE_PATH)
+    except ImportError:
+        return ResolutionStore()
+
+
+# 전역 조회 저장소 인스턴스
+resolution_store = _create_resolution_store()
@@ -0,0 +1,149 @@
+import asyncio
+import json
+import os
+import random
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import aiohttp
+import discord
+
+from planetearth_client import ApiRequestError
+
+# retry_manager.py
+# 대기열 처리 실패 재시도 관리
+# 일시적 오류(타임아웃, 5xx, 429)는 지수 대기 후 다시 대기열에 넣고,
+# 최대 횟수를 넘기면 실패 목록(dead letter)에 보관하여 관리자가 확인/재시도할 수 있게 합니다.
+
+# 일시적 오류로 보는 예외 (그 외 연동 안됨, 마을 없음 등은 재시도해도 결과가 같음)
+TRANSIENT_ERRORS = (ApiRequestError, asyncio.TimeoutError, aiohttp.ClientError, discord.DiscordServerError)
+
+
+def is_transient_error(error: Exception) -> bool:
+    """재시도하면 성공할 수 있는 오류인지 확인"""
+    if isinstance(error, discord.HTTPException) and error.status == 429:
+        return True
+    return isinstance(error, TRANSIENT_ERRORS)
+
+
+class RetryManager:
+    """재시도 횟수와 실패 목록을 관리하는 클래스"""
+
+    def __init__(self, max_attempts: int = 4, base_delay: float = 60.0, max_delay: float = 1800.0,
+                 filename: str = "dead_letters.json"):
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.filename = filename
+        self._attempts: Dict[int, int] = {}  # user_id -> 실패 횟수
+        self._dead_letters: Dict[int, dict] = {}  # user_id -> 실패 정보
+        self.load_dead_letters()
+
+    def load_dead_letters(self):
+        """실패 목록을 파일에서 로드"""
+        try:
+            if os.path.exists(self.filename):
+                with open(self.filename, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                    # 문자열 키를 정수로 변환
+                    raw_entries = data.get('dead_letters', {})
+                    self._dead_letters = {int(k): v for k, v in raw_entries.items()}
+                print(f"✅ 실패 목록 로드: {len(self._dead_letters)}명")
+            else:
+                print(f"📁 실패 목록 파일이 없어서 새로 생성합니다: {self.filename}")
+                self.save_dead_letters()
+        except Exception as e:
+            print(f"❌ 실패 목록 로드 실패: {e}")
+            self._dead_letters = {}
+
+    def save_dead_letters(self):
+        """실패 목록을 파일에 저장"""
+        try:
+            data = {
+                'dead_letters': {str(k): v for k, v in self._dead_letters.items()},  # 정수 키를 문자열로 변환
+                'count': len(self._dead_letters),
+                'description': '재시도 횟수를 모두 사용한 대기열 처리 실패 사용자'
+            }
+            with open(self.filename, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
+            print(f"💾 실패 목록 저장: {len(self._dead_letters)}명")
+        except Exception as e:
+            print(f"❌ 실패 목록 저장 실패: {e}")
+
+    def get_retry_delay(self, attempt: int) -> float:
+        """attempt번째 실패 후 대기 시간 (지수 증가 + ±20% 지터)"""
+        delay = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        return delay * random.uniform(0.8, 1.2)
+
+    def record_failure(self, user_id: int, error: Exception) -> Optional[float]:
+        """일시적 실패 기록 - 재시도할 대기 시간(초) 반환, 횟수를 모두 쓰면 실패 목록에 넣고 None 반환"""
+        attempt = self._attempts.get(user_id, 0) + 1
+
+        if attempt < self.max_attempts:
+            self._attempts[user_id] = attempt
+            return self.get_retry_delay(attempt)
+
+        self._attempts.pop(user_id, None)
+        self._dead_letters[user_id] = {
+            'error': str(error)[:200],
+            'error_type': type(error).__name__,
+            'attempts': attempt,
+            'failed_at': datetime.now().isoformat(timespec='seconds')
+        }
+        self.save_dead_letters()
+        print(f"☠️ 실패 목록 추가: {user_id} ({attempt}회 실패)")
+        return None
+
+    def get_attempts(self, user_id: int) -> int:
+        """현재까지 실패 횟수"""
+        return self._attempts.get(user_id, 0)
+
+    def reset(self, user_id: int):
+        """처리가 끝난 사용자의 실패 횟수 초기화"""
+        self._attempts.pop(user_id, None)
+
+    def remove_dead_letter(self, user_id: int) -> bool:
+        """나중에 확인에 성공한 사용자를 실패 목록에서 제거 (목록에 있었으면 True)"""
+        if self._dead_letters.pop(user_id, None) is None:
+            return False
+        self.save_dead_letters()
+        return True
+
+    def get_dead_letters(self) -> Dict[int, dict]:
+        """실패 목록 반환"""
+        return dict(self._dead_letters)
+
+    def get_dead_letter_count(self) -> int:
+        """실패 목록 인원 반환"""
+        return len(self._dead_letters)
+
+    def take_dead_letters(self) -> List[int]:
+        """재시도를 위해 실패 목록을 비우고 사용자 목록 반환"""
+        user_ids = list(self._dead_letters)
+        self._dead_letters.clear()
+        self.save_dead_letters()
+        return user_ids
+
+    def clear_dead_letters(self) -> int:
+        """실패 목록 삭제 및 삭제된 인원 반환"""
+        count = len(self._dead_letters)
+        self._dead_letters.clear()
+        self.save_dead_letters()
+        return count
+
+
+def _create_retry_manager() -> RetryManager:
+    """config 설정으로 재시도 관리자 생성"""
+    try:
+        from config import config
+        return RetryManager(
+            max_attempts=config.RETRY_MAX_ATTEMPTS,
+            base_delay=config.RETRY_BASE_DELAY_SECONDS,
+            max_delay=config.RETRY_MAX_DELAY_SECONDS
+        )
+    except ImportError:
+        return RetryManager()
+
+
+# 전역 재시도 관리자 인스턴스
+retry_manager = _create_retry_manager()
@@ -3,13 +3,21 @@ from apscheduler.triggers.interval import IntervalTrigger
 from apscheduler.triggers.cron import CronTrigger
 from datetime import datetime, timezone, timedelta
 import discord
-import aiohttp
 import os
-import time
 import re
+import time
+import zlib
 
-from queue_manager import queue_manager
+from queue_manager import queue_manager, LANE_BULK
 from exception_manager import exception_manager
+from planetearth_client import resolve_member, record_verification, refresh_town_index, ResolutionError, ApiRequestError
+from circuit_breaker import api_circuit_breaker, CLOSED
+from queue_worker import queue_worker_pool, API_CALLS_PER_USER
+from resolution_store import resolution_store
+from resident_watch import resident_watcher
+from member_sync import plan_member_update, apply_member_update
+from log_digest import log_digest
+from retry_manager import retry_manager, is_transient_error
 
 # town_role_manager 안전하게 import
 try:
@@ -34,6 +42,12 @@ try:
     AUTO_EXECUTION_DAY = config.AUTO_EXECUTION_DAY
     AUTO_EXECUTION_HOUR = config.AUTO_EXECUTION_HOUR
     AUTO_EXECUTION_MINUTE = config.AUTO_EXECUTION_MINUTE
+    AUTO_EXECUTION_MODE = config.AUTO_EXECUTION_MODE
+    ROLLING_PERIOD_HOURS = config.ROLLING_PERIOD_HOURS
+    ROLLING_INTERVAL_MINUTES = config.ROLLING_INTERVAL_MINUTES
+    TOWN_INDEX_REFRESH_MINUTES = config.TOWN_INDEX_REFRESH_MINUTES
+    VERIFY_FRESHNESS_HOURS = config.VERIFY_FRESHNESS_HOURS
+    RESIDENT_WATCH_INTERVAL_MINUTES = config.RESIDENT_WATCH_INTERVAL_MINUTES
     print("✅ scheduler.py: config.py에서 환경변수 로드 완료")
 except ImportError:
     # config.py가 없으면 직접 환경변수 로드
@@ -47,10 +61,22 @@ except ImportError:
     AUTO_EXECUTION_DAY = int(os.getenv("AUTO_EXECUTION_DAY", "2"))
     AUTO_EXECUTION_HOUR = int(os.getenv("AUTO_EXECUTION_HOUR", "3"))
     AUTO_EXECUTION_MINUTE = int(os.getenv("AUTO_EXECUTION_MINUTE", "24"))
+    AUTO_EXECUTION_MODE = os.getenv("AUTO_EXECUTION_MODE", "weekly").lower()
+    ROLLING_PERIOD_HOURS = int(os.getenv("ROLLING_PERIOD_HOURS", "168"))
+    ROLLING_INTERVAL_MINUTES = int(os.getenv("ROLLING_INTERVAL_MINUTES", "60"))
+    TOWN_INDEX_REFRESH_MINUTES = int(os.getenv("TOWN_INDEX_REFRESH_MINUTES", "30"))
+    VERIFY_FRESHNESS_HOURS = float(os.getenv("VERIFY_FRESHNESS_HOURS", "24"))
+    RESIDENT_WATCH_INTERVAL_MINUTES = int(os.getenv("RESIDENT_WATCH_INTERVAL_MINUTES", "60"))
 
 # 스케줄러 인스턴스
 scheduler = AsyncIOScheduler(timezone='Asia/Seoul')
 
+# API 장애 알림 전송 여부 (장애 1회당 알림 1번)
+_api_outage_notified = False
+
+# 마지막으로 처리한 순환 확인 구간 번호 (건너뛴 구간의 묶음을 다음 실행에서 함께 처리)
+_rolling_last_slot = None
+
 def is_exception_user(user_id: int) -> bool:
     """예외 사용자 확인 함수 (main.py에서 사용)"""
     try:
@@ -91,7 +117,13 @@ def get_scheduler_info():
             "jobs": jobs,
             "auto_execution_day": AUTO_EXECUTION_DAY,
             "auto_execution_hour": AUTO_EXECUTION_HOUR,
-            "auto_execution_minute": AUTO_EXECUTION_MINUTE
+            "auto_execution_minute": AUTO_EXECUTION_MINUTE,
+            "auto_execution_mode": AUTO_EXECUTION_MODE,
+            "rolling_period_hours": ROLLING_PERIOD_HOURS,
+            "rolling_interval_minutes": ROLLING_INTERVAL_MINUTES,
+            "rolling_bucket_count": get_rolling_bucket_count(),
+            "rolling_current_bucket": get_current_rolling_bucket(),
+            "resident_watch": resident_watcher.get_stats() if RESIDENT_WATCH_INTERVAL_MINUTES > 0 else None
         }
     except Exception as e:
         print(f"스케줄러 정보 조회 오류: {e}")
@@ -100,7 +132,8 @@ def get_scheduler_info():
             "jobs": [],
             "auto_execution_day": AUTO_EXECUTION_DAY,
             "auto_execution_hour": AUTO_EXECUTION_HOUR,
-            "auto_execution_minute": AUTO_EXECUTION_MINUTE
+            "auto_execution_minute": AUTO_EXECUTION_MINUTE,
+            "auto_execution_mode": AUTO_EXECUTION_MODE
         }
 
 def abbreviate_nation_name(nation_name: str) -> str:
@@ -188,170 +221,110 @@ async def send_log_message(bot, channel_id: int, embed: discord.Embed):
     except Exception as e:
         print(f"❌ 로그 메시지 전송 실패: {e}")
 
-async def update_user_info(member, mc_id, nation, guild, town=None):
-    """사용자 정보 업데이트 (역할, 닉네임) - 매핑된 마을 역할 사용"""
-    changes = []
-    
-    try:
-        # 새 닉네임 생성 (기존 닉네임을 고려하여)
-        current_nickname = member.display_name
-        new_nickname = create_nickname(mc_id, nation, current_nickname)
-        
+def read_auto_role_ids():
+    """auto_roles.txt의 역할 ID 목록 (파일이 없으면 None)"""
+    auto_roles_path = "auto_roles.txt"
+    if not os.path.exists(auto_roles_path):
+        return None
+    with open(auto_roles_path, "r") as f:
+        return [line.strip() for line in f.readlines() if line.strip()]
+
+def get_rolling_bucket_count() -> int:
+    """순환 확인 묶음 수 (주기 동안 실행되는 횟수)"""
+    return max(1, ROLLING_PERIOD_HOURS * 60 // ROLLING_INTERVAL_MINUTES)
+
+def get_rolling_bucket(user_id: int, bucket_count: int) -> int:
+    """사용자가 속한 순환 확인 묶음 (재시작해도 항상 같은 값)"""
+    return zlib.crc32(str(user_id).encode()) % bucket_count
+
+def get_current_rolling_slot() -> int:
+    """지금 시각의 순환 확인 구간 번호 (ROLLING_INTERVAL_MINUTES 단위)"""
+    return int(time.time() // (ROLLING_INTERVAL_MINUTES * 60))
+
+def get_current_rolling_bucket() -> int:
+    """지금 확인할 묶음 번호 - 시각으로 계산하므로 재시작해도 순서가 이어짐"""
+    return get_current_rolling_slot() % get_rolling_bucket_count()
+
+def enqueue_auto_role_members(bot, role_ids, dry_run: bool = False, buckets=None, bucket_count: int = 1) -> dict:
+    """auto_roles.txt 역할을 가진 멤버를 한 번에 대량 확인 구간에 추가
+
+    role.members는 역할마다 길드 멤버 전체를 훑으므로, 길드 멤버를 한 번만 훑어 대상 역할이 하나라도 있는
+    멤버를 모으고 예외/최근 확인됨/대기 중인 사용자는 집합 연산으로 제외한 뒤 add_users로 한 번에 추가합니다.
+    dry_run이면 대기열에 추가하지 않고 인원만 계산하며, buckets(묶음 번호 집합)를 지정하면 해당 묶음의 멤버만 대상으로 합니다.
+    """
+    target_role_ids = set()
+    for role_id_str in role_ids:
         try:
-            if current_nickname != new_nickname:
-                await member.edit(nick=new_nickname)
-                changes.append(f"• 닉네임이 **``{new_nickname}``**로 변경됨")
-                print(f"  ✅ 닉네임 변경: {current_nickname} → {new_nickname}")
-            else:
-                print(f"  ℹ️ 닉네임 유지: {new_nickname}")
-        except discord.Forbidden:
-            changes.append("• ⚠️ 닉네임 변경 권한 없음")
-            print(f"  ⚠️ 닉네임 변경 권한 없음")
-        except Exception as e:
-            changes.append(f"• ⚠️ 닉네임 변경 실패: {str(e)[:50]}")
-            print(f"  ⚠️ 닉네임 변경 실패: {e}")
-
-        # 매핑된 마을 역할 처리 (안전하게)
-        if town and TOWN_ROLE_ENABLED and town_role_manager:
-            try:
-                role_id = town_role_manager.get_role_id(town)
-                if role_id:
-                    town_role = guild.get_role(role_id)
-                    if town_role:
-                        if town_role not in member.roles:
-                            await member.add_roles(town_role)
-                            changes.append(f"• **{town_role.name}** 마을 역할 추가됨")
-                            print(f"  ✅ 매핑된 마을 역할 부여: {town_role.name}")
-                        else:
-                            print(f"  ℹ️ 이미 마을 역할 보유: {town_role.name}")
-                    else:
-                        changes.append(f"• ⚠️ 마을 역할을 찾을 수 없음 (ID: {role_id})")
-                        print(f"  ⚠️ 마을 역할 없음: {role_id}")
-                else:
-                    print(f"  ℹ️ {town} 마을은 역할이 매핑되지 않음")
-            except Exception as e:
-                changes.append(f"• ⚠️ 마을 역할 처리 실패: {str(e)[:50]}")
-                print(f"  ⚠️ 마을 역할 처리 실패: {e}")
-        elif town and not TOWN_ROLE_ENABLED:
-            print(f"  ℹ️ {town} 마을 - 마을 역할 기능 비활성화됨")
-
-        # 국가별 역할 부여 (기존 로직)
-        if nation == BASE_NATION:
-            # 국민인 경우
-            if SUCCESS_ROLE_ID != 0:
-                success_role = guild.get_role(SUCCESS_ROLE_ID)
-                if success_role and success_role not in member.roles:
-                    try:
-                        await member.add_roles(success_role)
-                        changes.append(f"• **{success_role.name}** 역할 추가됨")
-                        print(f"  ✅ 국민 역할 부여: {success_role.name}")
-                    except Exception as e:
-                        changes.append(f"• ⚠️ 국민 역할 부여 실패: {str(e)[:50]}")
-                        print(f"  ⚠️ 국민 역할 부여 실패: {e}")
-            
-            # 비국민 역할 제거
-            if SUCCESS_ROLE_ID_OUT != 0:
-                out_role = guild.get_role(SUCCESS_ROLE_ID_OUT)
-                if out_role and out_role in member.roles:
-                    try:
-                        await member.remove_roles(out_role)
-                        changes.append(f"• **{out_role.name}** 역할 제거됨")
-                        print(f"  ✅ 비국민 역할 제거: {out_role.name}")
-                    except Exception as e:
-                        changes.append(f"• ⚠️ 비국민 역할 제거 실패: {str(e)[:50]}")
-                        print(f"  ⚠️ 비국민 역할 제거 실패: {e}")
-        else:
-            # 비국민인 경우
-            if SUCCESS_ROLE_ID_OUT != 0:
-                out_role = guild.get_role(SUCCESS_ROLE_ID_OUT)
-                if out_role and out_role not in member.roles:
-                    try:
-                        await member.add_roles(out_role)
-                        changes.append(f"• **{out_role.name}** 역할 추가됨")
-                        print(f"  ✅ 비국민 역할 부여: {out_role.name}")
-                    except Exception as e:
-                        changes.append(f"• ⚠️ 비국민 역할 부여 실패: {str(e)[:50]}")
-                        print(f"  ⚠️ 비국민 역할 부여 실패: {e}")
-            
-            # 국민 역할 제거
-            if SUCCESS_ROLE_ID != 0:
-                success_role = guild.get_role(SUCCESS_ROLE_ID)
-                if success_role and success_role in member.roles:
-                    try:
-                        await member.remove_roles(success_role)
-                        changes.append(f"• **{success_role.name}** 역할 제거됨")
-                        print(f"  ✅ 국민 역할 제거: {success_role.name}")
-                    except Exception as e:
-                        changes.append(f"• ⚠️ 국민 역할 제거 실패: {str(e)[:50]}")
-                        print(f"  ⚠️ 국민 역할 제거 실패: {e}")
-        
-        return changes
-        
-    except Exception as e:
-        print(f"❌ 사용자 정보 업데이트 실패: {e}")
-        return [f"• ❌ 업데이트 실패: {str(e)[:50]}"]
+            target_role_ids.add(int(role_id_str))
+        except ValueError:
+            print(f"⚠️ 잘못된 역할 ID 형식: {role_id_str}")
+
+    targeted = set()
+    found_role_ids = set()
+    for guild in bot.guilds:
+        guild_role_ids = {role_id for role_id in target_role_ids if guild.get_role(role_id)}
+        if not guild_role_ids:
+            continue
+        found_role_ids |= guild_role_ids
+        for member in guild.members:
+            if any(role.id in guild_role_ids for role in member.roles):
+                if buckets is None or get_rolling_bucket(member.id, bucket_count) in buckets:
+                    targeted.add(member.id)
 
-async def manual_execute_auto_roles(bot):
-    """자동 역할 부여를 수동으로 실행"""
+    missing_roles = sorted(target_role_ids - found_role_ids)
+    if missing_roles:
+        print(f"⚠️ 역할을 찾을 수 없음: {', '.join(map(str, missing_roles))}")
+
+    excluded = targeted & set(exception_manager.get_exceptions())
+    fresh = (targeted - excluded) & resolution_store.get_recently_verified(VERIFY_FRESHNESS_HOURS * 3600)
+    candidates = targeted - excluded - fresh
+    already_queued = {user_id for user_id in candidates if queue_manager.is_user_in_queue(user_id)}
+    to_add = candidates - already_queued
+    added = len(to_add) if dry_run else queue_manager.add_users(to_add, LANE_BULK)
+
+    return {
+        "targeted": len(targeted),
+        "excluded": len(excluded),
+        "fresh": len(fresh),
+        "already_queued": len(already_queued),
+        "added": added,
+        "api_calls_saved": len(fresh) * API_CALLS_PER_USER,
+        "missing_roles": missing_roles
+    }
+
+async def manual_execute_auto_roles(bot, dry_run: bool = False):
+    """자동 역할 부여를 수동으로 실행 (dry_run이면 대기열에 추가하지 않고 결과만 계산)"""
     try:
-        print("🎯 수동 자동 역할 실행 시작")
+        print(f"🎯 수동 자동 역할 실행 시작{' (모의 실행)' if dry_run else ''}")
         
-        # auto_roles.txt 파일 확인
-        auto_roles_path = "auto_roles.txt"
-        if not os.path.exists(auto_roles_path):
+        role_ids = read_auto_role_ids()
+        if role_ids is None:
             return {
                 "success": False,
                 "message": "auto_roles.txt 파일이 존재하지 않습니다."
             }
         
-        # 역할 ID 읽기
-        with open(auto_roles_path, "r") as f:
-            role_ids = [line.strip() for line in f.readlines() if line.strip()]
-        
         if not role_ids:
             return {
                 "success": False,
                 "message": "auto_roles.txt 파일에 역할 ID가 없습니다."
             }
         
-        added_count = 0
+        result = enqueue_auto_role_members(bot, role_ids, dry_run=dry_run)
+        added_count = result["added"]
         
-        # 각 길드에서 역할 멤버들을 대기열에 추가
-        for guild in bot.guilds:
-            print(f"🏰 길드 처리: {guild.name}")
-            
-            for role_id_str in role_ids:
-                try:
-                    role_id = int(role_id_str)
-                    role = guild.get_role(role_id)
-                    
-                    if not role:
-                        print(f"⚠️ 역할을 찾을 수 없음: {role_id}")
-                        continue
-                    
-                    print(f"👥 역할 '{role.name}' 멤버 {len(role.members)}명 처리 중")
-                    
-                    for member in role.members:
-                        # 예외 목록 확인
-                        if exception_manager.is_exception(member.id):
-                            print(f"  ⏭️ 예외 대상 건너뜀: {member.display_name}")
-                            continue
-                        
-                        # 대기열에 추가
-                        if queue_manager.add_user(member.id):
-                            added_count += 1
-                            print(f"  ➕ 대기열 추가: {member.display_name}")
-                        else:
-                            print(f"  ⏭️ 이미 대기열에 있음: {member.display_name}")
-                    
-                except ValueError:
-                    print(f"⚠️ 잘못된 역할 ID 형식: {role_id_str}")
-                    continue
-                except Exception as e:
-                    print(f"⚠️ 역할 처리 오류 ({role_id_str}): {e}")
-                    continue
+        if dry_run:
+            print(f"🧪 모의 실행 - 대상 {result['targeted']}명, 추가 예정 {added_count}명, "
+                  f"최근 확인됨 {result['fresh']}명 (API 요청 약 {result['api_calls_saved']}회 절약)")
+            return {
+                "success": True,
+                "message": f"{added_count}명이 대기열에 추가될 예정입니다. (모의 실행)",
+                "added_count": added_count,
+                **result
+            }
         
-        print(f"✅ 자동 역할 실행 완료 - {added_count}명 대기열 추가")
+        print(f"✅ 자동 역할 실행 완료 - 대상 {result['targeted']}명, 대기열 추가 {added_count}명, "
+              f"최근 확인됨 {result['fresh']}명, 이미 대기 중 {result['already_queued']}명, 예외 {result['excluded']}명")
         
         # 자동 역할 실행 완료 로그 전송
         embed = discord.Embed(
@@ -366,6 +339,15 @@ async def manual_execute_auto_roles(bot):
             inline=False
         )
         
+        embed.add_field(
+            name="🔢 처리 현황",
+            value=f"• 대상 멤버: **{result['targeted']}명**\n"
+                  f"• 최근 확인됨: **{result['fresh']}명** (API 요청 약 {result['api_calls_saved']}회 절약)\n"
+                  f"• 이미 대기 중: **{result['already_queued']}명**\n"
+                  f"• 예외 대상: **{result['excluded']}명**",
+            inline=False
+        )
+        
         current_queue_size = queue_manager.get_queue_size()
         embed.add_field(
             name="📊 대기열 현황",
@@ -374,7 +356,7 @@ async def manual_execute_auto_roles(bot):
         )
         
         if current_queue_size > 0:
-            estimated_minutes = (current_queue_size * 36) // 60  # 배치당 36초 예상
+            estimated_minutes = queue_worker_pool.estimate_seconds(current_queue_size) // 60
             embed.add_field(
                 name="⏰ 예상 완료 시간",
                 value=f"약 {estimated_minutes}분 후" if estimated_minutes > 0 else "1분 이내",
@@ -388,7 +370,8 @@ async def manual_execute_auto_roles(bot):
         return {
             "success": True,
             "message": f"{added_count}명이 대기열에 추가되었습니다.",
-            "added_count": added_count
+            "added_count": added_count,
+            **result
         }
         
     except Exception as e:
@@ -421,40 +404,94 @@ def start_scheduler(bot):
     try:
         print("🚀 스케줄러 시작")
         
-        # 대기열 처리 작업 (1분마다)
-        scheduler.add_job(
-            process_queue_batch,
-            trigger=IntervalTrigger(minutes=1),
-            args=[bot],
-            id="queue_processor",
-            name="대기열 처리",
-            replace_existing=True
+        # 대기열 처리 작업자 시작 (대기열이 비면 대기, 사용자가 들어오면 바로 처리)
+        queue_worker_pool.start(
+            bot,
+            process_single_user,
+            on_outage=send_api_outage_notice,
+            on_recovery=send_api_recovery_notice
         )
         
-        # 자동 역할 실행 작업 (매주 지정된 요일과 시간에)
-        # 요일: 월(0), 화(1), 수(2), 목(3), 금(4), 토(5), 일(6)
-        day_names = ["월요일", "화요일", "수요일", "목요일", "금요일", "토요일", "일요일"]
-        day_name = day_names[AUTO_EXECUTION_DAY] if 0 <= AUTO_EXECUTION_DAY <= 6 else "알 수 없음"
-        
+        # 마을 → 국가 색인 갱신 작업 (시작 직후 1회 + 주기적으로)
         scheduler.add_job(
-            execute_auto_roles,
-            trigger=CronTrigger(
-                day_of_week=AUTO_EXECUTION_DAY,
-                hour=AUTO_EXECUTION_HOUR,
-                minute=AUTO_EXECUTION_MINUTE,
-                timezone='Asia/Seoul'
-            ),
-            args=[bot],
-            id="auto_roles_execution",
-            name="자동 역할 실행",
+            refresh_town_index,
+            trigger=IntervalTrigger(minutes=TOWN_INDEX_REFRESH_MINUTES),
+            id="town_index_refresh",
+            name="마을 색인 갱신",
+            next_run_time=datetime.now(timezone.utc),
             replace_existing=True
         )
         
+        # 처리 결과 요약 전송 작업 (요약 모드에서만)
+        if log_digest.is_digest:
+            scheduler.add_job(
+                flush_log_digest,
+                trigger=IntervalTrigger(seconds=log_digest.interval_seconds),
+                args=[bot],
+                id="log_digest_flush",
+                name="처리 결과 요약 전송",
+                coalesce=True,
+                replace_existing=True
+            )
+        
+        # 주민 변경 감시 작업 (변경된 주민만 대기열에 추가)
+        if RESIDENT_WATCH_INTERVAL_MINUTES > 0:
+            scheduler.add_job(
+                watch_nation_residents,
+                trigger=IntervalTrigger(minutes=RESIDENT_WATCH_INTERVAL_MINUTES),
+                args=[bot],
+                id="resident_watch",
+                name="주민 변경 감시",
+                coalesce=True,
+                replace_existing=True
+            )
+        
+        if AUTO_EXECUTION_MODE == "rolling":
+            # 순환 확인 작업 (간격마다 한 묶음씩, 시각 기준으로 맞춰 실행)
+            scheduler.add_job(
+                execute_rolling_auto_roles,
+                trigger=IntervalTrigger(
+                    minutes=ROLLING_INTERVAL_MINUTES,
+                    start_date=datetime.fromtimestamp(0, timezone.utc)
+                ),
+                args=[bot],
+                id="auto_roles_rolling",
+                name="자동 역할 순환 확인",
+                coalesce=True,
+                misfire_grace_time=ROLLING_INTERVAL_MINUTES * 60,
+                replace_existing=True
+            )
+            schedule_text = (f"{ROLLING_INTERVAL_MINUTES}분마다 1/{get_rolling_bucket_count()}씩 "
+                             f"({ROLLING_PERIOD_HOURS}시간마다 전체)")
+        else:
+            # 자동 역할 실행 작업 (매주 지정된 요일과 시간에)
+            # 요일: 월(0), 화(1), 수(2), 목(3), 금(4), 토(5), 일(6)
+            day_names = ["월요일", "화요일", "수요일", "목요일", "금요일", "토요일", "일요일"]
+            day_name = day_names[AUTO_EXECUTION_DAY] if 0 <= AUTO_EXECUTION_DAY <= 6 else "알 수 없음"
+            
+            scheduler.add_job(
+                execute_auto_roles,
+                trigger=CronTrigger(
+                    day_of_week=AUTO_EXECUTION_DAY,
+                    hour=AUTO_EXECUTION_HOUR,
+                    minute=AUTO_EXECUTION_MINUTE,
+                    timezone='Asia/Seoul'
+                ),
+                args=[bot],
+                id="auto_roles_execution",
+                name="자동 역할 실행",
+                replace_existing=True
+            )
+            schedule_text = f"매주 {day_name} {AUTO_EXECUTION_HOUR:02d}:{AUTO_EXECUTION_MINUTE:02d}"
+        
         scheduler.start()
         
         print("✅ 스케줄러 시작 완료")
-        print(f"   📋 대기열 처리: 1분마다")
-        print(f"   🎯 자동 역할 실행: 매주 {day_name} {AUTO_EXECUTION_HOUR:02d}:{AUTO_EXECUTION_MINUTE:02d}")
+        print(f"   📋 대기열 처리: 작업자 {queue_worker_pool.worker_count}개 상시 실행")
+        print(f"   🗺️ 마을 색인 갱신: {TOWN_INDEX_REFRESH_MINUTES}분마다")
+        if RESIDENT_WATCH_INTERVAL_MINUTES > 0:
+            print(f"   👀 주민 변경 감시: {RESIDENT_WATCH_INTERVAL_MINUTES}분마다")
+        print(f"   🎯 자동 역할 실행: {schedule_text}")
         
     except Exception as e:
         print(f"❌ 스케줄러 시작 실패: {e}")
@@ -470,48 +507,55 @@ def stop_scheduler():
     except Exception as e:
         print(f"❌ 스케줄러 중지 실패: {e}")
 
-async def process_queue_batch(bot):
-    """대기열에서 사용자들을 배치로 처리"""
-    try:
-        if queue_manager.get_queue_size() == 0:
-            return
-        
-        print("🔄 대기열 배치 처리 시작")
-        queue_manager.processing = True
-        
-        # 배치 크기 (한 번에 처리할 사용자 수)
-        batch_size = 3
-        processed_users = []
-        
-        for _ in range(batch_size):
-            user_id = queue_manager.get_next()
-            if user_id is None:
-                break
-            processed_users.append(user_id)
-        
-        if not processed_users:
-            queue_manager.processing = False
-            return
-        
-        print(f"📋 배치 처리 대상: {len(processed_users)}명")
-        
-        # API 세션 생성
-        async with aiohttp.ClientSession() as session:
-            for user_id in processed_users:
-                try:
-                    await process_single_user(bot, session, user_id)
-                    time.sleep(10)  # API 제한을 위한 대기
-                except Exception as e:
-                    print(f"❌ 사용자 {user_id} 처리 실패: {e}")
-        
-        print(f"✅ 배치 처리 완료: {len(processed_users)}명")
-        
-    except Exception as e:
-        print(f"❌ 배치 처리 오류: {e}")
-    finally:
-        queue_manager.processing = False
+async def flush_log_digest(bot, force: bool = True):
+    """모아 둔 처리 결과 요약 전송 (force가 아니면 개수/시간 조건을 만족할 때만)"""
+    if not force and not (log_digest.is_full() or log_digest.is_due()):
+        return
+    
+    async def send(kind, embed):
+        await send_log_message(bot, SUCCESS_CHANNEL_ID if kind == "success" else FAILURE_CHANNEL_ID, embed)
+    
+    await log_digest.flush(send)
+
+async def send_api_outage_notice(bot):
+    """API 장애로 대기열 처리가 멈췄을 때 한 번만 알림"""
+    global _api_outage_notified
+    if _api_outage_notified:
+        return
+    _api_outage_notified = True
 
-async def process_single_user(bot, session, user_id):
+    stats = api_circuit_breaker.get_stats()
+    embed = discord.Embed(
+        title="🔴 API 장애 - 대기열 처리 일시 중지",
+        description="PlanetEarth API 응답이 불안정하여 대기열 처리를 멈췄습니다.\n"
+                    "대기 중인 사용자는 대기열에 그대로 남아 있으며, API가 복구되면 자동으로 다시 처리됩니다.",
+        color=0xff0000
+    )
+    embed.add_field(name="❌ 원인", value=str(stats["last_error"]), inline=True)
+    embed.add_field(name="⏰ 재시도까지", value=f"약 {stats['retry_after']:.0f}초", inline=True)
+    embed.add_field(name="📋 대기 중", value=f"{queue_manager.get_queue_size()}명", inline=True)
+    embed.timestamp = datetime.now()
+
+    await send_log_message(bot, FAILURE_CHANNEL_ID, embed)
+
+async def send_api_recovery_notice(bot):
+    """API 복구 후 대기열 처리 재개 알림"""
+    global _api_outage_notified
+    if not _api_outage_notified:
+        return
+    _api_outage_notified = False
+
+    embed = discord.Embed(
+        title="🟢 API 복구 - 대기열 처리 재개",
+        description=f"PlanetEarth API가 복구되어 대기열 처리를 다시 시작합니다.\n"
+                    f"📋 남은 대기열: **{queue_manager.get_queue_size()}명**",
+        color=0x00ff00
+    )
+    embed.timestamp = datetime.now()
+
+    await send_log_message(bot, SUCCESS_CHANNEL_ID, embed)
+
+async def process_single_user(bot, user_id):
     """단일 사용자 처리 - 매핑된 마을 역할 포함"""
     member = None
     guild = None
@@ -535,6 +579,11 @@ async def process_single_user(bot, session, user_id):
             error_message = "서버에서 사용자를 찾을 수 없습니다."
             print(f"⚠️ {error_message}: {user_id}")
             
+            if log_digest.is_digest:
+                log_digest.add_failure(user_id, None, None)
+                await flush_log_digest(bot, force=False)
+                return
+            
             # 실패 로그 전송
             embed = discord.Embed(
                 title="❌ 사용자 처리 실패",
@@ -551,83 +600,41 @@ async def process_single_user(bot, session, user_id):
             await send_log_message(bot, FAILURE_CHANNEL_ID, embed)
             return
         
-        # 1단계: 디스코드 ID → 마크 ID
-        url1 = f"{MC_API_BASE}/discord?discord={user_id}"
-        
-        async with session.get(url1, timeout=aiohttp.ClientTimeout(total=10)) as r1:
-            if r1.status != 200:
-                error_message = f"마인크래프트 계정 연동 정보를 찾을 수 없습니다 (HTTP {r1.status})"
-                print(f"  ❌ 1단계 실패: {r1.status}")
-                raise Exception(error_message)
-            
-            data1 = await r1.json()
-            if not data1.get('data') or not data1['data']:
-                error_message = "마인크래프트 계정이 연동되지 않았습니다"
-                print(f"  ❌ 마크 ID 데이터 없음")
-                raise Exception(error_message)
-            
-            mc_id = data1['data'][0].get('name')
-            if not mc_id:
-                error_message = "마인크래프트 닉네임을 찾을 수 없습니다"
-                print(f"  ❌ 마크 ID 없음")
-                raise Exception(error_message)
-            
-            print(f"  ✅ 마크 ID: {mc_id}")
-        
-        time.sleep(5)
-        
-        # 2단계: 마크 ID → 마을
-        url2 = f"{MC_API_BASE}/resident?name={mc_id}"
-        
-        async with session.get(url2, timeout=aiohttp.ClientTimeout(total=10)) as r2:
-            if r2.status != 200:
-                error_message = f"마을 정보를 조회할 수 없습니다 (HTTP {r2.status})"
-                print(f"  ❌ 2단계 실패: {r2.status}")
-                raise Exception(error_message)
-            
-            data2 = await r2.json()
-            if not data2.get('data') or not data2['data']:
-                error_message = "마을에 소속되어 있지 않습니다"
-                print(f"  ❌ 마을 데이터 없음")
-                raise Exception(error_message)
-            
-            town = data2['data'][0].get('town')
-            if not town:
-                error_message = "마을 정보가 없습니다"
-                print(f"  ❌ 마을 없음")
-                raise Exception(error_message)
-            
-            print(f"  ✅ 마을: {town}")
-        
-        time.sleep(5)
-        
-        # 3단계: 마을 → 국가
-        url3 = f"{MC_API_BASE}/town?name={town}"
-        
-        async with session.get(url3, timeout=aiohttp.ClientTimeout(total=10)) as r3:
-            if r3.status != 200:
-                error_message = f"국가 정보를 조회할 수 없습니다 (HTTP {r3.status})"
-                print(f"  ❌ 3단계 실패: {r3.status}")
-                raise Exception(error_message)
-            
-            data3 = await r3.json()
-            if not data3.get('data') or not data3['data']:
-                error_message = "국가에 소속되어 있지 않습니다"
-                print(f"  ❌ 국가 데이터 없음")
-                raise Exception(error_message)
-            
-            nation = data3['data'][0].get('nation')
-            if not nation:
-                error_message = "국가 정보가 없습니다"
-                print(f"  ❌ 국가 없음")
-                raise Exception(error_message)
-            
-            print(f"  ✅ 국가: {nation}")
-        
-        # 역할 부여 및 닉네임 변경 (마을 정보 포함)
-        role_changes = await update_user_info(member, mc_id, nation, guild, town)
+        # 디스코드 ID → 마크 ID → 마을 → 국가 조회
+        try:
+            resolution = await resolve_member(user_id)
+        except ApiRequestError as e:
+            # API 장애로 서킷이 열렸으면 실패 로그 없이 대기열로 되돌림
+            if api_circuit_breaker.state != CLOSED:
+                queue_manager.add_user(user_id)
+                print(f"⏸️ API 장애로 다시 대기열에 추가: {user_id}")
+                return
+            mc_id, town = e.mc_id, e.town
+            raise
+        except ResolutionError as e:
+            # 실패 로그에 조회된 정보까지 표시
+            mc_id, town = e.mc_id, e.town
+            record_verification(user_id, e)
+            raise
+        
+        mc_id, town, nation = resolution.mc_id, resolution.town, resolution.nation
+        
+        # 역할 부여 및 닉네임 변경 (마을 정보 포함, 한 번의 요청으로 적용)
+        update = plan_member_update(member, nation, town, create_nickname(mc_id, nation, member.display_name))
+        role_changes = await apply_member_update(member, update)
+        record_verification(user_id)
         
         print(f"✅ 사용자 처리 완료: {member.display_name} ({nation}, {town})")
+        retry_manager.reset(user_id)
+        retry_manager.remove_dead_letter(user_id)
+        
+        # 요약 모드면 모아 두었다가 한 번에 전송
+        if log_digest.is_digest:
+            log_digest.add_success(member, mc_id, nation, role_changes, update.has_changes())
+            await flush_log_digest(bot, force=False)
+            return
+        if not log_digest.should_log_success(update.has_changes()):
+            return
         
         # 성공 로그 전송 (마을 역할 정보 포함)
         if nation == BASE_NATION:
@@ -698,6 +705,23 @@ async def process_single_user(bot, session, user_id):
     except Exception as e:
         print(f"❌ 사용자 {user_id} 처리 중 오류: {e}")
         
+        # 일시적 오류는 실패 로그 없이 잠시 후 다시 처리
+        dead_lettered = False
+        if is_transient_error(e):
+            retry_delay = retry_manager.record_failure(user_id, e)
+            if retry_delay is not None:
+                queue_manager.add_user_later(user_id, retry_delay)
+                print(f"🔁 {retry_delay:.0f}초 후 재시도 ({retry_manager.get_attempts(user_id)}/{retry_manager.max_attempts - 1}회): {user_id}")
+                return
+            dead_lettered = True
+        else:
+            retry_manager.reset(user_id)
+        
+        if log_digest.is_digest:
+            log_digest.add_failure(user_id, member, e, dead_lettered)
+            await flush_log_digest(bot, force=False)
+            return
+        
         # 실패 로그 전송
         embed = discord.Embed(
             title="❌ 사용자 처리 실패",
@@ -747,6 +771,14 @@ async def process_single_user(bot, session, user_id):
             inline=False
         )
         
+        if dead_lettered:
+            embed.add_field(
+                name="☠️ 재시도 중단",
+                value=f"{retry_manager.max_attempts}회 모두 실패하여 실패 목록에 추가되었습니다.\n"
+                      f"`/실패목록`으로 확인하고 다시 시도할 수 있습니다.",
+                inline=False
+            )
+        
         embed.timestamp = datetime.now()
         
         await send_log_message(bot, FAILURE_CHANNEL_ID, embed)
@@ -756,9 +788,8 @@ async def execute_auto_roles(bot):
     try:
         print("🎯 자동 역할 실행 시작")
         
-        # auto_roles.txt 파일 확인
-        auto_roles_path = "auto_roles.txt"
-        if not os.path.exists(auto_roles_path):
+        role_ids = read_auto_role_ids()
+        if role_ids is None:
             print("⚠️ auto_roles.txt 파일이 존재하지 않습니다.")
             
             # 실패 로그 전송
@@ -771,10 +802,6 @@ async def execute_auto_roles(bot):
             await send_log_message(bot, FAILURE_CHANNEL_ID, embed)
             return
         
-        # 역할 ID 읽기
-        with open(auto_roles_path, "r") as f:
-            role_ids = [line.strip() for line in f.readlines() if line.strip()]
-        
         if not role_ids:
             print("⚠️ auto_roles.txt 파일에 역할 ID가 없습니다.")
             
@@ -788,44 +815,11 @@ async def execute_auto_roles(bot):
             await send_log_message(bot, FAILURE_CHANNEL_ID, embed)
             return
         
-        added_count = 0
+        result = enqueue_auto_role_members(bot, role_ids)
+        added_count = result["added"]
         
-        # 각 길드에서 역할 멤버들을 대기열에 추가
-        for guild in bot.guilds:
-            print(f"🏰 길드 처리: {guild.name}")
-            
-            for role_id_str in role_ids:
-                try:
-                    role_id = int(role_id_str)
-                    role = guild.get_role(role_id)
-                    
-                    if not role:
-                        print(f"⚠️ 역할을 찾을 수 없음: {role_id}")
-                        continue
-                    
-                    print(f"👥 역할 '{role.name}' 멤버 {len(role.members)}명 처리 중")
-                    
-                    for member in role.members:
-                        # 예외 목록 확인
-                        if exception_manager.is_exception(member.id):
-                            print(f"  ⏭️ 예외 대상 건너뜀: {member.display_name}")
-                            continue
-                        
-                        # 대기열에 추가
-                        if queue_manager.add_user(member.id):
-                            added_count += 1
-                            print(f"  ➕ 대기열 추가: {member.display_name}")
-                        else:
-                            print(f"  ⏭️ 이미 대기열에 있음: {member.display_name}")
-                    
-                except ValueError:
-                    print(f"⚠️ 잘못된 역할 ID 형식: {role_id_str}")
-                    continue
-                except Exception as e:
-                    print(f"⚠️ 역할 처리 오류 ({role_id_str}): {e}")
-                    continue
-        
-        print(f"✅ 자동 역할 실행 완료 - {added_count}명 대기열 추가")
+        print(f"✅ 자동 역할 실행 완료 - 대상 {result['targeted']}명, 대기열 추가 {added_count}명, "
+              f"최근 확인됨 {result['fresh']}명, 이미 대기 중 {result['already_queued']}명, 예외 {result['excluded']}명")
         
         # 자동 역할 실행 완료 로그 전송
         embed = discord.Embed(
@@ -840,6 +834,15 @@ async def execute_auto_roles(bot):
             inline=False
         )
         
+        embed.add_field(
+            name="🔢 처리 현황",
+            value=f"• 대상 멤버: **{result['targeted']}명**\n"
+                  f"• 최근 확인됨: **{result['fresh']}명** (API 요청 약 {result['api_calls_saved']}회 절약)\n"
+                  f"• 이미 대기 중: **{result['already_queued']}명**\n"
+                  f"• 예외 대상: **{result['excluded']}명**",
+            inline=False
+        )
+        
         current_queue_size = queue_manager.get_queue_size()
         embed.add_field(
             name="📊 대기열 현황",
@@ -848,7 +851,7 @@ async def execute_auto_roles(bot):
         )
         
         if current_queue_size > 0:
-            estimated_minutes = (current_queue_size * 36) // 60  # 배치당 36초 예상
+            estimated_minutes = queue_worker_pool.estimate_seconds(current_queue_size) // 60
             embed.add_field(
                 name="⏰ 예상 완료 시간",
                 value=f"약 {estimated_minutes}분 후" if estimated_minutes > 0 else "1분 이내",
@@ -878,3 +881,65 @@ async def execute_auto_roles(bot):
         embed.timestamp = datetime.now()
         
         await send_log_message(bot, FAILURE_CHANNEL_ID, embed)
+
+async def execute_rolling_auto_roles(bot):
+    """순환 확인: 이번 묶음에 속한 자동 역할 멤버만 대기열에 추가
+
+    멤버를 ID 해시로 묶음에 나누고 ROLLING_INTERVAL_MINUTES마다 한 묶음씩 확인하여,
+    ROLLING_PERIOD_HOURS 동안 모든 멤버를 한 번씩 확인합니다.
+    실행이 늦어져 건너뛴 구간이 있으면 그 구간의 묶음도 이번에 함께 추가합니다.
+    """
+    global _rolling_last_slot
+    try:
+        role_ids = read_auto_role_ids()
+        if not role_ids:
+            print("⚠️ 순환 확인 건너뜀: auto_roles.txt 파일이 없거나 역할 ID가 없습니다.")
+            return
+        
+        bucket_count = get_rolling_bucket_count()
+        slot = get_current_rolling_slot()
+        first_slot = slot
+        if _rolling_last_slot is not None and _rolling_last_slot < slot:
+            first_slot = max(_rolling_last_slot + 1, slot - bucket_count + 1)
+        buckets = {s % bucket_count for s in range(first_slot, slot + 1)}
+        result = enqueue_auto_role_members(bot, role_ids, buckets=buckets, bucket_count=bucket_count)
+        _rolling_last_slot = slot
+        
+        caught_up = f" (건너뛴 묶음 {len(buckets) - 1}개 포함)" if len(buckets) > 1 else ""
+        print(f"🔄 순환 확인 {slot % bucket_count + 1}/{bucket_count}{caught_up} - 대상 {result['targeted']}명, 대기열 추가 {result['added']}명, "
+              f"최근 확인됨 {result['fresh']}명, 이미 대기 중 {result['already_queued']}명, 예외 {result['excluded']}명")
+        
+    except Exception as e:
+        print(f"❌ 순환 확인 오류: {e}")
+
+async def watch_nation_residents(bot):
+    """주민 변경 감시: 국가 주민 스냅샷이 바뀐 멤버만 대기열에 추가
+
+    마크 ID → 디스코드 ID는 저장소의 연동 기록으로 찾으므로, 한 번도 확인되지 않은 주민은 대상에서 빠집니다.
+    """
+    try:
+        result = await resident_watcher.refresh()
+        if result is None:
+            return
+        
+        if result["baseline"]:
+            print(f"📸 주민 변경 감시 기준 저장: 마을 {result['towns']}개, 주민 {result['residents']}명")
+            return
+        
+        changed = result["joined"] | result["left"] | result["moved"]
+        linked = resolution_store.get_discord_ids(changed)
+        user_ids = {
+            user_id for user_id in linked.values()
+            if any(guild.get_member(user_id) for guild in bot.guilds)
+        }
+        user_ids -= set(exception_manager.get_exceptions())
+        added = queue_manager.add_users(user_ids, LANE_BULK)
+        
+        print(f"👀 주민 변경 감시 - 들어옴 {len(result['joined'])}명, 떠남 {len(result['left'])}명, "
+              f"이동 {len(result['moved'])}명, 연동 확인 {len(linked)}명, 대기열 추가 {added}명"
+              + (f" (조회 실패 마을 {result['failed_towns']}개)" if result["failed_towns"] else ""))
+        
+    except ResolutionError as e:
+        print(f"⚠️ 주민 변경 감시 실패: {e.message}")
+    except Exception as e:
+        print(f"❌ 주민 변경 감시 오류: {e}")
@@ -0,0 +1,245 @@
+# town_index.py
+"""
+마을 → 국가 색인
+/nation 목록으로 한 번에 만든 색인으로 3단계(마을 → 국가) 조회를 API 호출 없이 처리합니다.
+색인에 없는 마을만 /town API로 조회합니다.
+같은 목록으로 마을 이름 검색 색인도 만들어 자동완성을 API 호출 없이 메모리에서 처리합니다.
+(접두사/포함 검색 + 오타를 위한 3글자 조각(trigram) 유사도 검색)
+"""
+
+import time
+from bisect import bisect_left
+from collections import Counter
+from typing import Dict, Iterable, List, Optional
+
+# 유사 검색 기준 (공유 trigram 비율, 0~1) 과 유사 검색을 시작하는 최소 입력 길이
+FUZZY_MIN_SCORE = 0.3
+FUZZY_MIN_QUERY_LENGTH = 3
+
+
+def _trigrams(text: str) -> set:
+    """앞뒤를 공백으로 채운 3글자 조각 집합 ("seoul" → "  s", " se", "seo", ...)"""
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class TownNameIndex:
+    """마을 이름 검색 색인 (소문자 키 정렬 목록 + 이진 탐색 접두사 검색)"""
+
+    def __init__(self, towns: Iterable[str]):
+        entries = sorted((town.lower(), town) for town in set(towns) if town)
+        self._keys: List[str] = [key for key, _ in entries]
+        self._names: List[str] = [name for _, name in entries]
+
+        # trigram → 마을 위치 목록 (유사 검색용)
+        self._postings: Dict[str, List[int]] = {}
+        self._gram_counts: List[int] = []
+        for position, key in enumerate(self._keys):
+            grams = _trigrams(key)
+            self._gram_counts.append(len(grams))
+            for gram in grams:
+                self._postings.setdefault(gram, []).append(position)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def find(self, name: str) -> Optional[str]:
+        """대소문자를 무시하고 이름이 같은 마을 반환"""
+        key = name.strip().lower()
+        position = bisect_left(self._keys, key)
+        if position < len(self._keys) and self._keys[position] == key:
+            return self._names[position]
+        return None
+
+    def _substring_candidates(self, query: str) -> Iterable[int]:
+        """query를 포함할 수 있는 마을 위치 (3글자 이상이면 trigram 목록의 교집합으로 좁힘)"""
+        if len(query) < 3:
+            return range(len(self._keys))
+        candidates = None
+        for i in range(len(query) - 2):
+            positions = self._postings.get(query[i:i + 3])
+            if not positions:
+                return ()
+            candidates = set(positions) if candidates is None else candidates.intersection(positions)
+        return sorted(candidates)
+
+    def similar(self, query: str, limit: int = 25, min_score: float = FUZZY_MIN_SCORE) -> List[str]:
+        """trigram 유사도(Dice 계수) 순으로 비슷한 이름의 마을 반환"""
+        grams = _trigrams(query.strip().lower())
+        shared = Counter()
+        for gram in grams:
+            shared.update(self._postings.get(gram, ()))
+
+        scored = []
+        for position, count in shared.items():
+            score = 2 * count / (len(grams) + self._gram_counts[position])
+            if score >= min_score:
+                scored.append((-score, self._keys[position], position))
+        scored.sort()
+        return [self._names[position] for _, _, position in scored[:limit]]
+
+    def search(self, query: str, limit: int = 25) -> List[str]:
+        """접두사가 일치하는 마을을 먼저, 부족하면 이름에 포함된 마을, 그다음 비슷한 이름의 마을 순으로 반환"""
+        query = query.strip().lower()
+        if not query:
+            return self._names[:limit]
+
+        results = []
+        start = bisect_left(self._keys, query)
+        end = start
+        while end < len(self._keys) and self._keys[end].startswith(query):
+            if len(results) < limit:
+                results.append(self._names[end])
+            end += 1
+
+        # 접두사 결과가 부족할 때만 포함 검색 (접두사 일치 구간은 제외)
+        if len(results) < limit:
+            for position in self._substring_candidates(query):
+                key = self._keys[position]
+                if start <= position < end:
+                    continue
+                if query in key:
+                    results.append(self._names[position])
+                    if len(results) >= limit:
+                        break
+
+        # 그래도 부족하면 오타를 고려한 유사 검색
+        if len(results) < limit and len(query) >= FUZZY_MIN_QUERY_LENGTH:
+            found = set(results)
+            for name in self.similar(query, limit):
+                if name not in found:
+                    results.append(name)
+                    if len(results) >= limit:
+                        break
+        return results
+
+
+class TownNationIndex:
+    """국가별 마을 목록으로 만든 마을 → 국가 색인"""
+
+    def __init__(self, max_age_seconds: float, max_nations: int = 20):
+        self.max_age_seconds = max_age_seconds
+        self.max_nations = max(1, max_nations)
+        self._town_to_nation: Dict[str, str] = {}
+        self._nation_towns: Dict[str, List[str]] = {}
+        self._nation_updated: Dict[str, float] = {}
+        self._tracked_nations: List[str] = []
+        self._name_indexes: Dict[str, TownNameIndex] = {}
+
+        # 통계
+        self.hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.searches = 0
+        self.last_refresh = None
+
+    def track_nation(self, nation: str) -> bool:
+        """다음 갱신부터 국가 목록을 색인에 포함 (최대 국가 수 제한)"""
+        if not nation or nation in self._tracked_nations:
+            return False
+        if len(self._tracked_nations) >= self.max_nations:
+            return False
+        self._tracked_nations.append(nation)
+        return True
+
+    def get_tracked_nations(self) -> List[str]:
+        """색인 대상 국가 목록 반환"""
+        return list(self._tracked_nations)
+
+    def update_nation(self, nation: str, towns: Iterable[str]):
+        """국가의 마을 목록으로 색인 갱신 (빠진 마을은 색인에서 제거)"""
+        for town in self._nation_towns.get(nation, []):
+            if self._town_to_nation.get(town) == nation:
+                del self._town_to_nation[town]
+
+        town_list = [town for town in towns if town]
+        for town in town_list:
+            self._town_to_nation[town] = nation
+        self._nation_towns[nation] = town_list
+        self._nation_updated[nation] = time.time()
+        self._name_indexes[nation] = TownNameIndex(town_list)
+
+    def seed_town_names(self, nation: str, towns: Iterable[str]) -> bool:
+        """저장된 마을 목록으로 이름 검색 색인만 미리 채움 (국가 조회 색인은 갱신 전까지 비워 둠)"""
+        if nation in self._name_indexes:
+            return False
+        name_index = TownNameIndex(towns)
+        if not len(name_index):
+            return False
+        self._name_indexes[nation] = name_index
+        return True
+
+    def search_towns(self, nation: str, query: str, limit: int = 25) -> Optional[List[str]]:
+        """국가의 마을 이름 검색 (자동완성용, 오래된 목록도 사용) - 아직 색인이 없으면 None"""
+        name_index = self._name_indexes.get(nation)
+        if name_index is None:
+            return None
+        self.searches += 1
+        return name_index.search(query, limit)
+
+    def suggest_towns(self, nation: str, name: str, limit: int = 3) -> List[str]:
+        """입력한 마을 이름과 비슷한 국가의 마을 ("혹시 이 마을인가요?" 용도)"""
+        name_index = self._name_indexes.get(nation)
+        if name_index is None or not name.strip():
+            return []
+        exact = name_index.find(name)
+        suggestions = [exact] if exact and exact != name else []
+        for town in name_index.similar(name, limit + 1):
+            if town != name and town not in suggestions:
+                suggestions.append(town)
+        return suggestions[:limit]
+
+    def forget_town(self, town: str) -> bool:
+        """색인에서 마을 → 국가 정보 제거 (다음 조회는 캐시/API로, 다음 국가 갱신 때 다시 채워짐)"""
+        return self._town_to_nation.pop(town, None) is not None
+
+    def mark_refreshed(self):
+        """전체 갱신 완료 기록"""
+        self.refreshes += 1
+        self.last_refresh = time.time()
+
+    def lookup(self, town: str) -> Optional[str]:
+        """색인에서 마을의 국가 조회 (없거나 오래된 색인이면 None)"""
+        nation = self._town_to_nation.get(town)
+        if nation is None or time.time() - self._nation_updated.get(nation, 0) > self.max_age_seconds:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return nation
+
+    def get_towns(self, nation: str) -> Optional[List[str]]:
+        """색인에 있는 국가의 마을 목록 (없거나 오래되었으면 None)"""
+        if time.time() - self._nation_updated.get(nation, 0) > self.max_age_seconds:
+            return None
+        return list(self._nation_towns.get(nation, []))
+
+    def get_stats(self) -> dict:
+        """색인 통계 반환"""
+        lookups = self.hits + self.misses
+        return {
+            "towns": len(self._town_to_nation),
+            "nations": len(self._nation_towns),
+            "tracked_nations": len(self._tracked_nations),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits / lookups * 100) if lookups else 0.0,
+            "refreshes": self.refreshes,
+            "searches": self.searches,
+            "last_refresh": self.last_refresh
+        }
+
+
+def _create_town_index() -> TownNationIndex:
+    """config 설정으로 마을 색인 생성"""
+    try:
+        from config import config
+        refresh_minutes = config.TOWN_INDEX_REFRESH_MINUTES
+        index = TownNationIndex(refresh_minutes * 60 * 2, config.TOWN_INDEX_MAX_NATIONS)
+        index.track_nation(config.BASE_NATION)
+    except ImportError:
+        index = TownNationIndex(60 * 60)
+    return index
+
+
+# 전역 마을 색인 인스턴스
+town_index = _create_town_index()
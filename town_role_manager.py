@@ -6,9 +6,10 @@
 
 import json
 import os
-import aiohttp
 from typing import Dict, List, Optional
 
+from planetearth_client import get_nation_towns
+
 class TownRoleManager:
     """마을-역할 매핑을 관리하는 클래스"""
     
@@ -96,37 +97,15 @@ town_role_manager = TownRoleManager()
 async def get_towns_in_nation(nation_name: str) -> List[str]:
     """특정 국가의 마을 목록 조회"""
     try:
-        # config에서 API 베이스 URL 가져오기
-        try:
-            from config import config
-            api_base = config.MC_API_BASE
-        except:
-            import os
-            api_base = os.getenv("MC_API_BASE", "https://api.planetearth.kr")
+        print(f"🔍 국가 정보 조회: {nation_name}")
+        towns = await get_nation_towns(nation_name)
         
-        async with aiohttp.ClientSession() as session:
-            url = f"{api_base}/nation?name={nation_name}"
-            print(f"🔍 국가 정보 조회: {url}")
-            
-            async with session.get(url, timeout=aiohttp.ClientTimeout(total=10)) as response:
-                if response.status != 200:
-                    print(f"❌ 국가 정보 조회 실패: HTTP {response.status}")
-                    return []
-                
-                data = await response.json()
-                if not data.get('data') or not data['data']:
-                    print(f"❌ 국가 데이터 없음: {nation_name}")
-                    return []
-                
-                nation_data = data['data'][0]
-                towns = nation_data.get('towns', [])
-                
-                if not towns:
-                    print(f"ℹ️ {nation_name}에 마을이 없습니다.")
-                    return []
-                
-                print(f"✅ {nation_name} 마을 목록: {len(towns)}개")
-                return towns
+        if not towns:
+            print(f"ℹ️ {nation_name}에 마을이 없습니다.")
+            return []
+        
+        print(f"✅ {nation_name} 마을 목록: {len(towns)}개")
+        return towns
                 
     except Exception as e:
         print(f"❌ 마을 목록 조회 오류: {e}")